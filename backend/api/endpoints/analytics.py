@@ -0,0 +1,74 @@
+# backend/api/endpoints/analytics.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, List, Literal, Optional
+from datetime import datetime
+
+from backend.core.database import get_async_db
+from backend.services.cohort_analytics import CohortQuery, run_cohort_query
+from backend.core.logging import logger
+
+router = APIRouter()
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+@router.get("/cohort/", response_model=Dict[str, Any])
+async def get_cohort_aggregates(
+    source: Literal["assessments", "biomarkers"],
+    metric: str,
+    aggregates: str = "count,mean",
+    bucket: Literal["day", "week", "month", "all"] = "week",
+    group_by: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    assessment_type: Optional[str] = None,
+    severity_level: Optional[str] = None,
+    rolling: Optional[int] = Query(None, ge=1, le=52),
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
+    """Population-level aggregates computed in the database
+
+    ``aggregates`` is a comma-separated list of ``count``, ``mean``,
+    ``min``, ``max``, ``std``, ``share`` (of the bucket's rows) and
+    percentiles ``p0``..``p100``; ``group_by`` a comma-separated list of
+    grouping columns (``assessment_type``, ``severity_level`` for
+    assessments). Results come back as one list per column, e.g.
+
+    * severity distribution: ``source=assessments&metric=total_score&
+      aggregates=count,share&group_by=severity_level&assessment_type=PHQ-9``
+    * median PHQ-9 over time: ``...&aggregates=p50&bucket=month``
+    * weekly stress percentiles: ``source=biomarkers&metric=stress_level&
+      aggregates=p25,p50,p75,p90``
+    """
+    filters = {
+        name: value
+        for name, value in (("assessment_type", assessment_type), ("severity_level", severity_level))
+        if value is not None
+    }
+    query = CohortQuery(
+        source=source,
+        metric=metric,
+        aggregates=_split(aggregates),
+        bucket=bucket,
+        group_by=_split(group_by),
+        start_time=start_time,
+        end_time=end_time,
+        filters=filters,
+        rolling=rolling
+    )
+    try:
+        query.validate()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        return await run_cohort_query(db, query)
+
+    except Exception as e:
+        logger.error(f"Error computing cohort aggregates: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
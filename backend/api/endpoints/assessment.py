@@ -1,74 +1,202 @@
 # backend/api/endpoints/assessment.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
 from datetime import datetime
+import json
 import numpy as np
 
-from backend.core.database import get_db
+from backend.core.config import settings
+from backend.core.database import get_async_db, AsyncSessionLocal
 from backend.models.assessment_model import (
+    ASSESSMENT_FIELDS,
     Assessment,
     PHQ9Assessment,
     GAD7Assessment,
     AssessmentType
 )
-from backend.services.rag_service import RAGSystem
+from backend.core.registry import registry
+from backend.services.container import rag_system
+from backend.services.job_queue import (
+    FAILED,
+    SUCCEEDED,
+    JobWorkerPool,
+    SQLiteJobQueue
+)
+from backend.utils.pagination import decode_cursor, keyset_page, parse_fields, split_page
+from backend.utils.scoring import (
+    INSTRUMENTS,
+    UnknownInstrumentError,
+    get_instrument,
+    load_instruments,
+    response_vector
+)
 from backend.core.logging import logger
 
 router = APIRouter()
-rag_system = RAGSystem()
+
+ANALYSIS_JOB = "assessment_analysis"
+
+# Questionnaire-specific tables filled alongside ``assessments``
+DETAIL_MODELS = {
+    AssessmentType.PHQ9.value: PHQ9Assessment,
+    AssessmentType.GAD7.value: GAD7Assessment
+}
+
+if settings.ASSESSMENT_INSTRUMENTS_PATH:
+    load_instruments(settings.ASSESSMENT_INSTRUMENTS_PATH)
+
+def _apply_analysis(assessment: Assessment, rag_analysis: Dict[str, Any]):
+    """Store RAG analysis results on an assessment"""
+    assessment.llm_analysis = rag_analysis
+    assessment.rdoc_domains = rag_analysis.get("rdoc_domains", {})
+    assessment.rdoc_constructs = rag_analysis.get("rdoc_constructs", {})
+
+def _analysis_input(
+    assessment_type: str,
+    vector: List[int],
+    total_score: float,
+    severity: str
+) -> Dict[str, Any]:
+    """Canonical RAG input of a scored submission (what its cache key covers)"""
+    return {
+        "type": assessment_type,
+        "responses": {str(item): value for item, value in enumerate(vector, start=1)},
+        "total_score": int(total_score),
+        "severity": severity
+    }
+
+async def _run_analysis_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze committed assessments off the request path
+    
+    Bulk submissions with identical answers share one job, listing every
+    assessment in ``assessment_ids``.
+    """
+    rag_analysis = await rag_system.analyze_assessment(payload["analysis_input"])
+    assessment_ids = payload.get("assessment_ids") or [payload["assessment_id"]]
+    
+    async with AsyncSessionLocal() as db:
+        assessments = (await db.execute(
+            select(Assessment).where(Assessment.id.in_(assessment_ids))
+        )).scalars().all()
+        if not assessments:
+            raise ValueError(f"Assessments {assessment_ids} not found")
+        for assessment in assessments:
+            _apply_analysis(assessment, rag_analysis)
+        await db.commit()
+    
+    result = {"recommendations": rag_analysis.get("recommendations", [])}
+    if "assessment_ids" in payload:
+        result["assessment_ids"] = assessment_ids
+    else:
+        result["assessment_id"] = payload["assessment_id"]
+    return result
+
+def _create_analysis_workers() -> JobWorkerPool:
+    """Job queue and workers for background analyses"""
+    workers = JobWorkerPool(
+        SQLiteJobQueue(
+            settings.jobs.JOB_QUEUE_PATH,
+            lease_seconds=settings.jobs.JOB_LEASE_SECONDS
+        ),
+        concurrency=settings.jobs.JOB_WORKER_CONCURRENCY,
+        max_attempts=settings.jobs.JOB_MAX_ATTEMPTS,
+        retry_backoff=settings.jobs.JOB_RETRY_BACKOFF_SECONDS,
+        poll_interval=settings.jobs.JOB_POLL_INTERVAL_SECONDS
+    )
+    workers.register(ANALYSIS_JOB, _run_analysis_job)
+    return workers
+
+# Started at app startup so jobs left queued by a previous process run
+# without waiting for a new submission
+registry.register(
+    "analysis_workers",
+    _create_analysis_workers,
+    close=lambda workers: workers.stop(),
+    start=lambda workers: workers.start()
+)
+analysis_workers = registry.proxy("analysis_workers")
+
+def _enqueue_analysis(
+    assessment: Assessment,
+    analysis_input: Dict[str, Any]
+) -> str:
+    """Queue RAG analysis for an assessment that is already committed"""
+    return analysis_workers.enqueue(ANALYSIS_JOB, {
+        "assessment_id": assessment.id,
+        "analysis_input": analysis_input
+    })
 
 @router.post("/phq9/", response_model=Dict[str, Any])
 async def create_phq9_assessment(
     assessment_data: Dict[str, Any],
-    db: Session = Depends(get_db)
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
-    """Create PHQ-9 assessment"""
+    """Create PHQ-9 assessment
+    
+    With ``background=true`` the scored assessment is committed immediately
+    and the RAG analysis is queued; poll ``/analysis/jobs/{job_id}``.
+    """
     try:
-        # Validate responses
-        if len(assessment_data["responses"]) != 9:
-            raise ValueError("PHQ-9 requires exactly 9 responses")
-            
-        # Calculate scores
-        total_score = sum(assessment_data["responses"].values())
-        severity = PHQ9Assessment.calculate_severity(total_score)
+        # Validate and score responses
+        scored = get_instrument(AssessmentType.PHQ9.value).score(assessment_data.get("responses"))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        total_score = scored["total"]
+        severity = scored["severity"]
+        analysis_input = _analysis_input(
+            AssessmentType.PHQ9.value,
+            scored["items"],
+            total_score,
+            severity
+        )
+        # Lists and mappings are both accepted; store the item-number mapping
+        responses = analysis_input["responses"]
         
         # Create base assessment
         assessment = Assessment(
             session_id=assessment_data["session_id"],
             assessment_type=AssessmentType.PHQ9.value,
-            scores=assessment_data["responses"],
+            scores=responses,
             total_score=total_score,
             severity_level=severity
         )
         db.add(assessment)
-        db.flush()
+        await db.flush()
         
         # Create PHQ-9 specific assessment
         phq9 = PHQ9Assessment(
             assessment_id=assessment.id,
-            question_responses=assessment_data["responses"],
-            suicidal_ideation_score=assessment_data["responses"].get(9, 0),
+            question_responses=responses,
+            suicidal_ideation_score=scored["items"][8],
             functional_impact=assessment_data.get("functional_impact", ""),
             depression_severity=severity,
-            risk_level=_calculate_risk_level(assessment_data["responses"])
+            risk_level=scored["risk_level"]
         )
         db.add(phq9)
         
-        # Generate RAG analysis
-        rag_analysis = await rag_system.analyze_assessment({
-            "type": "PHQ-9",
-            "responses": assessment_data["responses"],
-            "total_score": total_score,
-            "severity": severity
-        })
+        if background:
+            # Commit the scored assessment now; analysis runs on a worker
+            await db.commit()
+            return {
+                "assessment_id": assessment.id,
+                "severity": severity,
+                "risk_level": phq9.risk_level,
+                "analysis_status": "queued",
+                "analysis_job_id": _enqueue_analysis(assessment, analysis_input)
+            }
         
-        assessment.llm_analysis = rag_analysis
-        assessment.rdoc_domains = rag_analysis.get("rdoc_domains", {})
-        assessment.rdoc_constructs = rag_analysis.get("rdoc_constructs", {})
+        # Generate RAG analysis
+        rag_analysis = await rag_system.analyze_assessment(analysis_input)
+        _apply_analysis(assessment, rag_analysis)
         
-        db.commit()
+        await db.commit()
         
         return {
             "assessment_id": assessment.id,
@@ -88,51 +216,67 @@ async def create_phq9_assessment(
 @router.post("/gad7/", response_model=Dict[str, Any])
 async def create_gad7_assessment(
     assessment_data: Dict[str, Any],
-    db: Session = Depends(get_db)
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
-    """Create GAD-7 assessment"""
+    """Create GAD-7 assessment
+    
+    With ``background=true`` the scored assessment is committed immediately
+    and the RAG analysis is queued; poll ``/analysis/jobs/{job_id}``.
+    """
     try:
-        # Validate responses
-        if len(assessment_data["responses"]) != 7:
-            raise ValueError("GAD-7 requires exactly 7 responses")
-            
-        # Calculate scores
-        total_score = sum(assessment_data["responses"].values())
-        severity = GAD7Assessment.calculate_severity(total_score)
+        # Validate and score responses
+        scored = get_instrument(AssessmentType.GAD7.value).score(assessment_data.get("responses"))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        total_score = scored["total"]
+        severity = scored["severity"]
+        analysis_input = _analysis_input(
+            AssessmentType.GAD7.value,
+            scored["items"],
+            total_score,
+            severity
+        )
+        # Lists and mappings are both accepted; store the item-number mapping
+        responses = analysis_input["responses"]
         
         # Create base assessment
         assessment = Assessment(
             session_id=assessment_data["session_id"],
             assessment_type=AssessmentType.GAD7.value,
-            scores=assessment_data["responses"],
+            scores=responses,
             total_score=total_score,
             severity_level=severity
         )
         db.add(assessment)
-        db.flush()
+        await db.flush()
         
         # Create GAD-7 specific assessment
         gad7 = GAD7Assessment(
             assessment_id=assessment.id,
-            question_responses=assessment_data["responses"],
+            question_responses=responses,
             functional_impact=assessment_data.get("functional_impact", ""),
             anxiety_severity=severity
         )
         db.add(gad7)
         
-        # Generate RAG analysis
-        rag_analysis = await rag_system.analyze_assessment({
-            "type": "GAD-7",
-            "responses": assessment_data["responses"],
-            "total_score": total_score,
-            "severity": severity
-        })
+        if background:
+            # Commit the scored assessment now; analysis runs on a worker
+            await db.commit()
+            return {
+                "assessment_id": assessment.id,
+                "severity": severity,
+                "analysis_status": "queued",
+                "analysis_job_id": _enqueue_analysis(assessment, analysis_input)
+            }
         
-        assessment.llm_analysis = rag_analysis
-        assessment.rdoc_domains = rag_analysis.get("rdoc_domains", {})
-        assessment.rdoc_constructs = rag_analysis.get("rdoc_constructs", {})
+        # Generate RAG analysis
+        rag_analysis = await rag_system.analyze_assessment(analysis_input)
+        _apply_analysis(assessment, rag_analysis)
         
-        db.commit()
+        await db.commit()
         
         return {
             "assessment_id": assessment.id,
@@ -148,28 +292,301 @@ async def create_gad7_assessment(
             detail=str(e)
         )
 
+def _validate_submission(submission: Any) -> Tuple[str, List[int]]:
+    """Instrument name and answer vector of one bulk item"""
+    if not isinstance(submission, dict):
+        raise ValueError("Submission must be an object")
+    try:
+        instrument = get_instrument(submission.get("type"))
+    except UnknownInstrumentError:
+        raise ValueError(f"type must be one of {sorted(INSTRUMENTS)}")
+    if not isinstance(submission.get("session_id"), str) or not submission["session_id"]:
+        raise ValueError("session_id is required")
+    impact = submission.get("functional_impact")
+    if impact is not None and not isinstance(impact, str):
+        raise ValueError("functional_impact must be a string")
+    return instrument.name, response_vector(submission.get("responses"), instrument)
+
+@router.post("/bulk/", response_model=Dict[str, Any])
+async def create_assessments_bulk(
+    payload: Dict[str, Any],
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
+    """Create a batch of assessments in one transaction
+    
+    Expects ``{"submissions": [{"type", "session_id", "responses",
+    "functional_impact"?}, ...]}`` where ``type`` names a scoring
+    instrument (PHQ-9, GAD-7 or a registered one) and ``responses`` is a
+    list of item answers or an item-number mapping. Valid items are scored
+    per instrument in one pass and inserted with multi-row INSERTs; invalid
+    ones are reported and skipped. RAG analysis is queued once per distinct
+    instrument and answer vector and applied to every assessment sharing it.
+    
+    ``results[i]`` is the status of ``submissions[i]``.
+    """
+    submissions = payload.get("submissions")
+    if not isinstance(submissions, list) or not submissions:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="submissions must be a non-empty list"
+        )
+    if len(submissions) > settings.ASSESSMENT_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {settings.ASSESSMENT_BULK_MAX_ITEMS} submissions per request"
+        )
+    
+    results: List[Dict[str, Any]] = [{"index": i} for i in range(len(submissions))]
+    by_type: Dict[str, List[Tuple[int, List[int]]]] = {}
+    for index, submission in enumerate(submissions):
+        try:
+            assessment_type, vector = _validate_submission(submission)
+        except ValueError as e:
+            results[index].update(status="invalid", error=str(e))
+            continue
+        by_type.setdefault(assessment_type, []).append((index, vector))
+    
+    rows, children, assessment_ids = [], [], []
+    created_at = datetime.utcnow()
+    try:
+        for assessment_type, items in by_type.items():
+            scored = get_instrument(assessment_type).score_matrix([vector for _, vector in items])
+            risk_levels = scored["risk_level"]
+            for position, (index, vector) in enumerate(items):
+                submission = submissions[index]
+                severity = scored["severity"][position]
+                risk_level = risk_levels[position] if risk_levels is not None else None
+                scores = {str(item): value for item, value in enumerate(vector, start=1)}
+                rows.append({
+                    "session_id": submission["session_id"],
+                    "timestamp": created_at,
+                    "assessment_type": assessment_type,
+                    "scores": scores,
+                    "total_score": float(scored["totals"][position]),
+                    "severity_level": severity
+                })
+                child = {
+                    "question_responses": scores,
+                    "functional_impact": submission.get("functional_impact", "")
+                }
+                if assessment_type == AssessmentType.PHQ9.value:
+                    child.update(
+                        suicidal_ideation_score=vector[8],
+                        depression_severity=severity,
+                        risk_level=risk_level
+                    )
+                elif assessment_type == AssessmentType.GAD7.value:
+                    child["anxiety_severity"] = severity
+                children.append((index, assessment_type, child, risk_level))
+        
+        if rows:
+            # Core inserts on the tables: one multi-row INSERT ... RETURNING
+            # per batch instead of a flush per assessment
+            assessment_ids = (await db.execute(
+                insert(Assessment.__table__).returning(
+                    Assessment.__table__.c.id,
+                    sort_by_parameter_order=True
+                ),
+                rows
+            )).scalars().all()
+            for assessment_type, model in DETAIL_MODELS.items():
+                child_rows = [
+                    {**child, "assessment_id": assessment_id}
+                    for (_, kind, child, _), assessment_id in zip(children, assessment_ids)
+                    if kind == assessment_type
+                ]
+                if child_rows:
+                    await db.execute(insert(model.__table__), child_rows)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error creating bulk assessments: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    
+    # One analysis per distinct instrument + answer vector
+    groups: Dict[Tuple[str, Tuple[int, ...]], List[int]] = {}
+    for (index, assessment_type, _, risk_level), assessment_id, row in zip(children, assessment_ids, rows):
+        key = (assessment_type, tuple(row["scores"].values()))
+        groups.setdefault(key, []).append(index)
+        results[index].update(
+            status="created",
+            assessment_id=assessment_id,
+            total_score=row["total_score"],
+            severity=row["severity_level"],
+            risk_level=risk_level
+        )
+    
+    payloads = []
+    for (assessment_type, vector), indices in groups.items():
+        first = results[indices[0]]
+        payloads.append({
+            "assessment_ids": [results[i]["assessment_id"] for i in indices],
+            "analysis_input": _analysis_input(
+                assessment_type,
+                list(vector),
+                first["total_score"],
+                first["severity"]
+            )
+        })
+    job_ids = analysis_workers.enqueue_many(ANALYSIS_JOB, payloads) if payloads else []
+    for job_id, indices in zip(job_ids, groups.values()):
+        for index in indices:
+            results[index].update(analysis_status="queued", analysis_job_id=job_id)
+    
+    return {
+        "created": len(children),
+        "invalid": len(submissions) - len(children),
+        "analysis_jobs": len(job_ids),
+        "results": results
+    }
+
 @router.get("/history/{session_id}", response_model=List[Dict[str, Any]])
 async def get_assessment_history(
     session_id: str,
+    response: Response,
     assessment_type: Optional[str] = None,
-    db: Session = Depends(get_db)
+    limit: int = Query(settings.API_PAGE_SIZE_DEFAULT, ge=1, le=settings.API_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ) -> List[Dict[str, Any]]:
-    """Get assessment history for a session"""
+    """Get assessment history for a session, newest first
+
+    Returns at most ``limit`` assessments; when more exist the
+    ``X-Next-Cursor`` header holds the ``cursor`` for the next page.
+    ``fields`` is a comma-separated subset of the assessment keys.
+    """
+    try:
+        projection = parse_fields(fields, ASSESSMENT_FIELDS)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     try:
-        query = db.query(Assessment).filter(
+        # id and timestamp are always loaded to build the next cursor
+        columns = dict.fromkeys(projection + ["id", "timestamp"])
+        query = select(*(getattr(Assessment, name) for name in columns)).where(
             Assessment.session_id == session_id
         )
         
         if assessment_type:
-            query = query.filter(Assessment.assessment_type == assessment_type)
+            query = query.where(Assessment.assessment_type == assessment_type)
             
-        assessments = query.order_by(Assessment.timestamp.desc()).all()
+        query = keyset_page(
+            query, Assessment.timestamp, Assessment.id, after, limit, descending=True
+        )
+        rows, next_cursor = split_page((await db.execute(query)).all(), limit)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
-        return [assessment.to_dict() for assessment in assessments]
+        return [
+            {
+                name: value.isoformat() if isinstance(value, datetime) else value
+                for name, value in ((name, getattr(row, name)) for name in projection)
+            }
+            for row in rows
+        ]
         
     except Exception as e:
         logger.error(f"Error retrieving assessment history: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+@router.post("/analysis/stream/")
+async def stream_assessment_analysis(
+    assessment_data: Dict[str, Any]
+) -> StreamingResponse:
+    """Stream RAG analysis of an assessment as server-sent events
+    
+    Expects ``{"type", "responses"}``; the answers are validated and scored
+    here, so the analysis (and the cache entry it fills) only ever sees a
+    server-computed total and severity. Emits ``context``, ``claude_delta``,
+    ``gpt4_delta`` and a final ``analysis`` event.
+    """
+    try:
+        instrument = get_instrument(assessment_data.get("type"))
+    except UnknownInstrumentError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"type must be one of {sorted(INSTRUMENTS)}"
+        )
+    try:
+        scored = instrument.score(assessment_data.get("responses"))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    analysis_input = _analysis_input(
+        instrument.name,
+        scored["items"],
+        scored["total"],
+        scored["severity"]
+    )
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in rag_system.stream_assessment_analysis(analysis_input):
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming assessment analysis: {str(e)}")
+            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "assessment_id": job["payload"].get("assessment_id"),
+        "assessment_ids": job["payload"].get("assessment_ids"),
+        "result": job["result"],
+        "error": job["error"] if job["status"] == FAILED else None
+    }
+
+@router.get("/analysis/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_analysis_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30)
+) -> Dict[str, Any]:
+    """Get background analysis status, optionally long-polling up to ``wait`` seconds"""
+    job = await analysis_workers.wait(job_id, timeout=wait)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Analysis job {job_id} not found"
+        )
+    return _job_status(job)
+
+@router.get("/analysis/jobs/{job_id}/events")
+async def stream_analysis_job(job_id: str) -> StreamingResponse:
+    """Server-sent events for a background analysis; ends when it completes"""
+    async def event_stream() -> AsyncIterator[str]:
+        while True:
+            job = await analysis_workers.wait(job_id, timeout=15)
+            if job is None:
+                yield f"event: error\ndata: {json.dumps('job not found')}\n\n"
+                return
+            if job["status"] in (SUCCEEDED, FAILED):
+                yield f"event: {job['status']}\ndata: {json.dumps(_job_status(job))}\n\n"
+                return
+            # Keep-alive while the job is queued or running
+            yield f"event: status\ndata: {json.dumps(_job_status(job))}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/analysis-cache/", response_model=Dict[str, Any])
+async def get_analysis_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss counters for the assessment analysis cache"""
+    return rag_system.analysis_cache.info()
\ No newline at end of file
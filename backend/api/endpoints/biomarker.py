@@ -1,69 +1,217 @@
 # backend/api/endpoints/biomarker.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
-from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+    WebSocket,
+    WebSocketDisconnect
+)
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, List, Literal, Optional, Tuple
+from datetime import datetime
+import asyncio
+import json
+import os
 import numpy as np
+import torch
 
-from backend.core.database import get_db
+from backend.core.config import settings
+from backend.core.database import get_async_db
 from backend.models.biomarker_model import BiomarkerRecord
-from backend.utils.preprocessing import BiomarkerPreprocessor
-from backend.services.aws_service import AWSService
-from backend.services.nvidia_service import NvidiaService
+from backend.utils.streaming import (
+    AUDIO_CHUNK,
+    FACIAL_FRAME,
+    MAX_FRAME_PIXELS,
+    BiomarkerStreamBuffer,
+    StreamConfig,
+    StreamWindow
+)
+from backend.utils.video import FrameSampling, container_suffix, iter_frame_batches, write_video_file
+from backend.utils.uploads import (
+    UploadBufferPool,
+    UploadPart,
+    UploadTooLargeError,
+    read_multipart_parts,
+    release_parts
+)
+from backend.utils.pagination import decode_cursor, keyset_page, parse_fields, split_page
+from backend.services.biomarker_rollups import (
+    ROLLUP_METRICS,
+    load_rollups,
+    update_rollups
+)
+from backend.services.container import (
+    aws_service,
+    nvidia_service,
+    preprocessor
+)
+from backend.services.nvidia_service import ModelNotLoadedError
 from backend.core.logging import logger
 
 router = APIRouter()
-preprocessor = BiomarkerPreprocessor()
-aws_service = AWSService()
-nvidia_service = NvidiaService()
 
-@router.post("/process/", response_model=Dict[str, Any])
+upload_buffers = UploadBufferPool(settings.UPLOAD_BUFFER_POOL_BYTES)
+
+_UPLOAD_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["facial_data", "vocal_data"],
+                    "properties": {
+                        "facial_data": {
+                            "type": "string",
+                            "format": "binary",
+                            "description": (
+                                "One raw HxWxC uint8 frame, or a video "
+                                "(MP4/MOV, WebM/MKV or AVI)"
+                            )
+                        },
+                        "vocal_data": {
+                            "type": "string",
+                            "format": "binary",
+                            "description": "Raw little-endian float32 samples"
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+async def _read_biomarker_upload(
+    request: Request,
+    frame_shape: Tuple[int, int, int]
+) -> Tuple[Dict[str, UploadPart], np.ndarray, np.ndarray, Optional[str]]:
+    """Receive the facial frame or video and audio into pooled buffers
+    
+    Returns the parts (release them when done), zero-copy views of the
+    facial data and samples, and the container suffix when the facial data
+    is a video (the view is then the encoded bytes).
+    """
+    height, width, channels = frame_shape
+    if height * width > MAX_FRAME_PIXELS or channels not in (1, 3):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Frame must be at most {MAX_FRAME_PIXELS} pixels with 1 or 3 channels"
+        )
+    
+    frame_bytes = height * width * channels
+    limits = {
+        "facial_data": max(frame_bytes, settings.UPLOAD_MAX_VIDEO_BYTES),
+        "vocal_data": settings.UPLOAD_MAX_VOCAL_BYTES
+    }
+    parts: Dict[str, UploadPart] = {}
+    try:
+        parts = await read_multipart_parts(request, limits, upload_buffers)
+        missing = [name for name in limits if name not in parts]
+        if missing:
+            raise ValueError(f"Missing form fields: {', '.join(missing)}")
+        facial_array = parts["facial_data"].array(np.uint8)
+        video_suffix = container_suffix(facial_array)
+        if video_suffix is None:
+            if facial_array.size != frame_bytes:
+                raise ValueError(
+                    f"facial_data must be a video or {frame_bytes} bytes for a "
+                    f"{height}x{width}x{channels} frame"
+                )
+            facial_array = facial_array.reshape(frame_shape)
+        vocal_array = parts["vocal_data"].array(np.dtype("<f4"))
+        if not vocal_array.size:
+            raise ValueError("vocal_data is empty")
+        return parts, facial_array, vocal_array, video_suffix
+    except UploadTooLargeError as e:
+        release_parts(parts.values())
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(e)
+        )
+    except ValueError as e:
+        release_parts(parts.values())
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+def _preprocess_upload(
+    facial_array: np.ndarray,
+    vocal_array: np.ndarray
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    return (
+        preprocessor.preprocess_facial(facial_array),
+        preprocessor.preprocess_vocal(vocal_array)
+    )
+
+@router.post("/process/", response_model=Dict[str, Any], openapi_extra=_UPLOAD_SCHEMA)
 async def process_biomarkers(
     session_id: str,
-    facial_data: UploadFile = File(...),
-    vocal_data: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    request: Request,
+    frame_height: int = Query(480, ge=1),
+    frame_width: int = Query(640, ge=1),
+    channels: int = Query(3),
+    target_fps: Optional[float] = Query(None, gt=0),
+    frame_stride: int = Query(1, ge=1),
+    sample_rate: int = Query(16000, ge=8000, le=48000),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
-    """Process facial and vocal biomarkers"""
+    """Process facial and vocal biomarkers
+    
+    Expects multipart ``facial_data`` (one raw frame of the given shape, or
+    a short video) and ``vocal_data`` (float32 samples). The body is
+    streamed into pooled buffers rather than spooled and read into memory;
+    oversized parts are rejected with 413 as soon as they cross their limit.
+    
+    Videos are sampled every ``frame_stride`` frames, or coarser to reach
+    ``target_fps`` (default ``VIDEO_TARGET_FPS``), up to
+    ``VIDEO_MAX_FRAMES`` frames. ``sample_rate`` is that of ``vocal_data``.
+    """
+    parts, facial_array, vocal_array, video_suffix = await _read_biomarker_upload(
+        request,
+        (frame_height, frame_width, channels)
+    )
     try:
-        # Read and preprocess data
-        facial_array = np.frombuffer(await facial_data.read(), dtype=np.uint8)
-        vocal_array = np.frombuffer(await vocal_data.read(), dtype=np.float32)
-        
-        # Preprocess biomarkers
-        facial_tensor = preprocessor.preprocess_facial(facial_array)
-        vocal_tensor = preprocessor.preprocess_vocal(vocal_array)
-        
-        # Move to GPU if available
-        facial_tensor = nvidia_service.to_device(facial_tensor)
-        vocal_tensor = nvidia_service.to_device(vocal_tensor)
-        
-        # Extract features
-        facial_features = nvidia_service.extract_facial_features(facial_tensor)
-        vocal_features = nvidia_service.extract_vocal_features(vocal_tensor)
-        
-        # Process emotions and metrics
-        emotions = nvidia_service.process_emotions(facial_features)
-        action_units = nvidia_service.process_action_units(facial_features)
-        prosody = nvidia_service.process_prosody(vocal_features)
-        
-        # Create record
-        record = BiomarkerRecord(
-            session_id=session_id,
-            facial_features=facial_features.cpu().numpy().tolist(),
-            facial_action_units=action_units,
-            facial_emotions=emotions,
-            vocal_features=vocal_features.cpu().numpy().tolist(),
-            vocal_prosody=prosody,
-            arousal_level=float(np.mean(emotions["arousal"])),
-            valence_level=float(np.mean(emotions["valence"])),
-            stress_level=float(np.mean(emotions["stress"]))
-        )
+        if video_suffix:
+            sampling = FrameSampling(
+                target_fps=target_fps or settings.VIDEO_TARGET_FPS,
+                stride=frame_stride,
+                max_frames=settings.VIDEO_MAX_FRAMES,
+                batch_size=settings.VIDEO_BATCH_SIZE
+            )
+            analysis = await _analyze_video_upload(
+                facial_array,
+                video_suffix,
+                vocal_array,
+                sample_rate,
+                sampling
+            )
+        else:
+            # Preprocess biomarkers
+            facial_tensor, vocal_tensor = await run_in_threadpool(
+                _preprocess_upload,
+                facial_array,
+                vocal_array
+            )
+            
+            # Extract features and metrics
+            analysis = await _analyze_biomarkers(
+                facial_tensor,
+                vocal_tensor,
+                vocal_array,
+                sample_rate
+            )
+        record = _build_record(session_id, analysis)
         
         db.add(record)
-        db.commit()
+        await db.flush()
+        await update_rollups(db, [record])
+        await db.commit()
         
-        # Store raw data in S3
+        # Store raw data in S3; copies the arrays and uploads in the background
         await aws_service.upload_biomarker_data(
             session_id,
             facial_data=facial_array,
@@ -72,9 +220,10 @@ async def process_biomarkers(
         
         return {
             "record_id": record.id,
-            "emotions": emotions,
-            "action_units": action_units,
-            "prosody": prosody,
+            "emotions": analysis["emotions"],
+            "action_units": analysis["action_units"],
+            "prosody": analysis["prosody"],
+            "quality": analysis["quality"],
             "metrics": {
                 "arousal": record.arousal_level,
                 "valence": record.valence_level,
@@ -82,41 +231,329 @@ async def process_biomarkers(
             }
         }
         
+    except HTTPException:
+        raise
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except Exception as e:
         logger.error(f"Error processing biomarkers: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
+    finally:
+        # The raw arrays are views into these buffers
+        release_parts(parts.values())
+
+async def _analyze_biomarkers(
+    facial_tensor: torch.Tensor,
+    vocal_tensor: torch.Tensor,
+    audio: np.ndarray,
+    sample_rate: int
+) -> Dict[str, Any]:
+    """Run feature extraction and emotion/prosody analysis"""
+    # Extract features, sharing forward passes with concurrent requests;
+    # prosody runs on the raw audio in the threadpool meanwhile
+    facial_features, vocal_features, voice = await asyncio.gather(
+        nvidia_service.extract_facial_features_batched(facial_tensor),
+        nvidia_service.extract_vocal_features_batched(vocal_tensor),
+        run_in_threadpool(nvidia_service.process_prosody, audio, sample_rate)
+    )
+    return _analyze_features(facial_features, vocal_features, voice)
+
+def _analyze_features(
+    facial_features: torch.Tensor,
+    vocal_features: torch.Tensor,
+    voice: Dict[str, Dict[str, float]]
+) -> Dict[str, Any]:
+    """Emotion and action unit analysis of extracted features, plus voice measures"""
+    return {
+        "facial_features": facial_features,
+        "vocal_features": vocal_features,
+        "emotions": nvidia_service.process_emotions(facial_features),
+        "action_units": nvidia_service.process_action_units(facial_features),
+        "prosody": voice["prosody"],
+        "quality": voice["quality"]
+    }
+
+def _pool_frame_features(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Average per-frame facial features so a record stores one vector"""
+    analysis["facial_features"] = analysis["facial_features"].mean(
+        dim=0,
+        keepdim=True
+    )
+    return analysis
+
+async def _extract_video_features(
+    video: np.ndarray,
+    suffix: str,
+    sampling: FrameSampling
+) -> torch.Tensor:
+    """Facial features of the sampled frames of a video, batch by batch
+    
+    Decoding runs ahead on its own thread while the previous batch is
+    preprocessed and run through the model, so only a few batches of
+    frames are in memory at once.
+    """
+    path = await run_in_threadpool(write_video_file, video, suffix)
+    batches = iter_frame_batches(path, sampling)
+    features = []
+    try:
+        while True:
+            try:
+                frames = await run_in_threadpool(next, batches, None)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            if frames is None:
+                break
+            facial_tensor = await run_in_threadpool(
+                preprocessor.preprocess_facial_batch,
+                frames
+            )
+            features.append(
+                await nvidia_service.extract_facial_features_batched(facial_tensor)
+            )
+    finally:
+        await run_in_threadpool(batches.close)
+        os.unlink(path)
+    
+    if not features:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No frames could be decoded from facial_data"
+        )
+    return torch.cat(features)
+
+async def _analyze_video_upload(
+    video: np.ndarray,
+    suffix: str,
+    vocal_array: np.ndarray,
+    sample_rate: int,
+    sampling: FrameSampling
+) -> Dict[str, Any]:
+    """Analyze an uploaded video alongside its audio"""
+    async def extract_vocal():
+        vocal_tensor = await run_in_threadpool(preprocessor.preprocess_vocal, vocal_array)
+        return await nvidia_service.extract_vocal_features_batched(vocal_tensor)
+    
+    facial_features, vocal_features, voice = await asyncio.gather(
+        _extract_video_features(video, suffix, sampling),
+        extract_vocal(),
+        run_in_threadpool(nvidia_service.process_prosody, vocal_array, sample_rate)
+    )
+    return _pool_frame_features(_analyze_features(facial_features, vocal_features, voice))
+
+def _build_record(session_id: str, analysis: Dict[str, Any]) -> BiomarkerRecord:
+    """Create a biomarker record from extracted features"""
+    emotions = analysis["emotions"]
+    return BiomarkerRecord(
+        session_id=session_id,
+        facial_features=analysis["facial_features"].cpu().numpy(),
+        facial_action_units=analysis["action_units"],
+        facial_emotions=emotions,
+        vocal_features=analysis["vocal_features"].cpu().numpy(),
+        vocal_prosody=analysis["prosody"],
+        vocal_quality=analysis["quality"],
+        arousal_level=float(np.mean(emotions["arousal"])),
+        valence_level=float(np.mean(emotions["valence"])),
+        stress_level=float(np.mean(emotions["stress"]))
+    )
+
+def _preprocess_stream_window(window: StreamWindow) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Preprocess the frames and audio of one stream window"""
+    facial_tensor = preprocessor.preprocess_facial_batch(window.frames)
+    vocal_tensor = preprocessor.preprocess_vocal(window.audio)
+    return facial_tensor, vocal_tensor
+
+async def _analyze_stream_window(window: StreamWindow, sample_rate: int) -> Dict[str, Any]:
+    """Preprocess and analyze one window of a live stream"""
+    facial_tensor, vocal_tensor = await run_in_threadpool(
+        _preprocess_stream_window,
+        window
+    )
+    analysis = await _analyze_biomarkers(
+        facial_tensor,
+        vocal_tensor,
+        window.audio,
+        sample_rate
+    )
+    return _pool_frame_features(analysis)
+
+@router.websocket("/stream/{session_id}")
+async def stream_biomarkers(
+    websocket: WebSocket,
+    session_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream facial frames and audio, analyzing fixed windows incrementally
+    
+    Protocol:
+        - Optional text message ``{"type": "config", ...}`` (see StreamConfig)
+          before any binary data.
+        - Binary messages tagged by their first byte: 0x01 followed by a raw
+          HxWxC uint8 frame, 0x02 followed by float32 little-endian PCM.
+        - Text message ``{"type": "end"}`` flushes the partial window and
+          closes the stream.
+    
+    Each completed window is persisted as a BiomarkerRecord and answered
+    with a ``{"type": "window", ...}`` message carrying its metrics.
+    """
+    await websocket.accept()
+    
+    config = StreamConfig()
+    buffer: Optional[BiomarkerStreamBuffer] = None
+    
+    async def process_window(window: StreamWindow):
+        if not len(window.frames):
+            await websocket.send_json({
+                "type": "window",
+                "window_index": window.index,
+                "status": "skipped",
+                "detail": "No facial frames received in window"
+            })
+            return
+        
+        analysis = await _analyze_stream_window(window, config.sample_rate)
+        record = _build_record(session_id, analysis)
+        db.add(record)
+        await db.flush()
+        await update_rollups(db, [record])
+        await db.commit()
+        
+        # Raw window data goes to S3 in the background
+        await aws_service.upload_biomarker_data(
+            session_id,
+            facial_data=window.frames,
+            vocal_data=window.audio,
+            window_index=window.index
+        )
+        
+        await websocket.send_json({
+            "type": "window",
+            "window_index": window.index,
+            "record_id": record.id,
+            "frame_count": len(window.frames),
+            "duration": len(window.audio) / config.sample_rate,
+            "emotions": analysis["emotions"],
+            "metrics": {
+                "arousal": record.arousal_level,
+                "valence": record.valence_level,
+                "stress": record.stress_level
+            }
+        })
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            
+            if message.get("text") is not None:
+                control = json.loads(message["text"])
+                if control.get("type") == "config":
+                    if buffer is not None:
+                        raise ValueError("Stream already configured")
+                    config = StreamConfig.from_message(control)
+                    buffer = BiomarkerStreamBuffer(config)
+                    await websocket.send_json({
+                        "type": "ready",
+                        "window_samples": config.window_samples,
+                        "buffer_bytes": buffer.nbytes
+                    })
+                elif control.get("type") == "end":
+                    if buffer is not None:
+                        window = buffer.flush()
+                        if window is not None:
+                            await process_window(window)
+                    await websocket.close()
+                    break
+                continue
+            
+            payload = message.get("bytes") or b""
+            if not payload:
+                continue
+            if buffer is None:
+                buffer = BiomarkerStreamBuffer(config)
+            
+            tag, body = payload[0], payload[1:]
+            if tag == FACIAL_FRAME:
+                buffer.add_frame(body)
+            elif tag == AUDIO_CHUNK:
+                for window in buffer.add_audio(body):
+                    await process_window(window)
+            else:
+                raise ValueError(f"Unknown stream message tag: {tag}")
+    
+    except WebSocketDisconnect:
+        logger.info(f"Biomarker stream closed for session {session_id}")
+    except Exception as e:
+        logger.error(f"Error streaming biomarkers: {str(e)}")
+        await db.rollback()
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
 
 @router.get("/metrics/{session_id}", response_model=Dict[str, Any])
 async def get_biomarker_metrics(
     session_id: str,
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
-    db: Session = Depends(get_db)
+    resolution: Literal["raw", "hour", "day"] = "raw",
+    limit: int = Query(settings.API_PAGE_SIZE_DEFAULT, ge=1, le=settings.API_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
-    """Get biomarker metrics for a session"""
+    """Get biomarker metrics for a session
+    
+    Raw records are paged oldest first, at most ``limit`` per response;
+    pass the returned ``next_cursor`` back as ``cursor`` to continue.
+    ``fields`` selects a comma-separated subset of the metrics.
+    
+    ``resolution=hour|day`` answers from the rollup tables with one mean per
+    bucket (plus counts, std, min and max) instead of scanning raw records;
+    the time window is widened to whole buckets.
+    """
     try:
-        query = db.query(BiomarkerRecord).filter(
+        metrics = parse_fields(fields, ROLLUP_METRICS)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        if resolution != "raw":
+            return await _get_rollup_metrics(
+                db,
+                session_id,
+                resolution,
+                start_time,
+                end_time,
+                metrics
+            )
+        
+        columns = {metric: getattr(BiomarkerRecord, f"{metric}_level") for metric in metrics}
+        query = select(
+            BiomarkerRecord.id,
+            BiomarkerRecord.timestamp,
+            *(column.label(metric) for metric, column in columns.items())
+        ).where(
             BiomarkerRecord.session_id == session_id
         )
         
         if start_time:
-            query = query.filter(BiomarkerRecord.timestamp >= start_time)
+            query = query.where(BiomarkerRecord.timestamp >= start_time)
         if end_time:
-            query = query.filter(BiomarkerRecord.timestamp <= end_time)
+            query = query.where(BiomarkerRecord.timestamp <= end_time)
             
-        records = query.order_by(BiomarkerRecord.timestamp).all()
+        query = keyset_page(query, BiomarkerRecord.timestamp, BiomarkerRecord.id, after, limit)
+        rows, next_cursor = split_page((await db.execute(query)).all(), limit)
         
         return {
             "session_id": session_id,
             "metrics": {
-                "arousal": [r.arousal_level for r in records],
-                "valence": [r.valence_level for r in records],
-                "stress": [r.stress_level for r in records]
+                metric: [getattr(r, metric) for r in rows] for metric in metrics
             },
-            "timestamps": [r.timestamp.isoformat() for r in records]
+            "timestamps": [r.timestamp.isoformat() for r in rows],
+            "next_cursor": next_cursor
         }
         
     except Exception as e:
@@ -124,4 +561,39 @@ async def get_biomarker_metrics(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+async def _get_rollup_metrics(
+    db: AsyncSession,
+    session_id: str,
+    resolution: str,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    metrics: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Per-bucket metric summaries from the rollup tables"""
+    rollups = await load_rollups(db, session_id, resolution, start_time, end_time)
+    counts = np.array([r.record_count for r in rollups], dtype=np.float64)
+    
+    means_by_metric, spread = {}, {}
+    for metric in metrics or ROLLUP_METRICS:
+        sums = np.array([getattr(r, f"{metric}_sum") for r in rollups], dtype=np.float64)
+        sumsqs = np.array([getattr(r, f"{metric}_sumsq") for r in rollups], dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+            stds = np.sqrt(np.maximum(sumsqs / counts - means ** 2, 0.0))
+        means_by_metric[metric] = means.tolist()
+        spread[metric] = {
+            "std": stds.tolist(),
+            "min": [getattr(r, f"{metric}_min") for r in rollups],
+            "max": [getattr(r, f"{metric}_max") for r in rollups]
+        }
+    
+    return {
+        "session_id": session_id,
+        "resolution": resolution,
+        "metrics": means_by_metric,
+        "timestamps": [r.bucket_start.isoformat() for r in rollups],
+        "counts": counts.astype(int).tolist(),
+        "spread": spread
+    }
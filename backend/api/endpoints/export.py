@@ -0,0 +1,60 @@
+# backend/api/endpoints/export.py
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Literal, Optional
+from datetime import datetime
+
+from backend.core.config import settings
+from backend.core.database import AsyncSessionLocal
+from backend.services.exports import (
+    arrow_available,
+    describe_export,
+    export_query,
+    stream_export
+)
+from backend.core.logging import logger
+
+router = APIRouter()
+
+@router.get("/{source}/")
+async def export_records(
+    source: Literal["assessments", "biomarkers"],
+    session_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    format: Literal["ndjson", "arrow"] = "ndjson",
+    gzip: bool = False
+) -> StreamingResponse:
+    """Stream assessments or biomarker records as NDJSON or Arrow IPC
+
+    Without ``session_id`` every row in the time window is exported, for
+    research dumps. Rows are read through a server-side cursor and written
+    out one batch at a time, so worker memory does not grow with the
+    export. ``gzip=true`` compresses the stream.
+    """
+    if format == "arrow" and not arrow_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Arrow export requires pyarrow"
+        )
+
+    query = export_query(source, session_id, start_time, end_time)
+    export = describe_export(source, format, gzip)
+
+    async def body() -> AsyncIterator[bytes]:
+        # The request's session is closed once the response starts, so the
+        # stream holds its own
+        async with AsyncSessionLocal() as db:
+            try:
+                async for chunk in stream_export(db, query, format, gzip, settings.EXPORT_BATCH_SIZE):
+                    yield chunk
+            except Exception as e:
+                logger.error(f"Error exporting {source}: {str(e)}")
+                raise
+
+    return StreamingResponse(
+        body(),
+        media_type=export["media_type"],
+        headers={"Content-Disposition": f'attachment; filename="{export["filename"]}"'}
+    )
@@ -0,0 +1,28 @@
+# backend/api/endpoints/monitoring.py
+
+from fastapi import APIRouter, HTTPException, status
+from typing import Dict, Any, List
+
+from backend.core.database import pool_status
+from backend.core.registry import registry
+from backend.core.logging import logger
+
+router = APIRouter()
+
+@router.get("/db-pool/", response_model=Dict[str, Any])
+async def get_db_pool_status() -> Dict[str, Any]:
+    """Connection pool utilisation and checkout wait metrics per engine"""
+    try:
+        return pool_status()
+        
+    except Exception as e:
+        logger.error(f"Error retrieving pool status: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@router.get("/startup/", response_model=List[Dict[str, Any]])
+async def get_startup_report() -> List[Dict[str, Any]]:
+    """Per-service construction times from the service registry"""
+    return registry.report()
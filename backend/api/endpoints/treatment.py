@@ -1,9 +1,19 @@
 # Continuing backend/api/endpoints/treatment.py
 
+from typing import Literal, Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.database import get_async_db
+from backend.services.biomarker_rollups import load_rollups
+from backend.utils.biomarker_aggregation import BiomarkerColumns, RollupColumns
+
 async def _get_recent_biomarkers(
     session_id: str,
-    db: Session,
-    timeframe: int = 7  # days
+    db: AsyncSession,
+    timeframe: int = 7,  # days
+    resolution: str = "raw"
 ) -> Dict[str, Any]:
     """Get recent biomarker data for treatment planning
     
@@ -11,6 +21,9 @@ async def _get_recent_biomarkers(
         session_id: Session identifier
         db: Database session
         timeframe: Number of days of data to retrieve
+        resolution: "raw" to aggregate individual records, or "hour"/"day"
+            to answer from the rollup tables (exact means and stds; trends
+            and temporal patterns follow bucket means)
         
     Returns:
         Dict containing processed biomarker data
@@ -19,11 +32,28 @@ async def _get_recent_biomarkers(
         # Calculate time threshold
         threshold = datetime.utcnow() - timedelta(days=timeframe)
         
-        # Query biomarker records
-        records = db.query(BiomarkerRecord).filter(
-            BiomarkerRecord.session_id == session_id,
-            BiomarkerRecord.timestamp >= threshold
-        ).order_by(BiomarkerRecord.timestamp).all()
+        if resolution != "raw":
+            records = await load_rollups(db, session_id, resolution, threshold)
+            columns = RollupColumns(records)
+        else:
+            # Query only the columns the aggregation reads (skips feature vectors)
+            result = await db.execute(select(
+                BiomarkerRecord.timestamp,
+                BiomarkerRecord.arousal_level,
+                BiomarkerRecord.valence_level,
+                BiomarkerRecord.stress_level,
+                BiomarkerRecord.facial_emotions,
+                BiomarkerRecord.facial_action_units,
+                BiomarkerRecord.vocal_prosody,
+                BiomarkerRecord.vocal_quality
+            ).where(
+                BiomarkerRecord.session_id == session_id,
+                BiomarkerRecord.timestamp >= threshold
+            ).order_by(BiomarkerRecord.timestamp))
+            records = result.all()
+            
+            # Materialize records once into column arrays
+            columns = BiomarkerColumns(records)
         
         if not records:
             return {
@@ -33,28 +63,13 @@ async def _get_recent_biomarkers(
         
         # Process and aggregate biomarker data
         processed_data = {
-            "emotional_metrics": {
-                "arousal": {
-                    "mean": float(np.mean([r.arousal_level for r in records])),
-                    "std": float(np.std([r.arousal_level for r in records])),
-                    "trend": _calculate_trend([r.arousal_level for r in records])
-                },
-                "valence": {
-                    "mean": float(np.mean([r.valence_level for r in records])),
-                    "std": float(np.std([r.valence_level for r in records])),
-                    "trend": _calculate_trend([r.valence_level for r in records])
-                },
-                "stress": {
-                    "mean": float(np.mean([r.stress_level for r in records])),
-                    "std": float(np.std([r.stress_level for r in records])),
-                    "trend": _calculate_trend([r.stress_level for r in records])
-                }
-            },
-            "facial_analysis": _aggregate_facial_data(records),
-            "vocal_analysis": _aggregate_vocal_data(records),
+            "emotional_metrics": columns.scalar_summary(),
+            "facial_analysis": _aggregate_facial_data(columns),
+            "vocal_analysis": _aggregate_vocal_data(columns),
             "temporal_patterns": _analyze_temporal_patterns(records),
             "metadata": {
-                "record_count": len(records),
+                "record_count": columns.record_count,
+                "resolution": resolution,
                 "start_time": records[0].timestamp.isoformat(),
                 "end_time": records[-1].timestamp.isoformat()
             }
@@ -135,94 +150,25 @@ async def _generate_next_steps(
             "recommendation": "Error generating recommendations"
         }]
 
-def _calculate_trend(
-    values: List[float],
-    window: int = 3
-) -> str:
-    """Calculate trend direction from series of values"""
-    if len(values) < window:
-        return "insufficient_data"
-        
-    # Calculate moving average
-    ma = np.convolve(values, np.ones(window)/window, mode='valid')
-    
-    if len(ma) < 2:
-        return "stable"
-        
-    # Calculate trend
-    trend = ma[-1] - ma[0]
-    
-    if abs(trend) < 0.1:  # Threshold for stability
-        return "stable"
-    return "increasing" if trend > 0 else "decreasing"
-
-def _aggregate_facial_data(records: List[BiomarkerRecord]) -> Dict[str, Any]:
+def _aggregate_facial_data(
+    columns: Union[BiomarkerColumns, RollupColumns]
+) -> Dict[str, Any]:
     """Aggregate facial biomarker data"""
-    facial_data = {
-        "dominant_emotions": {},
-        "action_unit_frequencies": {},
+    return {
+        "dominant_emotions": columns.mapping_means("facial_emotions"),
+        "action_unit_frequencies": columns.mapping_means("facial_action_units"),
         "emotion_transitions": {}
     }
-    
-    for record in records:
-        # Process emotions
-        if record.facial_emotions:
-            for emotion, value in record.facial_emotions.items():
-                if emotion not in facial_data["dominant_emotions"]:
-                    facial_data["dominant_emotions"][emotion] = []
-                facial_data["dominant_emotions"][emotion].append(value)
-        
-        # Process action units
-        if record.facial_action_units:
-            for au, value in record.facial_action_units.items():
-                if au not in facial_data["action_unit_frequencies"]:
-                    facial_data["action_unit_frequencies"][au] = []
-                facial_data["action_unit_frequencies"][au].append(value)
-    
-    # Calculate averages and frequencies
-    for emotion in facial_data["dominant_emotions"]:
-        facial_data["dominant_emotions"][emotion] = np.mean(
-            facial_data["dominant_emotions"][emotion]
-        )
-    
-    for au in facial_data["action_unit_frequencies"]:
-        facial_data["action_unit_frequencies"][au] = np.mean(
-            facial_data["action_unit_frequencies"][au]
-        )
-    
-    return facial_data
 
-def _aggregate_vocal_data(records: List[BiomarkerRecord]) -> Dict[str, Any]:
+def _aggregate_vocal_data(
+    columns: Union[BiomarkerColumns, RollupColumns]
+) -> Dict[str, Any]:
     """Aggregate vocal biomarker data"""
-    vocal_data = {
-        "prosody_metrics": {},
-        "quality_metrics": {},
+    return {
+        "prosody_metrics": columns.mapping_summary("vocal_prosody"),
+        "quality_metrics": columns.mapping_summary("vocal_quality"),
         "speech_patterns": {}
     }
-    
-    for record in records:
-        if record.vocal_prosody:
-            for metric, value in record.vocal_prosody.items():
-                if metric not in vocal_data["prosody_metrics"]:
-                    vocal_data["prosody_metrics"][metric] = []
-                vocal_data["prosody_metrics"][metric].append(value)
-        
-        if record.vocal_quality:
-            for metric, value in record.vocal_quality.items():
-                if metric not in vocal_data["quality_metrics"]:
-                    vocal_data["quality_metrics"][metric] = []
-                vocal_data["quality_metrics"][metric].append(value)
-    
-    # Calculate averages
-    for category in ["prosody_metrics", "quality_metrics"]:
-        for metric in vocal_data[category]:
-            vocal_data[category][metric] = {
-                "mean": float(np.mean(vocal_data[category][metric])),
-                "std": float(np.std(vocal_data[category][metric])),
-                "trend": _calculate_trend(vocal_data[category][metric])
-            }
-    
-    return vocal_data
 
 def _analyze_temporal_patterns(
     records: List[BiomarkerRecord]
@@ -334,14 +280,16 @@ def _analyze_rdoc_alignment(
 async def get_biomarker_analysis(
     session_id: str,
     timeframe: int = Query(7, gt=0, le=30),
-    db: Session = Depends(get_db)
+    resolution: Literal["raw", "hour", "day"] = "raw",
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get aggregated biomarker analysis for treatment planning"""
     try:
         biomarker_data = await _get_recent_biomarkers(
             session_id,
             db,
-            timeframe
+            timeframe,
+            resolution
         )
         
         if biomarker_data["status"] == "error":
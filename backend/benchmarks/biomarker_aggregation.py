@@ -0,0 +1,164 @@
+# backend/benchmarks/biomarker_aggregation.py
+"""Benchmark the columnar biomarker aggregation against the per-record path
+
+Run from the repository root:
+
+    python -m backend.benchmarks.biomarker_aggregation --records 50000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import numpy as np
+
+from backend.utils.biomarker_aggregation import BiomarkerColumns
+
+EMOTIONS = ["happy", "sad", "angry", "fearful", "surprised", "disgusted", "neutral"]
+ACTION_UNITS = [f"AU{i:02d}" for i in (1, 2, 4, 5, 6, 7, 9, 10, 12, 14, 15, 17, 20, 23, 25, 26)]
+PROSODY = ["pitch_mean", "pitch_std", "energy_mean", "energy_std", "speaking_rate"]
+QUALITY = ["jitter", "shimmer", "hnr"]
+
+def make_records(
+    count: int,
+    missing_rate: float = 0.05,
+    seed: int = 0,
+    frames: int = 0
+) -> List[Any]:
+    """Synthetic records with occasionally missing mapping keys
+
+    With ``frames`` the facial mappings hold a list of that many per-frame
+    scores per key, as ``/process/`` stores them; otherwise scalars.
+    """
+    rng = random.Random(seed)
+    start = datetime.utcnow() - timedelta(days=7)
+
+    def mapping(keys):
+        return {k: rng.random() for k in keys if rng.random() >= missing_rate}
+
+    def frame_mapping(keys):
+        if not frames:
+            return mapping(keys)
+        return {
+            k: [rng.random() for _ in range(frames)]
+            for k in keys if rng.random() >= missing_rate
+        }
+
+    return [
+        SimpleNamespace(
+            timestamp=start + timedelta(seconds=10 * i),
+            arousal_level=rng.random(),
+            valence_level=rng.random(),
+            stress_level=rng.random(),
+            facial_emotions=frame_mapping(EMOTIONS),
+            facial_action_units=frame_mapping(ACTION_UNITS),
+            vocal_prosody=mapping(PROSODY),
+            vocal_quality=mapping(QUALITY)
+        )
+        for i in range(count)
+    ]
+
+# Per-record reference implementation (previous treatment.py helpers)
+
+def _legacy_trend(values: List[float], window: int = 3) -> str:
+    if len(values) < window:
+        return "insufficient_data"
+    ma = np.convolve(values, np.ones(window)/window, mode='valid')
+    if len(ma) < 2:
+        return "stable"
+    trend = ma[-1] - ma[0]
+    if abs(trend) < 0.1:
+        return "stable"
+    return "increasing" if trend > 0 else "decreasing"
+
+def _legacy_aggregate(records: List[Any]) -> Dict[str, Any]:
+    emotional = {}
+    for name in ("arousal", "valence", "stress"):
+        emotional[name] = {
+            "mean": float(np.mean([getattr(r, f"{name}_level") for r in records])),
+            "std": float(np.std([getattr(r, f"{name}_level") for r in records])),
+            "trend": _legacy_trend([getattr(r, f"{name}_level") for r in records])
+        }
+
+    def collect(field):
+        out = {}
+        for r in records:
+            if getattr(r, field):
+                for k, v in getattr(r, field).items():
+                    out.setdefault(k, []).append(v)
+        return out
+
+    facial = {
+        field: {k: np.mean(v) for k, v in collect(field).items()}
+        for field in ("facial_emotions", "facial_action_units")
+    }
+    vocal = {
+        field: {
+            k: {"mean": float(np.mean(v)), "std": float(np.std(v)), "trend": _legacy_trend(v)}
+            for k, v in collect(field).items()
+        }
+        for field in ("vocal_prosody", "vocal_quality")
+    }
+    return {"emotional_metrics": emotional, "facial": facial, "vocal": vocal}
+
+def _columnar_aggregate(records: List[Any]) -> Dict[str, Any]:
+    columns = BiomarkerColumns(records)
+    return {
+        "emotional_metrics": columns.scalar_summary(),
+        "facial": {
+            field: columns.mapping_means(field)
+            for field in ("facial_emotions", "facial_action_units")
+        },
+        "vocal": {
+            field: columns.mapping_summary(field)
+            for field in ("vocal_prosody", "vocal_quality")
+        }
+    }
+
+def _assert_equivalent(expected: Any, actual: Any, path: str = ""):
+    if isinstance(expected, dict):
+        assert list(expected) == list(actual), f"key order differs at {path}"
+        for key in expected:
+            _assert_equivalent(expected[key], actual[key], f"{path}/{key}")
+    elif isinstance(expected, str):
+        assert expected == actual, f"{path}: {expected!r} != {actual!r}"
+    else:
+        assert np.isclose(expected, actual, rtol=1e-12, atol=1e-12), (
+            f"{path}: {expected!r} != {actual!r}"
+        )
+
+def _best_of(fn, records, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(records)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{'records':>10} {'per-record (ms)':>16} {'columnar (ms)':>14} {'speedup':>8}")
+    for count in args.records:
+        # Equal-length frame lists, which the per-record path can average too
+        framed = make_records(min(count, 1000), missing_rate=args.missing_rate, frames=4)
+        _assert_equivalent(_legacy_aggregate(framed), _columnar_aggregate(framed))
+        records = make_records(count, missing_rate=args.missing_rate)
+        _assert_equivalent(_legacy_aggregate(records), _columnar_aggregate(records))
+
+        legacy = _best_of(_legacy_aggregate, records, args.repeat)
+        columnar = _best_of(_columnar_aggregate, records, args.repeat)
+        print(
+            f"{count:>10} {legacy * 1e3:>16.1f} {columnar * 1e3:>14.1f} "
+            f"{legacy / columnar:>7.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# backend/benchmarks/bulk_assessments.py
+"""Benchmark assessment ingestion: one request per submission vs /bulk/
+
+Writes ``--submissions`` PHQ-9/GAD-7 questionnaires, drawn from a small
+pool of answer vectors as clinic batches repeat, to a SQLite file:
+
+* per-request: what ``/phq9/`` and ``/gad7/`` do for each submission, an
+  assessment INSERT, a flush for its id, the questionnaire row and a
+  commit, plus one analysis job;
+* bulk: ``create_assessments_bulk`` in batches of ``--batch``, with one
+  multi-row INSERT per table, one commit and one analysis job per distinct
+  answer vector.
+
+Analysis jobs go to a real SQLite job queue whose handler does nothing.
+Reports submissions per second and jobs queued, then checks that both
+paths stored the same scores.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.bulk_assessments --submissions 5000 --batch 500
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+_REQUIRED_ENV = (
+    "VPC_ID", "PUBLIC_SUBNET_1A", "PUBLIC_SUBNET_1B", "PRIVATE_SUBNET_1A",
+    "PRIVATE_SUBNET_1B", "POSTGRES_USER", "POSTGRES_PASSWORD", "IAM_ROLE_ARN",
+    "ACCESS_KEY_ID", "SECRET_ACCESS_KEY", "SECRET_KEY"
+)
+
+def make_submissions(count: int, distinct: int):
+    rng = np.random.default_rng(0)
+    pool = [
+        ("PHQ-9", rng.integers(0, 4, 9).tolist()) if i % 2 == 0
+        else ("GAD-7", rng.integers(0, 4, 7).tolist())
+        for i in range(distinct)
+    ]
+    return [
+        {
+            "type": kind,
+            "session_id": f"session-{i % 200}",
+            "responses": {str(item): value for item, value in enumerate(vector, start=1)},
+            "functional_impact": "Somewhat difficult"
+        }
+        for i, (kind, vector) in enumerate(pool[j] for j in rng.integers(0, distinct, count))
+    ]
+
+async def per_request(session_factory, workers, submissions):
+    """The single-submission endpoints, one transaction each"""
+    import sqlalchemy as sa
+    from backend.api.endpoints.assessment import ANALYSIS_JOB
+    from backend.models.assessment_model import Assessment, GAD7Assessment, PHQ9Assessment
+    from backend.utils.scoring import PHQ9
+
+    for submission in submissions:
+        responses = submission["responses"]
+        total = sum(responses.values())
+        phq9 = submission["type"] == "PHQ-9"
+        model = PHQ9Assessment if phq9 else GAD7Assessment
+        severity = model.calculate_severity(total)
+        async with session_factory() as db:
+            assessment_id = (await db.execute(
+                sa.insert(Assessment.__table__).returning(Assessment.__table__.c.id),
+                {
+                    "session_id": submission["session_id"],
+                    "assessment_type": submission["type"],
+                    "scores": responses,
+                    "total_score": total,
+                    "severity_level": severity
+                }
+            )).scalar_one()
+            child = {
+                "assessment_id": assessment_id,
+                "question_responses": responses,
+                "functional_impact": submission["functional_impact"]
+            }
+            if phq9:
+                child.update(
+                    suicidal_ideation_score=responses["9"],
+                    depression_severity=severity,
+                    risk_level=PHQ9.score(responses)["risk_level"]
+                )
+            else:
+                child["anxiety_severity"] = severity
+            await db.execute(sa.insert(model.__table__), child)
+            await db.commit()
+        workers.enqueue(ANALYSIS_JOB, {
+            "assessment_id": assessment_id,
+            "analysis_input": {"type": submission["type"], "responses": responses}
+        })
+
+async def bulk(session_factory, submissions, batch: int):
+    from backend.api.endpoints.assessment import create_assessments_bulk
+
+    jobs = 0
+    for offset in range(0, len(submissions), batch):
+        async with session_factory() as db:
+            result = await create_assessments_bulk(
+                {"submissions": submissions[offset:offset + batch]},
+                db
+            )
+        assert result["invalid"] == 0
+        jobs += result["analysis_jobs"]
+    return jobs
+
+async def run(args):
+    import sqlalchemy as sa
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.core.registry import registry
+    from backend.api.endpoints.assessment import ANALYSIS_JOB
+    from backend.models.assessment_model import Assessment, GAD7Assessment, PHQ9Assessment
+    from backend.services.job_queue import JobWorkerPool, SQLiteJobQueue
+
+    async def analyze(payload):
+        return {}
+
+    submissions = make_submissions(args.submissions, args.distinct)
+    with tempfile.TemporaryDirectory() as workdir:
+        metadata = sa.MetaData()
+        sa.Table("treatments", metadata, sa.Column("id", sa.Integer, primary_key=True))
+        for model in (Assessment, PHQ9Assessment, GAD7Assessment):
+            model.__table__.to_metadata(metadata)
+
+        timings = {}
+        for path in ("per-request", "bulk"):
+            engine = create_async_engine(f"sqlite+aiosqlite:///{workdir}/{path}.db")
+            async with engine.begin() as connection:
+                await connection.run_sync(metadata.create_all)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            queue = SQLiteJobQueue(f"{workdir}/{path}-jobs.sqlite3")
+            workers = JobWorkerPool(queue, concurrency=1)
+            workers.register(ANALYSIS_JOB, analyze)
+            registry.override("analysis_workers", workers)
+
+            start = time.perf_counter()
+            if path == "bulk":
+                await bulk(session_factory, submissions, args.batch)
+            else:
+                await per_request(session_factory, workers, submissions)
+            seconds = time.perf_counter() - start
+            await workers.stop()
+
+            columns = Assessment.__table__.c
+            async with engine.connect() as connection:
+                stored = (await connection.execute(
+                    sa.select(columns.session_id, columns.assessment_type, columns.total_score, columns.severity_level)
+                    .order_by(columns.session_id, columns.assessment_type, columns.total_score)
+                )).all()
+            jobs = queue._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            timings[path] = (seconds, jobs, stored)
+            await engine.dispose()
+
+        print(f"{args.submissions} submissions, {args.distinct} distinct answer vectors, "
+              f"bulk batches of {args.batch}")
+        print(f"{'path':<12} {'seconds':>9} {'per second':>11} {'jobs':>7}")
+        for path, (seconds, jobs, _) in timings.items():
+            print(f"{path:<12} {seconds:>9.2f} {args.submissions / seconds:>11.0f} {jobs:>7}")
+        print(f"speedup: {timings['per-request'][0] / timings['bulk'][0]:.1f}x")
+        assert timings["per-request"][2] == timings["bulk"][2]
+        print("stored totals and severities match")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=50, help="distinct answer vectors")
+    args = parser.parse_args()
+
+    for name in _REQUIRED_ENV:
+        os.environ.setdefault(name, "benchmark")
+    os.environ["LOG_S3_BUFFERED"] = "false"
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
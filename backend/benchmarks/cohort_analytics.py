@@ -0,0 +1,199 @@
+# backend/benchmarks/cohort_analytics.py
+"""Benchmark cohort aggregates: rows pulled into Python vs SQL pushdown
+
+Fills ``assessments`` and ``biomarker_records`` (SQLite file) with
+``--rows`` synthetic rows each, spread over a year, then answers three
+population questions both ways:
+
+* severity distribution per week (PHQ-9 counts and shares per level);
+* median PHQ-9 total per week, with a 4-week rolling mean;
+* stress level mean, std and p25/p50/p75/p90 per week.
+
+"python" selects the needed columns of every matching row (as
+``_get_recent_biomarkers`` does for one session) and groups them with
+NumPy; "pushdown" is ``run_cohort_query``, which returns one row per
+bucket. Reports latency and rows transferred, and checks the answers
+agree. SQLite runs the portable plan (window-function percentiles);
+PostgreSQL would use ``date_trunc``/``percentile_cont``.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.cohort_analytics --rows 2000000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+_REQUIRED_ENV = (
+    "VPC_ID", "PUBLIC_SUBNET_1A", "PUBLIC_SUBNET_1B", "PRIVATE_SUBNET_1A",
+    "PRIVATE_SUBNET_1B", "POSTGRES_USER", "POSTGRES_PASSWORD", "IAM_ROLE_ARN",
+    "ACCESS_KEY_ID", "SECRET_ACCESS_KEY", "SECRET_KEY"
+)
+
+START = datetime(2024, 1, 1)
+
+def populate(path: str, rows: int):
+    import sqlalchemy as sa
+
+    from backend.models.assessment_model import Assessment
+    from backend.models.biomarker_model import BiomarkerRecord
+    from backend.utils.scoring import GAD7, PHQ9
+
+    engine = sa.create_engine(f"sqlite:///{path}")
+    metadata = sa.MetaData()
+    sa.Table("treatments", metadata, sa.Column("id", sa.Integer, primary_key=True))
+    for table in (Assessment.__table__, BiomarkerRecord.__table__):
+        table.to_metadata(metadata)
+    metadata.create_all(engine)
+
+    rng = np.random.default_rng(0)
+    batch = 200000
+    with engine.begin() as connection:
+        for offset in range(0, rows, batch):
+            count = min(batch, rows - offset)
+            seconds = np.sort(rng.integers(0, 365 * 86400, count))
+            stamps = [str(START + timedelta(seconds=int(s))) for s in seconds]
+            phq9 = rng.random(count) < 0.6
+            totals = np.where(phq9, rng.binomial(27, 0.3, count), rng.binomial(21, 0.3, count))
+            severity = np.where(
+                phq9,
+                np.asarray(PHQ9.labels, dtype=object)[np.searchsorted(PHQ9.cutpoints, totals)],
+                np.asarray(GAD7.labels, dtype=object)[np.searchsorted(GAD7.cutpoints, totals)]
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO assessments (session_id, timestamp, assessment_type, total_score, severity_level) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (f"session-{i % 5000}", stamp, "PHQ-9" if p else "GAD-7", float(t), s)
+                    for i, stamp, p, t, s in zip(range(offset, offset + count), stamps, phq9, totals, severity)
+                ]
+            )
+            stress = rng.beta(2, 5, count)
+            connection.exec_driver_sql(
+                "INSERT INTO biomarker_records (session_id, timestamp, arousal_level, valence_level, stress_level) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (f"session-{i % 5000}", stamp, 0.5, 0.5, float(value))
+                    for i, stamp, value in zip(range(offset, offset + count), stamps, stress)
+                ]
+            )
+    engine.dispose()
+
+def week_of(stamp: datetime) -> str:
+    return (stamp - timedelta(days=stamp.weekday())).date().isoformat()
+
+async def in_python(db, question: str):
+    """Pull every matching row and aggregate client-side"""
+    from sqlalchemy import select
+
+    from backend.models.assessment_model import Assessment
+    from backend.models.biomarker_model import BiomarkerRecord
+
+    assessments = Assessment.__table__.c
+    if question == "severity":
+        rows = (await db.execute(
+            select(assessments.timestamp, assessments.severity_level)
+            .where(assessments.assessment_type == "PHQ-9")
+        )).all()
+        counts = defaultdict(int)
+        per_week = defaultdict(int)
+        for stamp, severity in rows:
+            week = week_of(stamp)
+            counts[(week, severity)] += 1
+            per_week[week] += 1
+        keys = sorted(counts)
+        return len(rows), {
+            "count": [counts[key] for key in keys],
+            "share": [counts[key] / per_week[key[0]] for key in keys]
+        }
+
+    if question == "median":
+        table, column = assessments, assessments.total_score
+        query = select(table.timestamp, column).where(table.assessment_type == "PHQ-9")
+    else:
+        table = BiomarkerRecord.__table__.c
+        query = select(table.timestamp, table.stress_level)
+    rows = (await db.execute(query)).all()
+    groups = defaultdict(list)
+    for stamp, value in rows:
+        groups[week_of(stamp)].append(value)
+    weeks = sorted(groups)
+    values = [np.asarray(groups[week]) for week in weeks]
+    if question == "median":
+        sums = np.array([v.sum() for v in values])
+        counts = np.array([len(v) for v in values])
+        rolling = [
+            sums[max(0, i - 3):i + 1].sum() / counts[max(0, i - 3):i + 1].sum()
+            for i in range(len(weeks))
+        ]
+        return len(rows), {"p50": [float(np.median(v)) for v in values], "rolling_mean": rolling}
+    result = {"mean": [float(v.mean()) for v in values], "std": [float(v.std(ddof=1)) for v in values]}
+    for p in (25, 50, 75, 90):
+        result[f"p{p}"] = [float(np.percentile(v, p)) for v in values]
+    return len(rows), result
+
+QUERIES = {
+    "severity": dict(
+        source="assessments", metric="total_score", aggregates=("count", "share"),
+        group_by=("severity_level",), filters={"assessment_type": "PHQ-9"}
+    ),
+    "median": dict(
+        source="assessments", metric="total_score", aggregates=("p50",),
+        filters={"assessment_type": "PHQ-9"}, rolling=4
+    ),
+    "stress": dict(
+        source="biomarkers", metric="stress_level",
+        aggregates=("mean", "std", "p25", "p50", "p75", "p90")
+    )
+}
+
+async def run(args, path: str):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.services.cohort_analytics import CohortQuery, run_cohort_query
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(engine)
+    print(f"{'question':<10} {'python ms':>10} {'rows':>10} {'pushdown ms':>12} {'rows':>6} {'speedup':>8}")
+    for question, spec in QUERIES.items():
+        async with sessions() as db:
+            start = time.perf_counter()
+            transferred, expected = await in_python(db, question)
+            python_ms = (time.perf_counter() - start) * 1e3
+        async with sessions() as db:
+            start = time.perf_counter()
+            result = await run_cohort_query(db, CohortQuery(**spec))
+            pushdown_ms = (time.perf_counter() - start) * 1e3
+        for name, values in expected.items():
+            np.testing.assert_allclose(result["columns"][name], values, rtol=1e-9, err_msg=f"{question} {name}")
+        print(f"{question:<10} {python_ms:>10.0f} {transferred:>10} {pushdown_ms:>12.0f} "
+              f"{result['row_count']:>6} {python_ms / pushdown_ms:>7.1f}x")
+    await engine.dispose()
+    print("pushdown results match the client-side aggregates")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000000, help="rows per table")
+    args = parser.parse_args()
+
+    for name in _REQUIRED_ENV:
+        os.environ.setdefault(name, "benchmark")
+    os.environ["LOG_S3_BUFFERED"] = "false"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = f"{workdir}/cohort.db"
+        start = time.perf_counter()
+        populate(path, args.rows)
+        print(f"{args.rows} assessments and {args.rows} biomarker records "
+              f"generated in {time.perf_counter() - start:.0f} s")
+        asyncio.run(run(args, path))
+
+if __name__ == "__main__":
+    main()
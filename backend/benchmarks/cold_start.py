@@ -0,0 +1,152 @@
+# backend/benchmarks/cold_start.py
+"""Measure API worker cold start with lazily built services
+
+Each phase runs in a fresh interpreter with outbound connections blocked
+(the RDS lookup and eager client construction used to happen at import):
+
+1. import the endpoint modules only;
+2. import, then build every service on first use one after another;
+3. import, then build them through the concurrent warm-up.
+
+Services use local stand-ins: SQLite for RDS, the real CPU ``NvidiaService``
+and preprocessor, and sleep-based stand-ins for the RAG knowledge base and
+AWS clients.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.cold_start --init-ms 300 --target-ms 5000
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+_REQUIRED_ENV = (
+    "VPC_ID", "PUBLIC_SUBNET_1A", "PUBLIC_SUBNET_1B", "PRIVATE_SUBNET_1A",
+    "PRIVATE_SUBNET_1B", "POSTGRES_USER", "POSTGRES_PASSWORD", "IAM_ROLE_ARN",
+    "ACCESS_KEY_ID", "SECRET_ACCESS_KEY", "SECRET_KEY"
+)
+
+ENDPOINT_MODULES = (
+    "backend.api.endpoints.assessment",
+    "backend.api.endpoints.biomarker"
+)
+
+def _block_network(attempts):
+    def blocked(self, address):
+        attempts.append(str(address))
+        raise OSError("network disabled by benchmark")
+    socket.socket.connect = blocked
+
+def run_child(mode: str, init_seconds: float):
+    """Cold start inside this (fresh) interpreter; prints a JSON result"""
+    attempts = []
+    _block_network(attempts)
+
+    start = time.perf_counter()
+    for name in ENDPOINT_MODULES:
+        importlib.import_module(name)
+    import_seconds = time.perf_counter() - start
+
+    from backend.core.registry import registry
+    # Keep benchmark logs local
+    logging.getLogger("layla-app").handlers = []
+    install_stand_ins(registry, init_seconds)
+
+    start = time.perf_counter()
+    if mode == "sequential":
+        for row in registry.report():
+            registry.get(row["name"])
+    elif mode == "warm-up":
+        asyncio.run(registry.warm_up())
+    build_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "import_seconds": import_seconds,
+        "build_seconds": build_seconds,
+        "connects": attempts,
+        "report": registry.report()
+    }))
+
+def measure(mode: str, init_seconds: float) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.cold_start",
+         "--child", mode, "--init-ms", str(init_seconds * 1000)],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Cold start ({mode}) failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def install_stand_ins(registry, init_seconds: float):
+    """Replace services that need AWS or LLM APIs with local stand-ins"""
+    def stand_in(name):
+        def factory():
+            time.sleep(init_seconds)
+            return SimpleNamespace(name=name)
+        return factory
+
+    registry.register("rag_system", stand_in("rag_system"))
+    registry.register("aws_service", stand_in("aws_service"))
+
+def print_result(title: str, result: dict):
+    total = result["import_seconds"] + result["build_seconds"]
+    print(f"\n{title}: {total * 1e3:.0f} ms "
+          f"(import {result['import_seconds'] * 1e3:.0f} ms, "
+          f"services {result['build_seconds'] * 1e3:.0f} ms, "
+          f"{len(result['connects'])} outbound connection attempts)")
+    for row in result["report"]:
+        status = row.get("error") or row["phase"]
+        print(f"  {row['name']:<24} {row['seconds'] * 1e3:>8.1f} ms  {status}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--init-ms", type=float, default=300.0,
+                        help="simulated init time of each network-bound stand-in")
+    parser.add_argument("--target-ms", type=float, default=5000.0,
+                        help="cold-start budget: import plus warm-up")
+    parser.add_argument("--child", choices=["import", "sequential", "warm-up"],
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="cold-start-")
+    for name in _REQUIRED_ENV:
+        os.environ.setdefault(name, "benchmark")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/app.db"
+    os.environ["JOB_QUEUE_PATH"] = f"{workdir}/jobs.sqlite3"
+    os.environ["LOG_S3_BUFFERED"] = "false"
+
+    if args.child:
+        run_child(args.child, args.init_ms / 1000)
+        return
+
+    results = {}
+    for mode, title in (
+        ("import", "import only (services deferred)"),
+        ("sequential", "import + first use, one after another"),
+        ("warm-up", "import + concurrent warm-up")
+    ):
+        results[mode] = measure(mode, args.init_ms / 1000)
+        print_result(title, results[mode])
+
+    cold = results["warm-up"]
+    total_ms = (cold["import_seconds"] + cold["build_seconds"]) * 1e3
+    verdict = "within" if total_ms <= args.target_ms else "OVER"
+    print(f"\ncold start with warm-up: {total_ms:.0f} ms, "
+          f"{verdict} the {args.target_ms:.0f} ms target")
+    if total_ms > args.target_ms or any(r["connects"] for r in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
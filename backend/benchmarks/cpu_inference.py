@@ -0,0 +1,111 @@
+# backend/benchmarks/cpu_inference.py
+"""Benchmark the CPU inference backend against eager PyTorch
+
+Stand-in facial (conv trunk + MLP head) and vocal (strided conv front end
++ GRU + projection) models are compiled by ``CPUInferenceBackend`` for
+each runtime, with and without dynamic int8 quantization, and compared to
+eager float32 on single-item latency, batched throughput and relative
+output drift on fresh inputs. ONNX rows need ``onnxruntime``.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.cpu_inference --threads 4 --batch 32
+"""
+
+import argparse
+import importlib.util
+import statistics
+import time
+
+import torch
+import torch.nn as nn
+
+from backend.services.cpu_inference import CPUInferenceBackend, measure_drift
+
+def make_facial_model() -> nn.Module:
+    return nn.Sequential(
+        nn.Conv2d(3, 32, kernel_size=3, stride=2, padding=1),
+        nn.ReLU(),
+        nn.Conv2d(32, 64, kernel_size=3, stride=2, padding=1),
+        nn.ReLU(),
+        nn.Conv2d(64, 128, kernel_size=3, stride=2, padding=1),
+        nn.ReLU(),
+        nn.AdaptiveAvgPool2d(4),
+        nn.Flatten(),
+        nn.Linear(128 * 16, 1024),
+        nn.ReLU(),
+        nn.Linear(1024, 512)
+    ).eval()
+
+class VocalModel(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.frontend = nn.Sequential(
+            nn.Conv1d(1, 64, kernel_size=400, stride=160),
+            nn.ReLU()
+        )
+        self.gru = nn.GRU(64, 256, batch_first=True)
+        self.head = nn.Linear(256, 256)
+
+    def forward(self, audio: torch.Tensor) -> torch.Tensor:
+        frames = self.frontend(audio).transpose(1, 2)
+        states, _ = self.gru(frames)
+        return self.head(states.mean(dim=1))
+
+def timed(fn, tensor: torch.Tensor, repeat: int) -> float:
+    fn(tensor)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(tensor)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads, 0 = all cores")
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--audio-seconds", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    runtimes = ["torchscript"]
+    if importlib.util.find_spec("onnxruntime"):
+        runtimes.append("onnx")
+    samples = int(args.audio_seconds * 16000)
+    models = {
+        "facial": (make_facial_model(), lambda n: torch.rand(n, 3, 224, 224)),
+        "vocal": (VocalModel().eval(), lambda n: torch.randn(n, 1, samples) * 0.1)
+    }
+
+    for name, (model, make_input) in models.items():
+        examples = [make_input(1), make_input(4)]
+        checks = [make_input(args.batch)]
+        single, batch = make_input(1), make_input(args.batch)
+
+        print(f"\n{name}: batch 1 latency, batch {args.batch} throughput")
+        print(f"{'runtime':<20} {'ms (1)':>8} {'items/s':>9} {'speedup':>8} {'drift':>9}")
+        with torch.inference_mode():
+            eager_ms = timed(model, single, args.repeat)
+            eager_rate = args.batch / timed(model, batch, max(args.repeat // 4, 3))
+        print(f"{'eager fp32':<20} {eager_ms * 1e3:>8.2f} {eager_rate:>9.1f} {1.0:>7.2f}x {0.0:>9.2e}")
+
+        for runtime in runtimes:
+            for quantize in (False, True):
+                backend = CPUInferenceBackend(
+                    runtime=runtime,
+                    quantize=quantize,
+                    intra_op_threads=args.threads,
+                    max_drift=float("inf")
+                )
+                compiled = backend.compile(model, examples, name)
+                ms = timed(compiled, single, args.repeat)
+                rate = args.batch / timed(compiled, batch, max(args.repeat // 4, 3))
+                drift = measure_drift(compiled, model, checks)
+                label = f"{compiled.runtime} {'int8' if compiled.quantized else 'fp32'}"
+                print(f"{label:<20} {ms * 1e3:>8.2f} {rate:>9.1f} "
+                      f"{rate / eager_rate:>7.2f}x {drift:>9.2e}")
+
+if __name__ == "__main__":
+    main()
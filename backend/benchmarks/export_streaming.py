@@ -0,0 +1,163 @@
+# backend/benchmarks/export_streaming.py
+"""Benchmark exporting biomarker records: one in-memory list vs streaming
+
+Fills ``biomarker_records`` (SQLite file) with ``--rows`` records, each
+with two ``--dim``-float facial/vocal feature vectors and a small emotion
+mapping, then exports them in a fresh process per path and reports the
+process's peak RSS:
+
+* list: ``execute(...).all()``, a dict per row and one ``json.dumps`` of
+  the list, as the history/metrics endpoints build their responses. Its
+  memory grows with the rows, so it runs on the first ``--list-rows``
+  only and the growth is extrapolated to ``--rows``;
+* ndjson / ndjson+gzip / arrow: ``stream_export`` over a server-side
+  cursor, ``--batch-size`` rows per chunk (arrow only with pyarrow), on
+  ``--list-rows`` and on all ``--rows`` to show the peak does not move.
+
+Output is counted and discarded, so RSS reflects the export alone.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.export_streaming --rows 1000000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+_REQUIRED_ENV = (
+    "VPC_ID", "PUBLIC_SUBNET_1A", "PUBLIC_SUBNET_1B", "PRIVATE_SUBNET_1A",
+    "PRIVATE_SUBNET_1B", "POSTGRES_USER", "POSTGRES_PASSWORD", "IAM_ROLE_ARN",
+    "ACCESS_KEY_ID", "SECRET_ACCESS_KEY", "SECRET_KEY"
+)
+
+def populate(path: str, rows: int, dim: int):
+    import json
+
+    import sqlalchemy as sa
+
+    from backend.models.biomarker_model import BiomarkerRecord
+    from backend.models.types import encode_array
+
+    engine = sa.create_engine(f"sqlite:///{path}")
+    metadata = sa.MetaData()
+    BiomarkerRecord.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+
+    rng = np.random.default_rng(0)
+    start = datetime(2024, 1, 1)
+    batch = 50000
+    with engine.begin() as connection:
+        for offset in range(0, rows, batch):
+            count = min(batch, rows - offset)
+            facial = rng.random((count, dim), dtype=np.float32)
+            vocal = rng.random((count, dim), dtype=np.float32)
+            levels = rng.random((count, 3))
+            connection.exec_driver_sql(
+                "INSERT INTO biomarker_records (session_id, timestamp, facial_features, facial_emotions, "
+                "vocal_features, arousal_level, valence_level, stress_level) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        f"session-{i % 1000}",
+                        str(start + timedelta(seconds=i)),
+                        encode_array(facial[j]),
+                        json.dumps({"happy": float(levels[j, 0]), "sad": float(levels[j, 1])}),
+                        encode_array(vocal[j]),
+                        *map(float, levels[j])
+                    )
+                    for j, i in enumerate(range(offset, offset + count))
+                ]
+            )
+    engine.dispose()
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def export(path: str, mode: str, rows: int, batch_size: int) -> int:
+    import json
+
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from backend.services.exports import _json_value, export_query, stream_export
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    query = export_query("biomarkers").limit(rows)
+    written = 0
+    async with AsyncSession(engine) as db:
+        if mode == "list":
+            rows = (await db.execute(query)).all()
+            names = list(query.selected_columns.keys())
+            records = [
+                {name: _json_value(value) for name, value in zip(names, row)}
+                for row in rows
+            ]
+            written = len(json.dumps(records).encode("utf-8"))
+        else:
+            format, _, compress = mode.partition("+")
+            async for chunk in stream_export(db, query, format, bool(compress), batch_size):
+                written += len(chunk)
+    await engine.dispose()
+    return written
+
+def measure(path: str, mode: str, rows: int, batch_size: int, results):
+    import backend.services.exports  # noqa: F401  (imports count towards the baseline)
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    written = asyncio.run(export(path, mode, rows, batch_size))
+    results.put((time.perf_counter() - start, written, baseline, peak_rss_mb()))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--dim", type=int, default=32, help="floats per feature vector")
+    parser.add_argument("--list-rows", type=int, default=100000,
+                        help="rows for the in-memory baseline")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name in _REQUIRED_ENV:
+        os.environ.setdefault(name, "benchmark")
+    os.environ["LOG_S3_BUFFERED"] = "false"
+
+    from backend.services.exports import arrow_available
+
+    streaming = ["ndjson", "ndjson+gzip"] + (["arrow"] if arrow_available() else [])
+    list_rows = min(args.list_rows, args.rows)
+    runs = [("list", list_rows), ("ndjson", list_rows)] + [(mode, args.rows) for mode in streaming]
+
+    # Fresh interpreters, so each peak RSS covers one export only
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as workdir:
+        path = f"{workdir}/export.db"
+        start = time.perf_counter()
+        populate(path, args.rows, args.dim)
+        print(f"{args.rows} biomarker records ({os.path.getsize(path) / 2**20:.0f} MiB SQLite) "
+              f"generated in {time.perf_counter() - start:.0f} s")
+        print(f"{'path':<12} {'rows':>8} {'seconds':>8} {'rows/s':>10} {'output MiB':>11} "
+              f"{'baseline MiB':>13} {'peak RSS MiB':>13}")
+        for mode, rows in runs:
+            results = context.Queue()
+            process = context.Process(target=measure, args=(path, mode, rows, args.batch_size, results))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                print(f"{mode:<12} {rows:>8} exited with {process.exitcode}")
+                continue
+            seconds, written, baseline, peak = results.get()
+            print(f"{mode:<12} {rows:>8} {seconds:>8.1f} {rows / seconds:>10,.0f} {written / 2**20:>11.0f} "
+                  f"{baseline:>13.0f} {peak:>13.0f}")
+            if mode == "list" and rows < args.rows:
+                growth = (peak - baseline) / rows * args.rows
+                print(f"{'':<12} list growth extrapolated to {args.rows} rows: {growth / 1024:.1f} GiB")
+
+if __name__ == "__main__":
+    main()
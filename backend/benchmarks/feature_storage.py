@@ -0,0 +1,135 @@
+# backend/benchmarks/feature_storage.py
+"""Benchmark feature vector storage: JSON lists vs compact float32 blobs
+
+Writes the same synthetic biomarker records into a table with the previous
+JSON feature columns and into ``biomarker_records`` with ``FeatureVector``
+columns (SQLite files), then compares stored bytes, write time and the time
+to read every vector back into one NumPy matrix. Finally backfills a copy of
+the JSON rows into blobs and checks the round trip.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.feature_storage --records 20000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import sqlalchemy as sa
+
+from backend.models.biomarker_model import BiomarkerRecord
+from backend.utils.feature_backfill import backfill_feature_vectors
+
+def make_features(count: int, facial_dim: int, vocal_dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    facial = rng.standard_normal((count, 1, facial_dim)).astype(np.float32)
+    vocal = rng.standard_normal((count, 1, vocal_dim)).astype(np.float32)
+    return facial, vocal
+
+def legacy_table(metadata: sa.MetaData) -> sa.Table:
+    return sa.Table(
+        "biomarker_records", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("session_id", sa.String),
+        sa.Column("timestamp", sa.DateTime),
+        sa.Column("facial_features", sa.JSON),
+        sa.Column("vocal_features", sa.JSON)
+    )
+
+def write(engine: sa.Engine, table: sa.Table, facial, vocal, to_value) -> float:
+    rows = [
+        {
+            "session_id": "bench",
+            "timestamp": datetime(2024, 1, 1),
+            "facial_features": to_value(f),
+            "vocal_features": to_value(v)
+        }
+        for f, v in zip(facial, vocal)
+    ]
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        connection.execute(sa.insert(table), rows)
+    return time.perf_counter() - start
+
+def stored_bytes(engine: sa.Engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(sa.text(
+            "SELECT SUM(LENGTH(facial_features) + LENGTH(vocal_features)) "
+            "FROM biomarker_records"
+        )).scalar()
+
+def read_matrix(engine: sa.Engine, table: sa.Table, to_array):
+    start = time.perf_counter()
+    with engine.connect() as connection:
+        rows = connection.execute(
+            sa.select(table.c.facial_features, table.c.vocal_features)
+        ).all()
+    facial = np.stack([to_array(row[0]) for row in rows])
+    vocal = np.stack([to_array(row[1]) for row in rows])
+    return time.perf_counter() - start, facial, vocal
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--facial-dim", type=int, default=512)
+    parser.add_argument("--vocal-dim", type=int, default=256)
+    args = parser.parse_args()
+
+    facial, vocal = make_features(args.records, args.facial_dim, args.vocal_dim)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        legacy_engine = sa.create_engine(f"sqlite:///{workdir}/legacy.db")
+        legacy = legacy_table(sa.MetaData())
+        legacy.metadata.create_all(legacy_engine)
+
+        blob_engine = sa.create_engine(f"sqlite:///{workdir}/blob.db")
+        table = BiomarkerRecord.__table__
+        table.metadata.create_all(blob_engine)
+
+        results = {}
+        write_s = write(legacy_engine, legacy, facial, vocal, lambda a: a.tolist())
+        read_s, legacy_facial, _ = read_matrix(legacy_engine, legacy, np.asarray)
+        results["JSON lists (before)"] = (stored_bytes(legacy_engine), write_s, read_s)
+
+        write_s = write(blob_engine, table, facial, vocal, lambda a: a)
+        read_s, blob_facial, _ = read_matrix(blob_engine, table, lambda a: a)
+        results["float32 blobs"] = (stored_bytes(blob_engine), write_s, read_s)
+
+        assert np.allclose(legacy_facial, facial) and np.array_equal(blob_facial, facial)
+
+        print(f"{args.records} records, facial {args.facial_dim}-d + vocal {args.vocal_dim}-d")
+        print(f"{'storage':<22} {'MB stored':>10} {'write (s)':>10} {'read (s)':>9} {'rows/s read':>12}")
+        for name, (size, write_s, read_s) in results.items():
+            print(f"{name:<22} {size / 1e6:>10.1f} {write_s:>10.2f} {read_s:>9.3f} "
+                  f"{args.records / read_s:>12,.0f}")
+
+        # Migration: legacy JSON text in place, as left by migration 006
+        migrate_engine = sa.create_engine(f"sqlite:///{workdir}/migrate.db")
+        table.metadata.create_all(migrate_engine)
+        raw = sa.table("biomarker_records", sa.column("session_id"),
+                       sa.column("facial_features"), sa.column("vocal_features"))
+        with migrate_engine.begin() as connection:
+            connection.execute(sa.insert(raw), [
+                {"session_id": "bench",
+                 "facial_features": json.dumps(f.tolist()).encode(),
+                 "vocal_features": json.dumps(v.tolist()).encode()}
+                for f, v in zip(facial, vocal)
+            ])
+
+        start = time.perf_counter()
+        counts = backfill_feature_vectors(migrate_engine, batch_size=1000)
+        elapsed = time.perf_counter() - start
+        _, migrated_facial, migrated_vocal = read_matrix(migrate_engine, table, lambda a: a)
+        assert np.array_equal(migrated_facial, facial) and np.array_equal(migrated_vocal, vocal)
+        assert backfill_feature_vectors(migrate_engine)["facial_features"] == 0
+        print(f"backfill: {counts['facial_features']} rows in {elapsed:.2f}s "
+              f"({counts['facial_features'] / elapsed:,.0f} rows/s), "
+              f"file {os.path.getsize(f'{workdir}/migrate.db') / 1e6:.1f} MB before VACUUM")
+
+if __name__ == "__main__":
+    main()
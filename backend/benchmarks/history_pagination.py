@@ -0,0 +1,195 @@
+# backend/benchmarks/history_pagination.py
+"""Benchmark session history reads: full scans vs keyset pages
+
+Fills ``biomarker_records`` (SQLite file) with synthetic rows spread over
+many sessions plus one hot session, interleaved in time so a session's rows
+are scattered through the table. Then compares, with query plans:
+
+* before: the session_id index only, every row of the session hydrated as
+  a full ORM object (the previous ``/metrics`` read), and OFFSET paging;
+* after: the composite (session_id, timestamp) index, a projection of the
+  metric columns and keyset pages of ``--page-size`` rows, first and deep.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.history_pagination --rows 1000000
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from backend.models.biomarker_model import BiomarkerRecord
+from backend.models.types import encode_array
+from backend.utils.pagination import keyset_page, split_page
+
+COMPOSITE_INDEX = "idx_biomarker_records_session_timestamp"
+HOT_SESSION = "session-hot"
+
+def populate(engine: sa.Engine, rows: int, sessions: int, hot_rows: int, feature_dim: int):
+    rng = np.random.default_rng(0)
+    start = datetime(2024, 1, 1)
+    columns = sa.table(
+        "biomarker_records",
+        *(sa.column(name) for name in (
+            "session_id", "timestamp", "facial_features", "facial_emotions",
+            "vocal_prosody", "arousal_level", "valence_level", "stress_level"
+        ))
+    )
+    hot_every = max(rows // max(hot_rows, 1), 1)
+    emotions = json.dumps({"happy": 0.2, "sad": 0.1, "neutral": 0.6, "angry": 0.1})
+    prosody = json.dumps({"pitch": 180.0, "energy": 0.4, "rate": 3.2})
+    feature = encode_array(rng.standard_normal((1, feature_dim)).astype(np.float32))
+
+    batch = 50000
+    with engine.begin() as connection:
+        for offset in range(0, rows, batch):
+            count = min(batch, rows - offset)
+            index = np.arange(offset, offset + count)
+            metrics = rng.random((count, 3))
+            session_ids = rng.integers(0, sessions, count)
+            connection.execute(sa.insert(columns), [
+                {
+                    "session_id": HOT_SESSION if i % hot_every == 0 else f"session-{s}",
+                    "timestamp": start + timedelta(seconds=int(i)),
+                    "facial_features": feature,
+                    "facial_emotions": emotions,
+                    "vocal_prosody": prosody,
+                    "arousal_level": float(m[0]),
+                    "valence_level": float(m[1]),
+                    "stress_level": float(m[2])
+                }
+                for i, s, m in zip(index, session_ids, metrics)
+            ])
+
+def plan(connection, statement) -> str:
+    compiled = statement.compile(connection, compile_kwargs={"literal_binds": True})
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    return "; ".join(row[-1] for row in rows)
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+def metric_page(page_size: int, after=None):
+    query = sa.select(
+        BiomarkerRecord.id,
+        BiomarkerRecord.timestamp,
+        BiomarkerRecord.arousal_level,
+        BiomarkerRecord.valence_level,
+        BiomarkerRecord.stress_level
+    ).where(BiomarkerRecord.session_id == HOT_SESSION)
+    return keyset_page(query, BiomarkerRecord.timestamp, BiomarkerRecord.id, after, page_size)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--hot-rows", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--feature-dim", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = sa.create_engine(f"sqlite:///{workdir}/history.db")
+        BiomarkerRecord.__table__.metadata.create_all(engine, tables=[BiomarkerRecord.__table__])
+
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f"DROP INDEX {COMPOSITE_INDEX}")
+        populate(engine, args.rows, args.sessions, args.hot_rows, args.feature_dim)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+            hot = connection.execute(
+                sa.select(sa.func.count()).where(BiomarkerRecord.session_id == HOT_SESSION)
+            ).scalar()
+        print(f"{args.rows:,} rows, hot session {hot:,} rows, "
+              f"populated in {time.perf_counter() - start:.1f}s")
+
+        deep = hot // 2
+        full_scan = (
+            sa.select(BiomarkerRecord)
+            .where(BiomarkerRecord.session_id == HOT_SESSION)
+            .order_by(BiomarkerRecord.timestamp)
+        )
+        offset_page = (
+            metric_page(args.page_size).limit(args.page_size).offset(deep)
+        )
+
+        def run_full():
+            with Session(engine) as session:
+                records = session.execute(full_scan).scalars().all()
+                [r.to_dict() for r in records]
+
+        def run_query(statement):
+            def run():
+                with engine.connect() as connection:
+                    connection.execute(statement).all()
+            return run
+
+        def cursor_at(position):
+            with engine.connect() as connection:
+                rows = connection.execute(
+                    metric_page(position).with_only_columns(
+                        BiomarkerRecord.id, BiomarkerRecord.timestamp
+                    )
+                ).all()
+            return rows[position - 1].timestamp, rows[position - 1].id
+
+        results = []
+        with engine.connect() as connection:
+            results.append(("before: full session, ORM", plan(connection, full_scan), timed(run_full, 1)))
+            results.append(("before: OFFSET deep page", plan(connection, offset_page),
+                            timed(run_query(offset_page), args.repeat)))
+
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                f"CREATE INDEX {COMPOSITE_INDEX} ON biomarker_records (session_id, timestamp)"
+            )
+            connection.exec_driver_sql("ANALYZE")
+
+        first_page = metric_page(args.page_size)
+        deep_page = metric_page(args.page_size, cursor_at(deep))
+        with engine.connect() as connection:
+            results.append(("after: OFFSET deep page", plan(connection, offset_page),
+                            timed(run_query(offset_page), args.repeat)))
+            results.append(("after: keyset first page", plan(connection, first_page),
+                            timed(run_query(first_page), args.repeat)))
+            results.append(("after: keyset deep page", plan(connection, deep_page),
+                            timed(run_query(deep_page), args.repeat)))
+
+            # Walking every page must return each row once, in order
+            seen, after, last = 0, None, None
+            while True:
+                rows, cursor = split_page(
+                    connection.execute(metric_page(1000, after)).all(), 1000
+                )
+                for row in rows:
+                    key = (row.timestamp, row.id)
+                    assert last is None or key > last
+                    last = key
+                seen += len(rows)
+                if cursor is None:
+                    break
+                after = last
+            assert seen == hot
+
+        print(f"{'query':<28} {'median ms':>10}  plan")
+        for name, query_plan, ms in results:
+            print(f"{name:<28} {ms:>10.2f}  {query_plan}")
+        print(f"keyset walk over {seen:,} rows in pages of 1000: ordered, no gaps or repeats")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# backend/benchmarks/inference_batching.py
+"""Benchmark micro-batched CPU inference: throughput vs p99 latency
+
+Run from the repository root:
+
+    python -m backend.benchmarks.inference_batching --clients 32 --requests 2000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from backend.services.batching import MicroBatcher
+
+def make_model() -> nn.Module:
+    """Small convolutional feature extractor standing in for the facial model"""
+    return nn.Sequential(
+        nn.Conv2d(3, 16, kernel_size=3, stride=2, padding=1),
+        nn.ReLU(),
+        nn.Conv2d(16, 32, kernel_size=3, stride=2, padding=1),
+        nn.ReLU(),
+        nn.Conv2d(32, 64, kernel_size=3, stride=2, padding=1),
+        nn.ReLU(),
+        nn.AdaptiveAvgPool2d(1),
+        nn.Flatten(),
+        nn.Linear(64, 128)
+    ).eval()
+
+async def _run_clients(
+    batcher: MicroBatcher,
+    clients: int,
+    requests: int,
+    image_size: int
+) -> Tuple[float, List[float]]:
+    latencies: List[float] = []
+    remaining = [requests]
+    sample = torch.rand(1, 3, image_size, image_size)
+
+    async def client():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            await batcher.submit(sample)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    await batcher.close()
+    return elapsed, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--image-size", type=int, default=112)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    parser.add_argument(
+        "--configs",
+        nargs="+",
+        default=["1:0", "8:2", "16:5", "32:5", "32:10"],
+        help="max_batch_size:max_latency_ms pairs"
+    )
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    model = make_model()
+
+    print(
+        f"{'batch':>6} {'budget ms':>10} {'req/s':>8} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'mean batch':>11}"
+    )
+    for config in args.configs:
+        max_batch, budget = config.split(":")
+        batcher = MicroBatcher(
+            model,
+            max_batch_size=int(max_batch),
+            max_latency_ms=float(budget)
+        )
+        elapsed, latencies = asyncio.run(
+            _run_clients(batcher, args.clients, args.requests, args.image_size)
+        )
+        latencies_ms = np.array(latencies) * 1e3
+        print(
+            f"{max_batch:>6} {budget:>10} {len(latencies) / elapsed:>8.1f} "
+            f"{np.percentile(latencies_ms, 50):>8.1f} "
+            f"{np.percentile(latencies_ms, 99):>8.1f} "
+            f"{batcher.stats['rows'] / max(batcher.stats['batches'], 1):>11.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# backend/benchmarks/model_cache.py
+"""Benchmark the model cache: cold vs warm start, shared vs private weights
+
+Publishes a synthetic state dict to a filesystem stand-in for the models
+bucket, then starts ``--workers`` processes that each load it and touch
+every weight:
+
+* ``torch.load`` of the artifact into private memory (what each worker
+  did when fetching weights on its own);
+* ``ModelRegistry.load``: memory-mapped from the content-addressed cache,
+  so the workers share the page cache pages.
+
+Reports per-worker load time and private vs shared resident memory (from
+``/proc/self/smaps_rollup``), and the cold (download + checksum) and warm
+(manifest and artifact already cached) resolve times.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.model_cache --megabytes 256 --workers 4
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import torch
+
+from backend.services.model_registry import ModelRegistry
+
+BUCKET = "layla-app-models"
+
+_REQUIRED_ENV = (
+    "VPC_ID", "PUBLIC_SUBNET_1A", "PUBLIC_SUBNET_1B", "PRIVATE_SUBNET_1A",
+    "PRIVATE_SUBNET_1B", "POSTGRES_USER", "POSTGRES_PASSWORD", "IAM_ROLE_ARN",
+    "ACCESS_KEY_ID", "SECRET_ACCESS_KEY", "SECRET_KEY"
+)
+
+def memory_mb() -> dict:
+    values = {}
+    with open("/proc/self/smaps_rollup") as rollup:
+        for line in rollup:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "private": values["Private_Clean"] + values["Private_Dirty"],
+        "shared": values["Shared_Clean"] + values["Shared_Dirty"]
+    }
+
+def run_worker(mode: str, root: str, artifact: str):
+    from backend.services.aws_service import LocalS3Client
+
+    torch.set_num_threads(1)
+    before = memory_mb()
+    start = time.perf_counter()
+    if mode == "registry":
+        registry = ModelRegistry(LocalS3Client(f"{root}/store"), BUCKET, f"{root}/cache")
+        state = registry.load("facial", "1")
+    else:
+        state = torch.load(artifact, map_location="cpu", weights_only=True)
+    checksum = sum(float(tensor.sum()) for tensor in state.values())
+    seconds = time.perf_counter() - start
+    after = memory_mb()
+    print(json.dumps({
+        "seconds": seconds,
+        "private_mb": after["private"] - before["private"],
+        "shared_mb": after["shared"] - before["shared"],
+        "checksum": checksum
+    }))
+
+def spawn_workers(mode: str, root: str, artifact: str, workers: int) -> list:
+    command = [sys.executable, "-m", "backend.benchmarks.model_cache",
+               "--child", mode, "--root", root, "--artifact", artifact]
+    processes = [
+        subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    results = []
+    for process in processes:
+        output, _ = process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"{mode} worker failed")
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--child", choices=["torch_load", "registry"], help=argparse.SUPPRESS)
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    parser.add_argument("--artifact", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # aws_service reads settings; workers inherit these
+    for name in _REQUIRED_ENV:
+        os.environ.setdefault(name, "benchmark")
+    os.environ["LOG_S3_BUFFERED"] = "false"
+
+    from backend.services.aws_service import LocalS3Client
+
+    if args.child:
+        run_worker(args.child, args.root, args.artifact)
+        return
+
+    with tempfile.TemporaryDirectory() as root:
+        layers = max(args.megabytes // 16, 1)
+        state = {f"layer{i}.weight": torch.randn(2048, 2048) for i in range(layers)}
+        artifact = os.path.join(root, "facial.pt")
+        torch.save(state, artifact)
+        del state
+
+        store = LocalS3Client(f"{root}/store")
+        ModelRegistry(store, BUCKET, f"{root}/publisher").publish("facial", "1", artifact)
+        registry = ModelRegistry(store, BUCKET, f"{root}/cache")
+
+        start = time.perf_counter()
+        registry.resolve("facial", "1")
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        registry.resolve("facial", "1")
+        warm = time.perf_counter() - start
+        size_mb = os.path.getsize(artifact) / 2 ** 20
+        print(f"artifact {size_mb:.0f} MB: cold resolve (copy + sha256) {cold * 1e3:.0f} ms, "
+              f"warm resolve {warm * 1e3:.2f} ms")
+
+        print(f"\n{args.workers} workers loading and reading every weight")
+        print(f"{'mode':<12} {'load ms':>9} {'private MB':>11} {'shared MB':>10}")
+        checksums = set()
+        for mode in ("torch_load", "registry"):
+            results = spawn_workers(mode, root, artifact, args.workers)
+            checksums.update(round(result["checksum"], 3) for result in results)
+            mean = lambda field: sum(result[field] for result in results) / len(results)
+            print(f"{mode:<12} {mean('seconds') * 1e3:>9.0f} "
+                  f"{mean('private_mb'):>11.0f} {mean('shared_mb'):>10.0f}")
+        assert len(checksums) == 1, "workers loaded different weights"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# backend/benchmarks/preprocess_batch.py
+"""Benchmark batched biomarker preprocessing against per-item calls
+
+Facial: N raw frames through ``preprocess_facial`` one at a time plus
+``torch.cat`` (the previous stream-window path) vs ``preprocess_facial_batch``
+with 1..``--workers`` threads, NCHW and channels_last. Vocal: variable
+length clips through ``preprocess_vocal`` vs ``preprocess_vocal_batch``.
+Outputs are checked for equality.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.preprocess_batch --frames 256 --workers 4
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+import torch
+
+from backend.utils.preprocessing import BiomarkerPreprocessor
+
+def timed(fn, repeat: int):
+    result, samples = None, []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=256)
+    parser.add_argument("--frame", default="480x640x3", help="HxWxC of each raw frame")
+    parser.add_argument("--clips", type=int, default=64)
+    parser.add_argument("--max-clip-seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(0)
+    shape = tuple(int(n) for n in args.frame.split("x"))
+    frames = rng.integers(0, 256, (args.frames, *shape), dtype=np.uint8)
+    clips = [
+        (rng.standard_normal(int(rng.uniform(0.5, args.max_clip_seconds) * 16000)) * 0.1)
+        .astype(np.float32)
+        for _ in range(args.clips)
+    ]
+
+    print(f"facial: {args.frames} frames of {args.frame} -> 224x224")
+    print(f"{'path':<32} {'ms':>9} {'frames/s':>10}")
+
+    single = BiomarkerPreprocessor(num_workers=1)
+    seconds, expected = timed(
+        lambda: torch.cat([single.preprocess_facial(frame) for frame in frames]),
+        args.repeat
+    )
+    print(f"{'per-frame + torch.cat':<32} {seconds * 1e3:>9.1f} {args.frames / seconds:>10,.0f}")
+
+    workers = sorted({1, *range(2, args.workers + 1, 2), args.workers})
+    for count in workers:
+        preprocessor = BiomarkerPreprocessor(num_workers=count)
+        for channels_last in (False, True):
+            seconds, batch = timed(
+                lambda: preprocessor.preprocess_facial_batch(frames, channels_last=channels_last),
+                args.repeat
+            )
+            assert torch.equal(batch, expected)
+            layout = "channels_last" if channels_last else "NCHW"
+            name = f"batch, {count} worker(s), {layout}"
+            print(f"{name:<32} {seconds * 1e3:>9.1f} {args.frames / seconds:>10,.0f}")
+        preprocessor.close()
+
+    total_seconds = sum(len(clip) for clip in clips) / 16000
+    print(f"\nvocal: {args.clips} clips, {total_seconds:.0f}s of audio")
+    print(f"{'path':<32} {'ms':>9} {'clips/s':>10}")
+
+    seconds, singles = timed(
+        lambda: [single.preprocess_vocal(clip) for clip in clips],
+        args.repeat
+    )
+    print(f"{'per-clip':<32} {seconds * 1e3:>9.1f} {args.clips / seconds:>10,.0f}")
+
+    def per_clip_padded():
+        tensors = [single.preprocess_vocal(clip)[0, 0] for clip in clips]
+        lengths = torch.tensor([len(t) for t in tensors])
+        padded = torch.nn.utils.rnn.pad_sequence(tensors, batch_first=True)
+        return padded.unsqueeze(1), torch.arange(padded.shape[1]) < lengths.unsqueeze(1)
+
+    seconds, _ = timed(per_clip_padded, args.repeat)
+    print(f"{'per-clip + pad_sequence':<32} {seconds * 1e3:>9.1f} {args.clips / seconds:>10,.0f}")
+
+    for count in workers:
+        preprocessor = BiomarkerPreprocessor(num_workers=count)
+        seconds, (batch, mask) = timed(lambda: preprocessor.preprocess_vocal_batch(clips), args.repeat)
+        for row, expected_clip, row_mask in zip(batch, singles, mask):
+            length = expected_clip.shape[-1]
+            assert torch.equal(row[0, :length], expected_clip[0, 0])
+            assert int(row_mask.sum()) == length and not row[0, length:].any()
+        name = f"padded batch + mask, {count} worker(s)"
+        print(f"{name:<32} {seconds * 1e3:>9.1f} {args.clips / seconds:>10,.0f}")
+        preprocessor.close()
+    single.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# backend/benchmarks/rag_event_loop.py
+"""Measure event-loop blocking of the RAG pipeline against a stub LLM server
+
+Starts a local HTTP server that mimics the Anthropic Messages and OpenAI Chat
+Completions APIs with a fixed response delay, then runs concurrent analyses
+through (a) the previous pattern of synchronous SDK clients called inside
+``async def`` and (b) the async ``RAGSystem`` clients, while a ticker task
+records how late the event loop services a 10 ms timer.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.rag_event_loop --concurrency 20 --delay-ms 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+_REQUIRED_ENV = (
+    "VPC_ID", "PUBLIC_SUBNET_1A", "PUBLIC_SUBNET_1B", "PRIVATE_SUBNET_1A",
+    "PRIVATE_SUBNET_1B", "POSTGRES_USER", "POSTGRES_PASSWORD", "IAM_ROLE_ARN",
+    "ACCESS_KEY_ID", "SECRET_ACCESS_KEY", "SECRET_KEY", "ANTHROPIC_API_KEY",
+    "OPENAI_API_KEY"
+)
+
+RESPONSE_TEXT = "Stub analysis token " * 20
+
+def make_stub_handler(delay: float):
+    class StubLLMHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, payload: Dict[str, Any]):
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_sse(self, events: List[str]):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for event in events:
+                self.wfile.write(event.encode())
+                self.wfile.flush()
+                time.sleep(delay / len(events))
+            self.close_connection = True
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            words = RESPONSE_TEXT.split(" ")
+
+            if self.path.endswith("/messages"):
+                if request.get("stream"):
+                    message = {"id": "msg_stub", "type": "message", "role": "assistant",
+                               "model": request["model"], "content": [],
+                               "stop_reason": None, "stop_sequence": None,
+                               "usage": {"input_tokens": 1, "output_tokens": 0}}
+                    events = [f"event: message_start\ndata: {json.dumps({'type': 'message_start', 'message': message})}\n\n",
+                              "event: content_block_start\ndata: " + json.dumps({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}) + "\n\n"]
+                    events += [
+                        "event: content_block_delta\ndata: " + json.dumps({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": word + " "}}) + "\n\n"
+                        for word in words
+                    ]
+                    events += ["event: content_block_stop\ndata: " + json.dumps({"type": "content_block_stop", "index": 0}) + "\n\n",
+                               "event: message_delta\ndata: " + json.dumps({"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": len(words)}}) + "\n\n",
+                               "event: message_stop\ndata: " + json.dumps({"type": "message_stop"}) + "\n\n"]
+                    return self._send_sse(events)
+                time.sleep(delay)
+                return self._send_json({
+                    "id": "msg_stub", "type": "message", "role": "assistant",
+                    "model": request["model"],
+                    "content": [{"type": "text", "text": RESPONSE_TEXT}],
+                    "stop_reason": "end_turn", "stop_sequence": None,
+                    "usage": {"input_tokens": 1, "output_tokens": len(words)}
+                })
+
+            if request.get("stream"):
+                chunks = [
+                    "data: " + json.dumps({"id": "chatcmpl-stub", "object": "chat.completion.chunk",
+                                           "created": 0, "model": request["model"],
+                                           "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]}) + "\n\n"
+                    for word in words
+                ]
+                return self._send_sse(chunks + ["data: [DONE]\n\n"])
+            time.sleep(delay)
+            return self._send_json({
+                "id": "chatcmpl-stub", "object": "chat.completion", "created": 0,
+                "model": request["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": RESPONSE_TEXT}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": len(words), "total_tokens": len(words) + 1}
+            })
+
+    return StubLLMHandler
+
+class StubKnowledgeBase:
+    async def asimilarity_search(self, query: str, k: int = 4):
+        return [SimpleNamespace(page_content=f"RDoC passage {i}") for i in range(k)]
+
+async def _measure(run_one, concurrency: int) -> Dict[str, float]:
+    lags: List[float] = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        interval = 0.01
+        while not stop.is_set():
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - expected)
+
+    monitor = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    return {"wall_s": elapsed, "max_lag_ms": max(lags, default=0) * 1e3}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--delay-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_stub_handler(args.delay_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    for name in _REQUIRED_ENV:
+        os.environ.setdefault(name, "benchmark")
+    os.environ["ANTHROPIC_BASE_URL"] = base_url
+    os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+    os.environ["LOG_S3_BUFFERED"] = "false"
+
+    import anthropic
+    import openai
+    from backend.core.cache import ResultCache
+    from backend.core.config import settings
+    from backend.services.rag_service import RAGSystem
+
+    # Keep benchmark logs local
+    logging.getLogger("layla-app").handlers = []
+
+    def assessment(i: int) -> Dict[str, Any]:
+        return {"type": "PHQ-9", "responses": {str(q): (q + i) % 4 for q in range(1, 10)},
+                "total_score": i, "severity": "Moderate"}
+
+    # Previous behaviour: blocking SDK clients inside async handlers
+    sync_anthropic = anthropic.Anthropic(api_key="benchmark", base_url=base_url)
+    sync_openai = openai.OpenAI(api_key="benchmark", base_url=f"{base_url}/v1")
+
+    async def legacy_one(i: int):
+        data = assessment(i)
+        analysis = sync_anthropic.messages.create(
+            model=settings.rag.CLAUDE_MODEL, max_tokens=2000,
+            messages=[{"role": "user", "content": str(data)}]
+        )
+        sync_openai.chat.completions.create(
+            model=settings.rag.GPT4_MODEL,
+            messages=[{"role": "user", "content": analysis.content[0].text}]
+        )
+
+    async def run(concurrency: int):
+        rag = RAGSystem.__new__(RAGSystem)
+        rag._create_clients()
+        rag.rdoc_kb = StubKnowledgeBase()
+        rag.analysis_cache = ResultCache(None, max_memory_entries=0)
+
+        async def async_one(i: int):
+            await rag.analyze_assessment(assessment(i))
+
+        first_token: Dict[int, float] = {}
+
+        async def streaming_one(i: int):
+            start = time.perf_counter()
+            async for event in rag.stream_assessment_analysis(assessment(i)):
+                if event["event"] == "claude_delta" and i not in first_token:
+                    first_token[i] = time.perf_counter() - start
+
+        results = {
+            "sync clients (before)": await _measure(legacy_one, concurrency),
+            "async clients": await _measure(async_one, concurrency),
+            "async streaming": await _measure(streaming_one, concurrency)
+        }
+        await rag.aclose()
+        return results, first_token
+
+    results, first_token = asyncio.run(run(args.concurrency))
+    print(f"{'mode':<24} {'wall (s)':>9} {'max loop lag (ms)':>18}")
+    for mode, result in results.items():
+        print(f"{mode:<24} {result['wall_s']:>9.2f} {result['max_lag_ms']:>18.1f}")
+    if first_token:
+        mean_first = sum(first_token.values()) / len(first_token)
+        print(f"streaming: mean time to first Claude token {mean_first * 1e3:.0f} ms")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
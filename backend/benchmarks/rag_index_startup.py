@@ -0,0 +1,96 @@
+# backend/benchmarks/rag_index_startup.py
+"""Benchmark RDoC index startup: full re-embed vs persisted index
+
+Run from the repository root:
+
+    python -m backend.benchmarks.rag_index_startup --documents 200
+"""
+
+import argparse
+import hashlib
+import random
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.vectorstores import FAISS
+
+from backend.services.vector_index import PersistentVectorIndex
+
+class SlowHashEmbeddings(Embeddings):
+    """Deterministic local embeddings with simulated API latency"""
+
+    def __init__(self, dim: int = 1536, latency_per_text: float = 0.002):
+        self.dim = dim
+        self.latency_per_text = latency_per_text
+        self.calls = 0
+
+    def _embed(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += len(texts)
+        time.sleep(self.latency_per_text * len(texts))
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+def make_documents(count: int, seed: int = 0) -> List[Document]:
+    rng = random.Random(seed)
+    words = ["arousal", "valence", "threat", "reward", "cognitive", "control",
+             "circuit", "construct", "domain", "behavior", "social", "sleep"]
+    return [
+        Document(
+            page_content=" ".join(rng.choice(words) for _ in range(600)),
+            metadata={"source": f"rdoc/{i}.md"}
+        )
+        for i in range(count)
+    ]
+
+def legacy_startup(documents: List[Document], embeddings: Embeddings) -> FAISS:
+    """What every worker did before: split and embed the whole corpus"""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    return FAISS.from_documents(splitter.split_documents(documents), embeddings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    documents = make_documents(args.documents)
+    embeddings = SlowHashEmbeddings(latency_per_text=args.latency_ms / 1000)
+
+    def timed(label, fn):
+        embeddings.calls = 0
+        start = time.perf_counter()
+        store = fn()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {elapsed:>8.2f}s  {embeddings.calls:>6} chunks embedded")
+        return store
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = PersistentVectorIndex(index_dir, embeddings, embedding_model="bench")
+
+        timed("before: embed on every boot", lambda: legacy_startup(documents, embeddings))
+        timed("after: first build", lambda: index.load_or_build(documents))
+        store = timed("after: warm load", lambda: index.load_or_build(documents))
+
+        changed = list(documents)
+        changed[0] = Document(
+            page_content=changed[0].page_content + " revised",
+            metadata=changed[0].metadata
+        )
+        timed("after: 1 document changed", lambda: index.load_or_build(changed))
+
+        query = documents[1].page_content[:200]
+        assert store.similarity_search(query, k=1), "warm index returned no results"
+
+if __name__ == "__main__":
+    main()
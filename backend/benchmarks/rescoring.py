@@ -0,0 +1,183 @@
+# backend/benchmarks/rescoring.py
+"""Benchmark rescoring stored assessments: per-row if/elif vs cutpoint tables
+
+Generates ``--rows`` PHQ-9 submissions stored as JSON item mappings, then
+compares, in memory:
+
+* per-row: ``json.loads``, ``sum(responses.values())`` and the previous
+  if/elif ``calculate_severity`` chain for every row;
+* matrix: ``decode_responses`` and ``response_matrix`` to stack the
+  answers, then one ``Instrument.score_matrix`` (``np.searchsorted`` on
+  the cutpoints);
+* scoring only: ``score_matrix`` on an answer matrix already in memory.
+
+Then rescores ``--db-rows`` of them in a SQLite file after the PHQ-9
+cutpoints move, per row (SELECT, score, UPDATE each changed row) and with
+``rescore_assessments``, and checks both leave the same severities.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.rescoring --rows 1000000 --db-rows 200000
+"""
+
+import argparse
+import json
+import tempfile
+import time
+
+import numpy as np
+import sqlalchemy as sa
+
+from backend.utils.rescore import rescore_assessments
+from backend.utils.scoring import (
+    PHQ9,
+    Instrument,
+    decode_responses,
+    register_instrument,
+    response_matrix
+)
+
+def legacy_severity(total_score: int) -> str:
+    if total_score <= 4:
+        return "Minimal"
+    elif total_score <= 9:
+        return "Mild"
+    elif total_score <= 14:
+        return "Moderate"
+    elif total_score <= 19:
+        return "Moderately Severe"
+    else:
+        return "Severe"
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def populate(engine: sa.Engine, stored, answers: np.ndarray):
+    metadata = sa.MetaData()
+    sa.Table(
+        "assessments", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("assessment_type", sa.String),
+        sa.Column("scores", sa.JSON),
+        sa.Column("total_score", sa.Float),
+        sa.Column("severity_level", sa.String)
+    )
+    sa.Table(
+        "phq9_assessments", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("assessment_id", sa.Integer, index=True),
+        sa.Column("depression_severity", sa.String),
+        sa.Column("risk_level", sa.String)
+    )
+    metadata.create_all(engine)
+    scored = PHQ9.score_matrix(answers)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO assessments (id, assessment_type, scores, total_score, severity_level) "
+            "VALUES (?, 'PHQ-9', ?, ?, ?)",
+            [
+                (i + 1, text, float(total), severity)
+                for i, (text, total, severity) in enumerate(zip(stored, scored["totals"], scored["severity"]))
+            ]
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO phq9_assessments (assessment_id, depression_severity, risk_level) VALUES (?, ?, ?)",
+            [
+                (i + 1, severity, risk)
+                for i, (severity, risk) in enumerate(zip(scored["severity"], scored["risk_level"]))
+            ]
+        )
+
+def per_row_rescore(engine: sa.Engine, instrument: Instrument) -> int:
+    changed = 0
+    with engine.begin() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT id, scores, total_score, severity_level FROM assessments ORDER BY id"
+        ).all()
+        for row_id, scores, total_score, severity_level in rows:
+            total = sum(json.loads(scores).values())
+            severity = instrument.severity(total)
+            if total != total_score or severity != severity_level:
+                connection.exec_driver_sql(
+                    "UPDATE assessments SET total_score = ?, severity_level = ? WHERE id = ?",
+                    (float(total), severity, row_id)
+                )
+                connection.exec_driver_sql(
+                    "UPDATE phq9_assessments SET depression_severity = ? WHERE assessment_id = ?",
+                    (severity, row_id)
+                )
+                changed += 1
+    return changed
+
+def severities(engine: sa.Engine):
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(
+            "SELECT a.severity_level, p.depression_severity FROM assessments a "
+            "JOIN phq9_assessments p ON p.assessment_id = a.id ORDER BY a.id"
+        ).all()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--db-rows", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    answers = rng.integers(0, 4, (args.rows, PHQ9.items), dtype=np.int16)
+    keys = [str(item) for item in range(1, PHQ9.items + 1)]
+    stored = [json.dumps(dict(zip(keys, row))) for row in answers.tolist()]
+
+    def per_row():
+        return [legacy_severity(sum(json.loads(text).values())) for text in stored]
+
+    def matrix():
+        return PHQ9.score_matrix(response_matrix(decode_responses(stored), PHQ9)[0])
+
+    legacy_s, legacy = timed(per_row)
+    matrix_s, scored = timed(matrix)
+    score_s, _ = timed(lambda: PHQ9.score_matrix(answers))
+    assert list(scored["severity"]) == legacy
+    print(f"{args.rows} PHQ-9 rows stored as JSON")
+    print(f"{'path':<14} {'seconds':>9} {'rows/s':>12}")
+    print(f"{'per-row':<14} {legacy_s:>9.3f} {args.rows / legacy_s:>12,.0f}")
+    print(f"{'matrix':<14} {matrix_s:>9.3f} {args.rows / matrix_s:>12,.0f}")
+    print(f"{'scoring only':<14} {score_s:>9.3f} {args.rows / score_s:>12,.0f}")
+
+    # Move the cutpoints and rescore the stored rows
+    shifted = Instrument(
+        name="PHQ-9",
+        items=9,
+        cutpoints=(5, 10, 15, 20),
+        labels=PHQ9.labels,
+        risk_items=PHQ9.risk_items,
+        risk_cutpoints=PHQ9.risk_cutpoints,
+        risk_labels=PHQ9.risk_labels
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {}
+        for path in ("per-row", "rescore_assessments"):
+            engine = sa.create_engine(f"sqlite:///{workdir}/{path}.db")
+            populate(engine, stored[:args.db_rows], answers[:args.db_rows])
+            register_instrument(shifted)
+            try:
+                if path == "per-row":
+                    seconds, changed = timed(lambda: per_row_rescore(engine, shifted))
+                else:
+                    seconds, counts = timed(lambda: rescore_assessments(engine, ["PHQ-9"], args.batch_size))
+                    changed = counts["changed"]
+            finally:
+                register_instrument(PHQ9)
+            results[path] = (seconds, changed, severities(engine))
+            engine.dispose()
+
+    print(f"rescoring {args.db_rows} stored rows after a cutpoint change (SQLite)")
+    for path, (seconds, changed, _) in results.items():
+        print(f"{path:<20} {seconds:>7.2f} s  {changed} changed")
+    assert results["per-row"][1:] == results["rescore_assessments"][1:]
+    print("stored severities match")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# backend/benchmarks/s3_transfers.py
+"""Benchmark biomarker uploads to S3: blocking vs pooled vs fire-and-forget
+
+Uploads ``--windows`` session windows (frames plus float32 audio) to a
+filesystem stand-in for S3 that sleeps ``--latency`` seconds per call, as
+a network round trip would:
+
+* blocking: pack and ``upload_fileobj`` directly in the coroutine, which
+  is what the old ``async`` methods did to the event loop;
+* pooled: ``upload_biomarker_data(wait=True)``, awaiting each upload on the
+  transfer pool;
+* background: ``upload_biomarker_data()``, returning once the arrays are
+  copied, then ``flush()``.
+
+Reports per-call latency on the request path, the worst event loop stall
+(measured by a 1 ms ticker), total time and upload throughput, then checks
+that objects round-trip and that failed uploads are retried.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.s3_transfers --windows 64 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+_REQUIRED_ENV = (
+    "VPC_ID", "PUBLIC_SUBNET_1A", "PUBLIC_SUBNET_1B", "PRIVATE_SUBNET_1A",
+    "PRIVATE_SUBNET_1B", "POSTGRES_USER", "POSTGRES_PASSWORD", "IAM_ROLE_ARN",
+    "ACCESS_KEY_ID", "SECRET_ACCESS_KEY", "SECRET_KEY"
+)
+
+async def measure(name: str, upload, windows, total_mb: float):
+    stalls = [0.0]
+    last_tick = [time.perf_counter()]
+
+    async def ticker():
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stalls.append(now - last_tick[0] - 0.001)
+            last_tick[0] = now
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    latencies = []
+    start = time.perf_counter()
+    for index, (frames, audio) in enumerate(windows):
+        call = time.perf_counter()
+        await upload(index, frames, audio)
+        latencies.append(time.perf_counter() - call)
+    request_path = time.perf_counter() - start
+    await upload(None, None, None)  # flush
+    total = time.perf_counter() - start
+    # A loop that never yielded has one stall as long as the whole run
+    stalls.append(time.perf_counter() - last_tick[0])
+    ticking.cancel()
+    print(f"{name:<12} {statistics.median(latencies) * 1e3:>10.1f} {max(stalls) * 1e3:>10.1f} "
+          f"{request_path:>10.2f} {total:>9.2f} {total_mb / total:>9.1f}")
+
+async def run(args):
+    from backend.services.aws_service import AWSService, LocalS3Client, pack_biomarker_arrays
+    from backend.core.config import settings
+
+    rng = np.random.default_rng(0)
+    height, width = (int(n) for n in args.frame.split("x"))
+    # Smooth image plus sensor noise compresses roughly like camera frames
+    scene = np.add.outer(np.arange(height), np.arange(width))[..., None] * [1, 2, 3] % 256
+    windows = [
+        (
+            (scene + rng.integers(0, 8, (args.frames, height, width, 3))).astype(np.uint8),
+            (rng.standard_normal(int(args.window_seconds * 16000)) * 0.1).astype(np.float32)
+        )
+        for _ in range(args.windows)
+    ]
+    total_mb = sum(f.nbytes + a.nbytes for f, a in windows) / 2 ** 20
+    bucket = settings.aws.storage.DATA_BUCKET
+
+    with tempfile.TemporaryDirectory() as root:
+        client = LocalS3Client(root, latency=args.latency)
+        service = AWSService(s3_client=client)
+        print(f"{args.windows} windows, {total_mb:.0f} MB raw, {args.latency * 1e3:.0f} ms per S3 call, "
+              f"{settings.aws.S3_TRANSFER_WORKERS} transfer threads")
+        print(f"{'path':<12} {'call ms':>10} {'stall ms':>10} {'request s':>10} {'total s':>9} {'MB/s':>9}")
+
+        async def blocking(index, frames, audio):
+            if frames is not None:
+                body = pack_biomarker_arrays(frames, audio)
+                client.upload_fileobj(io.BytesIO(body), bucket, f"blocking/{index}.npz")
+
+        async def pooled(index, frames, audio):
+            if frames is not None:
+                await service.upload_biomarker_data("pooled", frames, audio, index, wait=True)
+
+        async def background(index, frames, audio):
+            if frames is None:
+                await service.flush()
+            else:
+                await service.upload_biomarker_data("background", frames, audio, index)
+
+        await measure("blocking", blocking, windows, total_mb)
+        await measure("pooled", pooled, windows, total_mb)
+        await measure("background", background, windows, total_mb)
+        stats = service.transfer_stats()
+        print(f"transfer stats: {stats['uploads']:.0f} uploads, {stats['failed_uploads']:.0f} failed, "
+              f"{stats['bytes_uploaded'] / 2 ** 20 / 2:.0f} MB compressed per run")
+
+        start = time.perf_counter()
+        for frames, audio in windows[:8]:
+            np.savez_compressed(io.BytesIO(), facial=frames, vocal=audio)
+        default_level = time.perf_counter() - start
+        start = time.perf_counter()
+        for frames, audio in windows[:8]:
+            pack_biomarker_arrays(frames, audio)
+        print(f"packing 8 windows: np.savez_compressed {default_level * 1e3:.0f} ms, "
+              f"deflate level 1 {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+        # Round trip and retry on a flaky client
+        client.fail_first = settings.aws.S3_UPLOAD_MAX_ATTEMPTS - 1
+        frames, audio = windows[0]
+        key = await service.upload_biomarker_data("retry", frames, audio, 0)
+        frames[:] = 0  # the caller reusing its buffer must not affect the upload
+        await service.flush()
+        with np.load(io.BytesIO(service.get_object_bytes(bucket, key))) as stored:
+            assert np.array_equal(stored["vocal"], audio)
+            assert stored["facial"].any()
+        print(f"retry check: stored after {service.stats['retries']:.0f} retries, arrays match")
+        await service.aclose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, default=64)
+    parser.add_argument("--frames", type=int, default=8, help="frames per window")
+    parser.add_argument("--frame", default="480x640", help="HxW of each frame")
+    parser.add_argument("--window-seconds", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    for name in _REQUIRED_ENV:
+        os.environ.setdefault(name, "benchmark")
+    os.environ["LOG_S3_BUFFERED"] = "false"
+    os.environ.setdefault("S3_RETRY_BACKOFF_SECONDS", "0.01")
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
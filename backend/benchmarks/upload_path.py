@@ -0,0 +1,251 @@
+# backend/benchmarks/upload_path.py
+"""Benchmark the biomarker upload path: spooled reads vs pooled streaming
+
+Each variant runs in a fresh interpreter and posts the same multipart body
+(one raw frame plus float32 audio) through the ASGI stack, streamed in
+64 KiB chunks as a real client would send it:
+
+* legacy: ``UploadFile`` spooling, ``await read()`` into bytes,
+  ``np.frombuffer``, then the previous preprocessing (float64 ``/ 255.0``
+  and ``/ max(abs)`` copies);
+* streamed: ``_read_biomarker_upload`` into pooled buffers and the fused
+  float32 preprocessing of ``process_biomarkers``.
+
+Reports latency, and peak RSS growth over the already-built request body
+for the first large request (pool and allocator growth) and for the
+later ones,
+checks that both produce the same tensors, and times a 413 rejection.
+Model inference and the database are out of scope.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.upload_path --audio-seconds 300 --requests 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_REQUIRED_ENV = (
+    "VPC_ID", "PUBLIC_SUBNET_1A", "PUBLIC_SUBNET_1B", "PRIVATE_SUBNET_1A",
+    "PRIVATE_SUBNET_1B", "POSTGRES_USER", "POSTGRES_PASSWORD", "IAM_ROLE_ARN",
+    "ACCESS_KEY_ID", "SECRET_ACCESS_KEY", "SECRET_KEY"
+)
+
+BOUNDARY = "benchmark-boundary"
+CHUNK_BYTES = 64 * 1024
+
+def _status_mb(field: str) -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} not in /proc/self/status")
+
+def reset_peak_rss() -> float:
+    """Restart peak tracking at the current RSS (Linux) and return it"""
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+    return _status_mb("VmRSS")
+
+def peak_rss_mb() -> float:
+    return _status_mb("VmHWM")
+
+def make_body(frame_shape, audio_samples: int):
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, frame_shape, dtype=np.uint8)
+    audio = (rng.standard_normal(audio_samples) * 0.1).astype("<f4")
+
+    body = bytearray()
+    for name, payload in (("facial_data", frame), ("vocal_data", audio)):
+        body += (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{name}.bin"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        body += payload.tobytes()
+        body += b"\r\n"
+    body += f"--{BOUNDARY}--\r\n".encode()
+    return bytes(body), frame, audio
+
+def legacy_preprocess(frame, audio):
+    """The preprocessing this change replaced, for comparison"""
+    import cv2
+    import numpy as np
+    import torch
+
+    frame = cv2.resize(frame, (224, 224)) / 255.0
+    facial = torch.from_numpy(frame).float().unsqueeze(0).permute(0, 3, 1, 2)
+    audio = audio / np.max(np.abs(audio))
+    vocal = torch.from_numpy(audio).float().unsqueeze(0).unsqueeze(0)
+    return facial, vocal
+
+def build_app(variant: str, frame_shape, outputs: dict):
+    import numpy as np
+    from fastapi import FastAPI, File, Request, UploadFile
+    from fastapi.concurrency import run_in_threadpool
+
+    from backend.api.endpoints import biomarker
+    from backend.utils.uploads import release_parts
+
+    app = FastAPI()
+
+    if variant == "legacy":
+        @app.post("/process/")
+        async def process(facial_data: UploadFile = File(...), vocal_data: UploadFile = File(...)):
+            facial_array = np.frombuffer(await facial_data.read(), dtype=np.uint8)
+            vocal_array = np.frombuffer(await vocal_data.read(), dtype=np.float32)
+            # The old handler never reshaped the frame; do so to be comparable
+            outputs["tensors"] = legacy_preprocess(facial_array.reshape(frame_shape), vocal_array)
+            return {"ok": True}
+    else:
+        @app.post("/process/")
+        async def process(request: Request):
+            parts, facial_array, vocal_array, _ = await biomarker._read_biomarker_upload(
+                request,
+                frame_shape
+            )
+            try:
+                outputs["tensors"] = await run_in_threadpool(
+                    biomarker._preprocess_upload,
+                    facial_array,
+                    vocal_array
+                )
+            finally:
+                release_parts(parts.values())
+            return {"ok": True}
+
+    return app
+
+async def post(client, body: bytes, content_length: int = None):
+    view = memoryview(body)
+
+    async def chunks():
+        for offset in range(0, len(view), CHUNK_BYTES):
+            yield bytes(view[offset:offset + CHUNK_BYTES])
+
+    return await client.post(
+        "/process/",
+        content=chunks(),
+        headers={
+            "content-type": f"multipart/form-data; boundary={BOUNDARY}",
+            "content-length": str(content_length or len(body))
+        }
+    )
+
+def run_child(variant: str, frame_shape, audio_samples: int, requests: int):
+    import httpx
+    import numpy as np
+    import torch
+
+    torch.set_num_threads(1)
+    outputs = {}
+    app = build_app(variant, frame_shape, outputs)
+    body, frame, audio = make_body(frame_shape, audio_samples)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Build lazy services and worker threads on a small upload
+            small, _, _ = make_body(frame_shape, 1600)
+            assert (await post(client, small)).status_code == 200
+
+            # The first large request also pays for pool and allocator growth
+            baseline = reset_peak_rss()
+            warm = await post(client, body)
+            assert warm.status_code == 200, warm.text
+            first_growth = peak_rss_mb() - baseline
+            outputs.clear()
+
+            baseline = reset_peak_rss()
+            latencies = []
+            for _ in range(requests):
+                outputs.clear()
+                start = time.perf_counter()
+                response = await post(client, body)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+            rejected_ms = None
+            if variant == "streamed":
+                start = time.perf_counter()
+                response = await post(client, body, content_length=1 << 40)
+                rejected_ms = (time.perf_counter() - start) * 1000
+                assert response.status_code == 413, response.text
+            return first_growth, peak_rss_mb() - baseline, latencies, rejected_ms
+
+    first_growth, steady_growth, latencies, rejected_ms = asyncio.run(run())
+
+    facial, vocal = outputs["tensors"]
+    expected_facial, expected_vocal = legacy_preprocess(frame, audio)
+    print(json.dumps({
+        "body_mb": len(body) / 1e6,
+        "median_ms": statistics.median(latencies) * 1000,
+        "p_max_ms": max(latencies) * 1000,
+        "first_growth_mb": first_growth,
+        "steady_growth_mb": steady_growth,
+        "rejected_ms": rejected_ms,
+        "facial_dtype": str(facial.dtype),
+        "facial_contiguous": facial.is_contiguous(),
+        "max_facial_diff": float((facial - expected_facial).abs().max()),
+        "max_vocal_diff": float((vocal - expected_vocal).abs().max()),
+        "audio_float64": bool(np.asarray(audio).dtype == np.float64)
+    }))
+
+def measure(args, variant: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.upload_path", "--child", variant,
+         "--frame", args.frame, "--audio-seconds", str(args.audio_seconds),
+         "--requests", str(args.requests)],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Upload benchmark ({variant}) failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frame", default="1080x1920x3", help="HxWxC of the raw frame")
+    parser.add_argument("--audio-seconds", type=float, default=300.0)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--child", choices=["legacy", "streamed"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    for name in _REQUIRED_ENV:
+        os.environ.setdefault(name, "benchmark")
+    os.environ["LOG_S3_BUFFERED"] = "false"
+
+    frame_shape = tuple(int(n) for n in args.frame.split("x"))
+    audio_samples = int(args.audio_seconds * 16000)
+
+    if args.child:
+        run_child(args.child, frame_shape, audio_samples, args.requests)
+        return
+
+    results = {variant: measure(args, variant) for variant in ("legacy", "streamed")}
+    body_mb = results["legacy"]["body_mb"]
+    print(f"body {body_mb:.1f} MB (frame {args.frame}, {args.audio_seconds:.0f}s float32 audio), "
+          f"{args.requests} requests each")
+    print(f"{'path':<10} {'median ms':>10} {'max ms':>8} "
+          f"{'peak RSS growth MB: first':>26} {'later':>6}")
+    for variant, result in results.items():
+        print(f"{variant:<10} {result['median_ms']:>10.1f} {result['p_max_ms']:>8.1f} "
+              f"{result['first_growth_mb']:>26.1f} {result['steady_growth_mb']:>6.1f}")
+
+    streamed = results["streamed"]
+    print(f"streamed output: {streamed['facial_dtype']}, contiguous NCHW "
+          f"{streamed['facial_contiguous']}, max |diff| vs legacy facial "
+          f"{streamed['max_facial_diff']:.2e} vocal {streamed['max_vocal_diff']:.2e}")
+    print(f"oversized Content-Length rejected with 413 in {streamed['rejected_ms']:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# backend/benchmarks/video_sampling.py
+"""Benchmark video upload decoding: every frame vs strided sampling
+
+Writes a synthetic MP4 and turns it into a preprocessed facial batch three
+ways:
+
+* decode every frame, preprocess every frame;
+* decode every frame, keep every ``step``-th (the naive stride);
+* ``iter_frame_batches``: grab/seek past skipped frames on a decode thread
+  that overlaps with ``preprocess_facial_batch``.
+
+Reports wall time, frames converted to RGB and peak RSS growth, and checks
+that the sampled frames match the same frames read sequentially. Gaps of up
+to ``SEEK_MIN_GAP`` frames are still decoded (grabbed); larger ones seek.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.video_sampling --seconds 30 --target-fps 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+import torch
+
+from backend.utils.preprocessing import BiomarkerPreprocessor
+from backend.utils.video import FrameSampling, iter_frame_batches, iter_sampled_frames
+
+def _status_mb(field: str) -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} not in /proc/self/status")
+
+def reset_peak_rss() -> float:
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+    return _status_mb("VmRSS")
+
+def write_video(path: str, seconds: float, fps: float, width: int, height: int):
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for index in range(int(seconds * fps)):
+        frame = np.roll(background, index * 4, axis=1)
+        cv2.putText(frame, str(index), (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        writer.write(frame)
+    writer.release()
+
+def decode_all(path: str):
+    capture = cv2.VideoCapture(path)
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    capture.release()
+
+def run(name: str, fn):
+    baseline = reset_peak_rss()
+    start = time.perf_counter()
+    frames, tensor = fn()
+    seconds = time.perf_counter() - start
+    growth = _status_mb("VmHWM") - baseline
+    print(f"{name:<34} {seconds * 1e3:>9.0f} {frames:>8} {tuple(tensor.shape)!s:>20} {growth:>9.1f}")
+    return tensor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--size", default="1280x720", help="WxH of the video")
+    parser.add_argument("--target-fps", type=float, default=5.0)
+    parser.add_argument("--max-frames", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)
+    width, height = (int(n) for n in args.size.split("x"))
+    sampling = FrameSampling(
+        target_fps=args.target_fps,
+        max_frames=args.max_frames,
+        batch_size=args.batch_size
+    )
+    preprocessor = BiomarkerPreprocessor()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "clip.mp4")
+        write_video(path, args.seconds, args.fps, width, height)
+        total = int(args.seconds * args.fps)
+        indices = sampling.indices(total, args.fps)
+        step = sampling.step(args.fps)
+        print(f"{args.seconds:.0f}s {args.size} @ {args.fps:.0f} fps "
+              f"({os.path.getsize(path) / 1e6:.1f} MB), sampling every {step} frames")
+        print(f"{'path':<34} {'ms':>9} {'frames':>8} {'batch':>20} {'RSS MB':>9}")
+
+        def every_frame():
+            frames = list(decode_all(path))
+            return len(frames), preprocessor.preprocess_facial_batch(frames)
+
+        def naive_stride():
+            frames = [frame for i, frame in enumerate(decode_all(path)) if i % step == 0]
+            return total, preprocessor.preprocess_facial_batch(frames[:args.max_frames])
+
+        def sampled():
+            tensors = [
+                preprocessor.preprocess_facial_batch(batch)
+                for batch in iter_frame_batches(path, sampling)
+            ]
+            return len(indices), torch.cat(tensors)
+
+        run("decode + preprocess every frame", every_frame)
+        naive = run("decode all, keep every step", naive_stride)
+        fast = run("sampled, threaded decode", sampled)
+        assert torch.equal(naive, fast)
+
+        # Seeking must land on exactly the frames sequential decoding yields
+        wide = FrameSampling(target_fps=args.fps / (4 * step), max_frames=args.max_frames)
+        expected = [f for i, f in enumerate(decode_all(path)) if i in set(wide.indices(total, args.fps))]
+        actual = list(iter_sampled_frames(path, wide))
+        assert len(actual) == len(expected)
+        assert all(np.array_equal(a, b) for a, b in zip(actual, expected))
+        print(f"seek check: {len(actual)} frames {4 * step} apart match sequential decoding")
+    preprocessor.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# backend/core/cache.py
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+def canonical_key(payload: Any) -> str:
+    """Stable SHA-256 key for a JSON-compatible payload"""
+    encoded = json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def _json_default(obj: Any) -> Any:
+    # LLM SDK responses are pydantic models
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+class ResultCache:
+    """Two-tier result cache: in-process LRU in front of a SQLite file
+
+    Entries are tagged with a ``version`` string (e.g. a fingerprint of the
+    knowledge base, prompts and models that produced them). Lookups only hit
+    entries of the current version, and ``purge_stale`` deletes the rest.
+    Both tiers expire entries after ``ttl_seconds``; the disk tier evicts the
+    least recently used entries beyond ``max_disk_entries``.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        version: str = "",
+        max_memory_entries: int = 1024,
+        max_disk_entries: int = 100000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600
+    ):
+        self.version = version
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0
+        }
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed "
+                "ON cache_entries(accessed_at)"
+            )
+            self._db.commit()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _versioned(self, key: str) -> str:
+        return f"{self.version}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None"""
+        key = self._versioned(key)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], now):
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return copy.deepcopy(entry[1])
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM cache_entries WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if not self._expired(created_at, now):
+                        self._db.execute(
+                            "UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+                            (now, key)
+                        )
+                        self._db.commit()
+                        value = json.loads(value)
+                        self._remember(key, created_at, value)
+                        self.stats["disk_hits"] += 1
+                        return copy.deepcopy(value)
+                    self._db.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any) -> Any:
+        """Store a value under ``key`` and return its JSON-normalized form
+
+        The returned copy is what later hits will return, so callers can hand
+        out the same shape on a miss as on a hit.
+        """
+        key = self._versioned(key)
+        now = time.time()
+        encoded = json.dumps(value, default=_json_default)
+        normalized = json.loads(encoded)
+
+        with self._lock:
+            self._remember(key, now, normalized)
+            if self._db is None:
+                return copy.deepcopy(normalized)
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(key, version, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, self.version, encoded, now, now)
+            )
+            self._evict_disk()
+            self._db.commit()
+            return copy.deepcopy(normalized)
+
+    def _remember(self, key: str, created_at: float, value: Any):
+        if self.max_memory_entries <= 0:
+            return
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _evict_disk(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                "SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+            self.stats["evictions"] += overflow
+
+    def purge_stale(self) -> int:
+        """Delete expired entries and entries from other versions"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is None:
+                return 0
+            cursor = self._db.execute(
+                "DELETE FROM cache_entries WHERE version != ? OR created_at < ?",
+                (
+                    self.version,
+                    time.time() - self.ttl_seconds if self.ttl_seconds else 0
+                )
+            )
+            self._db.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        """Drop every entry in both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache_entries")
+                self._db.commit()
+
+    def set_version(self, version: str):
+        """Switch to a new version, invalidating everything cached before it"""
+        self.version = version
+        self.purge_stale()
+
+    def info(self) -> Dict[str, Any]:
+        """Counters and tier sizes for monitoring"""
+        with self._lock:
+            disk_entries = 0
+            if self._db is not None:
+                (disk_entries,) = self._db.execute(
+                    "SELECT COUNT(*) FROM cache_entries"
+                ).fetchone()
+            lookups = (
+                self.stats["memory_hits"] +
+                self.stats["disk_hits"] +
+                self.stats["misses"]
+            )
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            return {
+                **self.stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "version": self.version
+            }
@@ -25,6 +25,14 @@ class DatabaseSettings(BaseSettings):
     POSTGRES_DB: str = "layla_db"
     POSTGRES_PORT: int = 5432
     POSTGRES_HOST: Optional[str] = None  # Set dynamically from RDS
+    DATABASE_URL: Optional[str] = None  # Overrides the RDS lookup, e.g. sqlite for local runs
+    
+    # Connection pool per worker process (and per engine, sync and async);
+    # keep workers * (size + overflow) below the server's max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 300
     
     class Config:
         env_file = ".env"
@@ -48,12 +56,99 @@ class MLSettings(BaseSettings):
     class Config:
         env_file = ".env"
 
+class LoggingSettings(BaseSettings):
+    """Application Logging Settings"""
+    LOG_S3_BUFFERED: bool = True
+    LOG_S3_BATCH_MAX_RECORDS: int = 500
+    LOG_S3_BATCH_MAX_BYTES: int = 1024 * 1024
+    LOG_S3_FLUSH_INTERVAL: float = 5.0  # seconds
+    LOG_S3_QUEUE_SIZE: int = 10000
+    LOG_S3_SPILL_DIR: Optional[str] = None  # Drop records on backpressure when unset
+    
+    class Config:
+        env_file = ".env"
+
+class NvidiaSettings(BaseSettings):
+    """GPU Inference Settings"""
+    CUDA_VISIBLE_DEVICES: str = "0"
+    TENSORRT_MODE: bool = False
+    
+    # Dynamic micro-batching
+    INFERENCE_MAX_BATCH_SIZE: int = 32
+    INFERENCE_MAX_LATENCY_MS: float = 5.0
+    
+    # CPU preprocessing threads for batched frames and clips
+    PREPROCESS_WORKERS: int = 4
+    
+    # Inference backend: "auto" uses CUDA (TensorRT if enabled) when a GPU
+    # is present and the CPU runtime otherwise; "cpu" forces the latter
+    INFERENCE_BACKEND: str = "auto"
+    CPU_RUNTIME: str = "torchscript"  # torchscript | onnx | eager
+    CPU_QUANTIZE: bool = True  # dynamic int8 for Linear/LSTM/GRU layers
+    CPU_INTRA_OP_THREADS: int = 0  # 0: one per available core
+    CPU_INTER_OP_THREADS: int = 1
+    CPU_MAX_DRIFT: float = 0.05  # relative L2 error vs eager float32
+    
+    class Config:
+        env_file = ".env"
+
+class RAGSettings(BaseSettings):
+    """RAG System Settings"""
+    CLAUDE_MODEL: str = "claude-3-sonnet-20240229"
+    GPT4_MODEL: str = "gpt-4"
+    PROMPT_VERSION: str = "1"
+    EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    RAG_RETRIEVAL_K: int = 4
+    
+    # LLM clients
+    ANTHROPIC_BASE_URL: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_RETRIES: int = 2
+    
+    # Persistent RDoC vector index
+    RAG_INDEX_DIR: str = ".cache/rag/rdoc_index"
+    RAG_CHUNK_SIZE: int = 1000
+    RAG_CHUNK_OVERLAP: int = 200
+    
+    # Analysis result cache
+    RAG_CACHE_ENABLED: bool = True
+    RAG_CACHE_PATH: Optional[str] = ".cache/rag/analysis_cache.sqlite3"
+    RAG_CACHE_MEMORY_ENTRIES: int = 1024
+    RAG_CACHE_MAX_DISK_ENTRIES: int = 100000
+    RAG_CACHE_TTL_SECONDS: Optional[float] = 7 * 24 * 3600
+    
+    class Config:
+        env_file = ".env"
+
+class JobQueueSettings(BaseSettings):
+    """Background Job Settings"""
+    JOB_QUEUE_PATH: str = ".cache/jobs/jobs.sqlite3"
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 2.0
+    JOB_LEASE_SECONDS: float = 600.0
+    JOB_POLL_INTERVAL_SECONDS: float = 0.5
+    
+    class Config:
+        env_file = ".env"
+
 class AWSSettings(BaseSettings):
     """AWS Global Settings"""
     REGION: str = "us-east-1"
     ACCESS_KEY_ID: str
     SECRET_ACCESS_KEY: str
     
+    # S3 transfers: pool threads, multipart sizing, background upload retries
+    S3_TRANSFER_WORKERS: int = 8
+    S3_MULTIPART_THRESHOLD: int = 16 * 1024 * 1024
+    S3_MULTIPART_CHUNKSIZE: int = 16 * 1024 * 1024
+    S3_MAX_CONCURRENCY: int = 4  # parts in flight per transfer
+    S3_UPLOAD_MAX_ATTEMPTS: int = 3
+    S3_RETRY_BACKOFF_SECONDS: float = 0.5
+    S3_MAX_PENDING_UPLOADS: int = 64
+    S3_MAX_PENDING_UPLOAD_BYTES: int = 512 * 1024 * 1024  # raw array copies held by them
+    
     network: NetworkSettings = NetworkSettings()
     database: DatabaseSettings = DatabaseSettings()
     storage: StorageSettings = StorageSettings()
@@ -72,12 +167,56 @@ class Settings(BaseSettings):
     # AWS Configuration
     aws: AWSSettings = AWSSettings()
     
+    # NVIDIA Configuration
+    nvidia: NvidiaSettings = NvidiaSettings()
+    
+    # RAG Configuration
+    rag: RAGSettings = RAGSettings()
+    
+    # Background Jobs
+    jobs: JobQueueSettings = JobQueueSettings()
+    
+    # Logging Configuration
+    logging: LoggingSettings = LoggingSettings()
+    
+    # Service Startup
+    SERVICE_WARM_UP: bool = True
+    SERVICE_WARM_UP_TIMEOUT: float = 120.0
+    
     # API Settings
     API_V1_STR: str = "/api/v1"
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
         "http://localhost:8501"
     ]
+    API_PAGE_SIZE_DEFAULT: int = 100
+    API_PAGE_SIZE_MAX: int = 1000
+    ASSESSMENT_BULK_MAX_ITEMS: int = 1000  # submissions per /assessment/bulk/ request
+    ASSESSMENT_INSTRUMENTS_PATH: Optional[str] = None  # JSON scoring definitions beyond PHQ-9/GAD-7
+    EXPORT_BATCH_SIZE: int = 2000  # rows fetched and encoded per chunk of /export/ streams
+    
+    # Upload Limits
+    UPLOAD_MAX_VOCAL_BYTES: int = 64 * 1024 * 1024
+    UPLOAD_MAX_VIDEO_BYTES: int = 256 * 1024 * 1024
+    UPLOAD_BUFFER_POOL_BYTES: int = 256 * 1024 * 1024
+    
+    # Video Sampling
+    VIDEO_TARGET_FPS: float = 5.0
+    VIDEO_MAX_FRAMES: int = 64
+    VIDEO_BATCH_SIZE: int = 16
+    
+    # Model Cache (artifacts from aws.storage.MODELS_BUCKET)
+    MODEL_CACHE_DIR: str = ".cache/models"
+    MODEL_CACHE_MAX_BYTES: int = 10 * 1024 * 1024 * 1024
+    MODEL_STORE_PATH: Optional[str] = None  # Filesystem stand-in for the bucket when set
+    
+    # Data Lake (Parquet exports read by ml_pipeline)
+    DATA_LAKE_DIR: str = "data/lake"
+    DATA_LAKE_BATCH_SIZE: int = 50000
+    
+    # LLM Providers
+    ANTHROPIC_API_KEY: Optional[str] = None
+    OPENAI_API_KEY: Optional[str] = None
     
     # Security
     SECRET_KEY: str
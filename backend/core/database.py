@@ -1,13 +1,29 @@
 # backend/core/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc as sa_exc
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Any, AsyncGenerator, Dict, Generator
+import threading
+import time
 import boto3
 from botocore.exceptions import ClientError
 
 from .config import settings
 from .logging import logger
+from .registry import registry
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite"
+}
 
 def get_rds_endpoint() -> str:
     """Get RDS endpoint dynamically"""
@@ -27,29 +43,181 @@ def get_rds_endpoint() -> str:
         logger.error(f"Failed to get RDS endpoint: {str(e)}")
         raise
 
-# Set database host
-settings.aws.database.POSTGRES_HOST = get_rds_endpoint()
-
-# Database URL
-SQLALCHEMY_DATABASE_URL = (
-    f"postgresql://"
-    f"{settings.aws.database.POSTGRES_USER}:"
-    f"{settings.aws.database.POSTGRES_PASSWORD}@"
-    f"{settings.aws.database.POSTGRES_HOST}:"
-    f"{settings.aws.database.POSTGRES_PORT}/"
-    f"{settings.aws.database.POSTGRES_DB}"
-)
+def _database_url() -> str:
+    """Database URL, resolving the RDS host on first use"""
+    db_settings = settings.aws.database
+    if db_settings.DATABASE_URL:
+        return db_settings.DATABASE_URL
+    
+    if not db_settings.POSTGRES_HOST:
+        db_settings.POSTGRES_HOST = get_rds_endpoint()
+    
+    return (
+        f"postgresql://"
+        f"{db_settings.POSTGRES_USER}:"
+        f"{db_settings.POSTGRES_PASSWORD}@"
+        f"{db_settings.POSTGRES_HOST}:"
+        f"{db_settings.POSTGRES_PORT}/"
+        f"{db_settings.POSTGRES_DB}"
+    )
+
+class _PoolMetricsMixin:
+    """Counts checkouts, time spent waiting on an exhausted pool and timeouts"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.metrics: Dict[str, float] = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "timeouts": 0
+        }
+    
+    def _do_get(self):
+        # Exhausted: no idle connection and no overflow left to open one
+        exhausted = (
+            self.checkedin() == 0 and
+            self._max_overflow > -1 and
+            self.overflow() >= self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            with self._metrics_lock:
+                self.metrics["timeouts"] += 1
+            raise
+        waited = time.perf_counter() - start
+        
+        with self._metrics_lock:
+            self.metrics["checkouts"] += 1
+            if exhausted:
+                self.metrics["waits"] += 1
+                self.metrics["wait_seconds"] += waited
+                self.metrics["max_wait_seconds"] = max(
+                    self.metrics["max_wait_seconds"],
+                    waited
+                )
+        return connection
+
+class MeteredQueuePool(_PoolMetricsMixin, QueuePool):
+    """QueuePool with checkout metrics"""
+
+class MeteredAsyncQueuePool(_PoolMetricsMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout metrics"""
+
+def _pool_options(url: URL, poolclass: type) -> Dict[str, Any]:
+    """Pool arguments from settings; sized per worker process"""
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite lives in a single connection
+        return {}
+    
+    db_settings = settings.aws.database
+    return {
+        "poolclass": poolclass,
+        "pool_size": db_settings.DB_POOL_SIZE,
+        "max_overflow": db_settings.DB_MAX_OVERFLOW,
+        "pool_timeout": db_settings.DB_POOL_TIMEOUT,
+        "pool_recycle": db_settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True
+    }
+
+def _connect_args(url: URL) -> Dict[str, Any]:
+    if url.get_backend_name() == "sqlite":
+        return {"check_same_thread": False}
+    return {}
+
+def create_db_engine() -> Engine:
+    """Create the SQLAlchemy engine"""
+    url = make_url(_database_url())
+    return create_engine(
+        url,
+        connect_args=_connect_args(url),
+        **_pool_options(url, MeteredQueuePool)
+    )
+
+def _async_database_url() -> URL:
+    """Database URL with the async driver for its backend"""
+    url = make_url(_database_url())
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver and url.drivername != driver:
+        url = url.set(drivername=driver)
+    return url
 
-# Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,
-    pool_recycle=300
+def create_async_db_engine() -> AsyncEngine:
+    """Create the async SQLAlchemy engine"""
+    url = _async_database_url()
+    return create_async_engine(
+        url,
+        connect_args=_connect_args(url),
+        **_pool_options(url, MeteredAsyncQueuePool)
+    )
+
+registry.register("db_engine", create_db_engine, close=lambda engine: engine.dispose())
+registry.register(
+    "async_db_engine",
+    create_async_db_engine,
+    close=lambda engine: engine.dispose()
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_engine() -> Engine:
+    """Get the engine, creating it on first use"""
+    return registry.get("db_engine")
+
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine, creating it on first use"""
+    return registry.get("async_db_engine")
+
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+
+# Attributes stay loaded after commit; async sessions cannot lazy-load them
+_async_session_factory = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+def SessionLocal() -> Session:
+    """Create a session bound to the lazily created engine"""
+    return _session_factory(bind=get_engine())
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Create an async session bound to the lazily created async engine"""
+    return _async_session_factory(bind=get_async_engine())
+
+def pool_status() -> Dict[str, Any]:
+    """Pool utilisation of the engines built so far, for monitoring"""
+    status = {}
+    for name in ("db_engine", "async_db_engine"):
+        if not registry.is_ready(name):
+            continue
+        engine = registry.get(name)
+        pool = getattr(engine, "sync_engine", engine).pool
+        
+        snapshot: Dict[str, Any] = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            snapshot.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow
+            })
+        metrics = getattr(pool, "metrics", None)
+        if metrics is not None:
+            with pool._metrics_lock:
+                snapshot.update(metrics)
+            snapshot["mean_wait_seconds"] = (
+                metrics["wait_seconds"] / metrics["waits"] if metrics["waits"] else 0.0
+            )
+        status[name] = snapshot
+    return status
+
+def __getattr__(name: str):
+    # Keep ``from backend.core.database import engine`` working without
+    # resolving the engine at import time
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 Base = declarative_base()
 
 def get_db() -> Generator[Session, None, None]:
@@ -58,4 +226,9 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
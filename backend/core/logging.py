@@ -3,33 +3,58 @@ import logging
 from pathlib import Path
 import boto3
 from botocore.exceptions import ClientError
+import fcntl
+import gzip
 import json
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
 from datetime import datetime
+from typing import Any, List, Optional
+
+from .config import settings
 
 class S3Handler(logging.Handler):
     """Custom logging handler for S3"""
     
-    def __init__(self, bucket: str, prefix: str):
+    def __init__(self, bucket: str, prefix: str, s3_client: Any = None):
         super().__init__()
         self.bucket = bucket
         self.prefix = prefix
-        self.s3_client = boto3.client(
-            's3',
-            region_name=settings.aws.REGION,
-            aws_access_key_id=settings.aws.ACCESS_KEY_ID,
-            aws_secret_access_key=settings.aws.SECRET_ACCESS_KEY
-        )
+        self._s3_client = s3_client
+        self._client_lock = threading.Lock()
+    
+    @property
+    def s3_client(self) -> Any:
+        """S3 client, created when the first record is shipped"""
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    self._s3_client = boto3.client(
+                        's3',
+                        region_name=settings.aws.REGION,
+                        aws_access_key_id=settings.aws.ACCESS_KEY_ID,
+                        aws_secret_access_key=settings.aws.SECRET_ACCESS_KEY
+                    )
+        return self._s3_client
+    
+    def _format_entry(self, record: logging.LogRecord) -> dict:
+        """Build the structured log entry for a record"""
+        return {
+            'timestamp': datetime.utcfromtimestamp(record.created).isoformat(),
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno
+        }
     
     def emit(self, record):
         try:
-            log_entry = {
-                'timestamp': datetime.utcnow().isoformat(),
-                'level': record.levelname,
-                'message': record.getMessage(),
-                'module': record.module,
-                'function': record.funcName,
-                'line': record.lineno
-            }
+            log_entry = self._format_entry(record)
             
             # Create S3 key with timestamp
             key = f"{self.prefix}/{datetime.utcnow().strftime('%Y/%m/%d/%H')}/{record.levelname}.log"
@@ -43,6 +68,221 @@ class S3Handler(logging.Handler):
         except Exception as e:
             print(f"Failed to write log to S3: {str(e)}")
 
+class BufferedS3Handler(S3Handler):
+    """S3 logging handler that ships batched records from a background thread
+    
+    Records are queued in memory by ``emit`` and uploaded by a worker thread as
+    gzip-compressed NDJSON objects, one object per batch, so logging never waits
+    on an S3 round-trip. A batch is flushed when it reaches ``max_batch_records``
+    or ``max_batch_bytes``, or ``flush_interval`` seconds after its first record.
+    
+    When the queue is full (or an upload fails) records are appended to an NDJSON
+    spill file in ``spill_dir`` and re-shipped after the next successful upload,
+    by whichever process sharing ``spill_dir`` makes it; without a ``spill_dir``
+    they are dropped and counted in ``dropped``.
+    """
+    
+    _FLUSH = object()
+    _STOP = object()
+    
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str,
+        s3_client: Any = None,
+        max_batch_records: int = 500,
+        max_batch_bytes: int = 1024 * 1024,
+        flush_interval: float = 5.0,
+        queue_size: int = 10000,
+        spill_dir: Optional[str] = None
+    ):
+        super().__init__(bucket, prefix, s3_client=s3_client)
+        self.max_batch_records = max_batch_records
+        self.max_batch_bytes = max_batch_bytes
+        self.flush_interval = flush_interval
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.dropped = 0
+        self.spilled = 0
+        self.shipped = 0
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._spill_lock = threading.Lock()
+        self._sequence = 0
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run,
+            name="s3-log-shipper",
+            daemon=True
+        )
+        self._worker.start()
+    
+    @property
+    def _spill_path(self) -> Path:
+        return self.spill_dir / f"{os.getpid()}-spill.ndjson"
+    
+    def emit(self, record):
+        try:
+            line = json.dumps(self._format_entry(record))
+        except Exception:
+            self.handleError(record)
+            return
+        
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self._spill([line])
+    
+    def flush(self, timeout: float = 10.0):
+        """Ship everything queued so far and wait for the upload to finish"""
+        if self._closed or not self._worker.is_alive():
+            return
+        done = threading.Event()
+        try:
+            self._queue.put((self._FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+    
+    def close(self):
+        """Flush pending records and stop the shipping thread"""
+        if not self._closed:
+            self._closed = True
+            if self._worker.is_alive():
+                try:
+                    self._queue.put((self._STOP, None), timeout=10.0)
+                    self._worker.join(timeout=30.0)
+                except queue.Full:
+                    pass
+        super().close()
+    
+    def _run(self):
+        """Worker loop: accumulate lines into batches and ship them"""
+        batch: List[str] = []
+        batch_bytes = 0
+        deadline = None
+        
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            
+            if isinstance(item, str):
+                batch.append(item)
+                batch_bytes += len(item) + 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if (
+                    len(batch) < self.max_batch_records and
+                    batch_bytes < self.max_batch_bytes
+                ):
+                    continue
+            
+            # Size/time threshold reached, or an explicit flush/stop request
+            if batch:
+                self._ship(batch)
+                batch, batch_bytes, deadline = [], 0, None
+            
+            if isinstance(item, tuple):
+                marker, done = item
+                if marker is self._STOP:
+                    return
+                done.set()
+    
+    def _ship(self, lines: List[str]):
+        """Upload a batch, spilling it to disk on failure"""
+        if self._put_batch(lines):
+            self._drain_spill()
+        else:
+            self._spill(lines)
+    
+    def _put_batch(self, lines: List[str]) -> bool:
+        now = datetime.utcnow()
+        self._sequence += 1
+        key = (
+            f"{self.prefix}/{now.strftime('%Y/%m/%d/%H')}/"
+            f"{now.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-"
+            f"{self._sequence:06d}-{uuid.uuid4().hex[:8]}.ndjson.gz"
+        )
+        body = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+        
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=body,
+                ContentType='application/x-ndjson',
+                ContentEncoding='gzip'
+            )
+            self.shipped += len(lines)
+            return True
+        except Exception as e:
+            print(f"Failed to write log batch to S3: {str(e)}", file=sys.stderr)
+            return False
+    
+    def _spill(self, lines: List[str]):
+        """Append lines to the local spill file, or drop them"""
+        if not self.spill_dir:
+            self.dropped += len(lines)
+            return
+        try:
+            with self._spill_lock:
+                _append_locked(self._spill_path, "\n".join(lines) + "\n")
+            self.spilled += len(lines)
+        except OSError as e:
+            self.dropped += len(lines)
+            print(f"Failed to spill log records: {str(e)}", file=sys.stderr)
+    
+    def _drain_spill(self):
+        """Re-ship records spilled to disk by any process sharing ``spill_dir``
+        
+        Each spill file is claimed by renaming it, so concurrent drains never
+        ship the same records twice.
+        """
+        if not self.spill_dir:
+            return
+        for path in sorted(self.spill_dir.glob("*-spill.ndjson")):
+            shipping = path.with_name(f"{path.name}.{os.getpid()}.shipping")
+            try:
+                os.replace(path, shipping)
+            except FileNotFoundError:
+                # Claimed by another process
+                continue
+            
+            with open(shipping, encoding="utf-8") as f:
+                # Waits for an append that opened the file before the rename
+                fcntl.flock(f, fcntl.LOCK_EX)
+                lines = f.read().splitlines()
+            for start in range(0, len(lines), self.max_batch_records):
+                chunk = lines[start:start + self.max_batch_records]
+                if not self._put_batch(chunk):
+                    # Put the remainder back for the next attempt
+                    self._spill(lines[start:])
+                    shipping.unlink()
+                    return
+            shipping.unlink()
+
+def _append_locked(path: Path, text: str):
+    """Append to ``path`` under an exclusive flock
+    
+    A drain may rename the file between our open and lock; the write then
+    goes to a fresh file at ``path`` instead.
+    """
+    while True:
+        with open(path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                current = os.stat(path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current == os.fstat(f.fileno()).st_ino:
+                f.write(text)
+                return
+
 def setup_logging():
     """Configure logging"""
     logger = logging.getLogger('layla-app')
@@ -58,10 +298,21 @@ def setup_logging():
     logger.addHandler(console_handler)
     
     # S3 handler
-    s3_handler = S3Handler(
-        bucket=settings.aws.storage.LOGS_BUCKET,
-        prefix='application_logs'
-    )
+    if settings.logging.LOG_S3_BUFFERED:
+        s3_handler = BufferedS3Handler(
+            bucket=settings.aws.storage.LOGS_BUCKET,
+            prefix='application_logs',
+            max_batch_records=settings.logging.LOG_S3_BATCH_MAX_RECORDS,
+            max_batch_bytes=settings.logging.LOG_S3_BATCH_MAX_BYTES,
+            flush_interval=settings.logging.LOG_S3_FLUSH_INTERVAL,
+            queue_size=settings.logging.LOG_S3_QUEUE_SIZE,
+            spill_dir=settings.logging.LOG_S3_SPILL_DIR
+        )
+    else:
+        s3_handler = S3Handler(
+            bucket=settings.aws.storage.LOGS_BUCKET,
+            prefix='application_logs'
+        )
     s3_handler.setLevel(logging.INFO)
     logger.addHandler(s3_handler)
     
@@ -0,0 +1,224 @@
+# backend/core/registry.py
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Factory = Callable[[], Any]
+CloseHook = Callable[[Any], Optional[Awaitable[None]]]
+StartHook = Callable[[Any], Optional[Awaitable[None]]]
+
+class ServiceRegistry:
+    """Process-wide services constructed on first use
+
+    Modules register a factory per service instead of building engines,
+    clients and models at import time. A service is built the first time it
+    is requested (``get`` or attribute access on a ``proxy``), or ahead of
+    traffic by ``warm_up``, which runs the pending factories concurrently in
+    worker threads. Every construction is timed; ``report`` returns the
+    per-component startup profile.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Factory] = {}
+        self._close_hooks: Dict[str, CloseHook] = {}
+        self._start_hooks: Dict[str, StartHook] = {}
+        self._warm: Dict[str, bool] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._building = threading.local()
+        self.timings: Dict[str, Dict[str, Any]] = {}
+
+    def register(
+        self,
+        name: str,
+        factory: Factory,
+        warm: bool = True,
+        close: Optional[CloseHook] = None,
+        start: Optional[StartHook] = None
+    ):
+        """Register (or replace) the factory for ``name``
+
+        ``warm`` services are built by ``warm_up``; the rest only on first
+        use. ``start`` is called with the instance on the event loop by
+        ``start``, ``close`` with the instance on ``shutdown``.
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._warm[name] = warm
+            self._locks.setdefault(name, threading.Lock())
+            if close is not None:
+                self._close_hooks[name] = close
+            else:
+                self._close_hooks.pop(name, None)
+            if start is not None:
+                self._start_hooks[name] = start
+            else:
+                self._start_hooks.pop(name, None)
+            self._instances.pop(name, None)
+            self.timings.pop(name, None)
+
+    def override(self, name: str, instance: Any):
+        """Use a ready-made instance, e.g. a local stand-in"""
+        with self._lock:
+            self._locks.setdefault(name, threading.Lock())
+            self._instances[name] = instance
+            self.timings[name] = {"seconds": 0.0, "phase": "override"}
+
+    def is_ready(self, name: str) -> bool:
+        return name in self._instances
+
+    def get(self, name: str) -> Any:
+        """Return the service, building it on first call"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        return self._build(name, phase="first use")
+
+    def proxy(self, name: str) -> "ServiceProxy":
+        """Module-level handle that resolves the service on attribute access"""
+        return ServiceProxy(self, name)
+
+    def _build(self, name: str, phase: str) -> Any:
+        if name not in self._factories and name not in self._instances:
+            raise KeyError(f"No service registered under: {name}")
+
+        building = getattr(self._building, "names", None)
+        if building is None:
+            building = self._building.names = []
+        if name in building:
+            raise RuntimeError(
+                f"Circular service dependency: {' -> '.join(building + [name])}"
+            )
+
+        with self._locks[name]:
+            # Another thread may have finished while we waited on the lock
+            if name in self._instances:
+                return self._instances[name]
+
+            building.append(name)
+            start = time.perf_counter()
+            try:
+                instance = self._factories[name]()
+            except Exception as e:
+                self.timings[name] = {
+                    "seconds": time.perf_counter() - start,
+                    "phase": phase,
+                    "error": str(e)
+                }
+                raise
+            finally:
+                building.pop()
+
+            self.timings[name] = {
+                "seconds": time.perf_counter() - start,
+                "phase": phase,
+                "thread": threading.current_thread().name
+            }
+            self._instances[name] = instance
+            logger.info(f"Service {name} ready in {self.timings[name]['seconds']:.3f}s ({phase})")
+            return instance
+
+    async def warm_up(
+        self,
+        names: Optional[Iterable[str]] = None,
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Build pending services concurrently and return the startup report
+
+        Failures are logged, not raised: a service that could not be built
+        is retried on its first use.
+        """
+        if names is None:
+            names = [name for name, warm in self._warm.items() if warm]
+        pending = [name for name in names if not self.is_ready(name)]
+
+        start = time.perf_counter()
+        tasks = [
+            asyncio.create_task(asyncio.to_thread(self._build, name, "warm-up"))
+            for name in pending
+        ]
+        if tasks:
+            done, not_done = await asyncio.wait(tasks, timeout=timeout)
+            for name, task in zip(pending, tasks):
+                if task in not_done:
+                    logger.error(f"Service {name} still warming up after {timeout}s")
+                elif task.exception() is not None:
+                    logger.error(f"Failed to warm up service {name}: {task.exception()}")
+
+        report = self.report()
+        logger.info(
+            f"Service warm-up finished in {time.perf_counter() - start:.3f}s: "
+            + ", ".join(f"{row['name']}={row['seconds']:.3f}s" for row in report)
+        )
+        return report
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Per-service construction times, slowest first"""
+        rows = [{"name": name, **timing} for name, timing in self.timings.items()]
+        for name in self._factories:
+            if name not in self.timings:
+                rows.append({"name": name, "seconds": 0.0, "phase": "not built"})
+        return sorted(rows, key=lambda row: row["seconds"], reverse=True)
+
+    async def start(self):
+        """Build the services with start hooks and run the hooks on this loop
+
+        For services that must run without waiting for traffic, such as
+        background workers.
+        """
+        for name, hook in list(self._start_hooks.items()):
+            try:
+                result = hook(self.get(name))
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Failed to start service {name}: {e}")
+
+    async def shutdown(self):
+        """Run close hooks for built services and forget the instances"""
+        for name, hook in list(self._close_hooks.items()):
+            instance = self._instances.get(name)
+            if instance is None:
+                continue
+            try:
+                result = hook(instance)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Failed to close service {name}: {e}")
+        self.reset()
+
+    def reset(self, name: Optional[str] = None):
+        """Drop built instances so the next use builds them again"""
+        with self._lock:
+            names = [name] if name else list(self._instances)
+            for key in names:
+                self._instances.pop(key, None)
+                self.timings.pop(key, None)
+
+class ServiceProxy:
+    """Stand-in for a registry service that is built on first attribute access"""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._registry.get(self._name), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self._registry.get(self._name), attr, value)
+
+    def __repr__(self) -> str:
+        state = "ready" if self._registry.is_ready(self._name) else "lazy"
+        return f"<ServiceProxy {self._name} ({state})>"
+
+registry = ServiceRegistry()
@@ -1,12 +1,14 @@
 # backend/models/assessment_model.py
 
-from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 from typing import Dict, Any, List
 import enum
 
+from backend.utils.scoring import GAD7, PHQ9
+
 Base = declarative_base()
 
 class AssessmentType(enum.Enum):
@@ -16,10 +18,28 @@ class AssessmentType(enum.Enum):
     RDOC = "RDoC"
     CUSTOM = "CUSTOM"
 
+# Keys of ``Assessment.to_dict``, selectable with ``fields=`` on history reads
+ASSESSMENT_FIELDS = (
+    "id",
+    "session_id",
+    "timestamp",
+    "assessment_type",
+    "scores",
+    "total_score",
+    "severity_level",
+    "rdoc_domains",
+    "rdoc_constructs",
+    "llm_analysis"
+)
+
 class Assessment(Base):
     """Assessment Database Model"""
     
     __tablename__ = "assessments"
+    __table_args__ = (
+        # History reads filter by session and walk by time
+        Index("idx_assessments_session_timestamp", "session_id", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String, index=True)
@@ -75,16 +95,7 @@ class PHQ9Assessment(Base):
     
     @staticmethod
     def calculate_severity(total_score: int) -> str:
-        if total_score <= 4:
-            return "Minimal"
-        elif total_score <= 9:
-            return "Mild"
-        elif total_score <= 14:
-            return "Moderate"
-        elif total_score <= 19:
-            return "Moderately Severe"
-        else:
-            return "Severe"
+        return PHQ9.severity(total_score)
 
 class GAD7Assessment(Base):
     """GAD-7 Specific Assessment Model"""
@@ -103,11 +114,4 @@ class GAD7Assessment(Base):
     
     @staticmethod
     def calculate_severity(total_score: int) -> str:
-        if total_score <= 4:
-            return "Minimal"
-        elif total_score <= 9:
-            return "Mild"
-        elif total_score <= 14:
-            return "Moderate"
-        else:
-            return "Severe"
\ No newline at end of file
+        return GAD7.severity(total_score)
\ No newline at end of file
@@ -1,28 +1,46 @@
 # backend/models/biomarker_model.py
 
-from sqlalchemy import Column, Integer, String, Float, JSON, DateTime
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Float,
+    JSON,
+    DateTime,
+    Index,
+    UniqueConstraint
+)
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 from typing import Dict, Any
 
+from backend.models.types import FeatureVector
+
 Base = declarative_base()
 
+def _vector_list(vector):
+    return None if vector is None else vector.tolist()
+
 class BiomarkerRecord(Base):
     """Biomarker Database Model"""
     
     __tablename__ = "biomarker_records"
+    __table_args__ = (
+        # Metric reads filter by session and walk by time
+        Index("idx_biomarker_records_session_timestamp", "session_id", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     # Facial Biomarkers
-    facial_features = Column(JSON)
+    facial_features = Column(FeatureVector("float32"))
     facial_action_units = Column(JSON)
     facial_emotions = Column(JSON)
     
     # Vocal Biomarkers
-    vocal_features = Column(JSON)
+    vocal_features = Column(FeatureVector("float32"))
     vocal_prosody = Column(JSON)
     vocal_quality = Column(JSON)
     
@@ -37,13 +55,67 @@ class BiomarkerRecord(Base):
             "id": self.id,
             "session_id": self.session_id,
             "timestamp": self.timestamp.isoformat(),
-            "facial_features": self.facial_features,
+            "facial_features": _vector_list(self.facial_features),
             "facial_action_units": self.facial_action_units,
             "facial_emotions": self.facial_emotions,
-            "vocal_features": self.vocal_features,
+            "vocal_features": _vector_list(self.vocal_features),
             "vocal_prosody": self.vocal_prosody,
             "vocal_quality": self.vocal_quality,
             "arousal_level": self.arousal_level,
             "valence_level": self.valence_level,
             "stress_level": self.stress_level
-        }
\ No newline at end of file
+        }
+
+class _RollupColumns:
+    """Per-session aggregates over one time bucket
+    
+    Counts, sums, sums of squares, minima and maxima are mergeable, so a new
+    record updates its bucket in place and any window of buckets reduces to
+    exact means and standard deviations. ``mapping_stats`` holds
+    ``[count, sum, sum_of_squares]`` per key of each JSON mapping column
+    (emotions, action units, prosody, voice quality).
+    """
+    
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String, nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    record_count = Column(Integer, nullable=False, default=0)
+    
+    arousal_sum = Column(Float, nullable=False, default=0.0)
+    arousal_sumsq = Column(Float, nullable=False, default=0.0)
+    arousal_min = Column(Float)
+    arousal_max = Column(Float)
+    
+    valence_sum = Column(Float, nullable=False, default=0.0)
+    valence_sumsq = Column(Float, nullable=False, default=0.0)
+    valence_min = Column(Float)
+    valence_max = Column(Float)
+    
+    stress_sum = Column(Float, nullable=False, default=0.0)
+    stress_sumsq = Column(Float, nullable=False, default=0.0)
+    stress_min = Column(Float)
+    stress_max = Column(Float)
+    
+    mapping_stats = Column(JSON)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Bucket start, so rollups can stand in for records in time helpers"""
+        return self.bucket_start
+
+class BiomarkerHourlyRollup(_RollupColumns, Base):
+    """Hourly biomarker rollup"""
+    
+    __tablename__ = "biomarker_rollups_hourly"
+    __table_args__ = (
+        UniqueConstraint("session_id", "bucket_start", name="uq_biomarker_rollups_hourly"),
+    )
+
+class BiomarkerDailyRollup(_RollupColumns, Base):
+    """Daily biomarker rollup"""
+    
+    __tablename__ = "biomarker_rollups_daily"
+    __table_args__ = (
+        UniqueConstraint("session_id", "bucket_start", name="uq_biomarker_rollups_daily"),
+    )
@@ -0,0 +1,101 @@
+# backend/models/types.py
+
+import json
+import struct
+from typing import Any, Optional, Union
+
+import numpy as np
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+ARRAY_MAGIC = b"NDA1"
+
+# magic, dtype code, ndim, header length (shape follows as uint32s)
+_HEADER = struct.Struct("<4sBBH")
+_ALIGNMENT = 8
+
+_DTYPE_CODES = {
+    np.dtype("<f2"): 1,
+    np.dtype("<f4"): 2,
+    np.dtype("<f8"): 3
+}
+_CODE_DTYPES = {code: dtype for dtype, code in _DTYPE_CODES.items()}
+
+Blob = Union[bytes, bytearray, memoryview]
+
+def encode_array(array: Any, dtype: Union[str, np.dtype] = "<f4") -> bytes:
+    """Serialize an array as a little-endian blob with a dtype/shape header
+
+    The header is padded to 8 bytes so decoded arrays are aligned.
+    """
+    dtype = np.dtype(dtype).newbyteorder("<")
+    if dtype not in _DTYPE_CODES:
+        raise ValueError(f"Unsupported feature dtype: {dtype}")
+
+    array = np.ascontiguousarray(array, dtype=dtype)
+    header_size = _HEADER.size + 4 * array.ndim
+    header_size += -header_size % _ALIGNMENT
+
+    header = bytearray(header_size)
+    _HEADER.pack_into(header, 0, ARRAY_MAGIC, _DTYPE_CODES[dtype], array.ndim, header_size)
+    struct.pack_into(f"<{array.ndim}I", header, _HEADER.size, *array.shape)
+    return bytes(header) + array.tobytes()
+
+def is_legacy_blob(blob: Union[Blob, str]) -> bool:
+    """True for feature vectors still stored as JSON text"""
+    return isinstance(blob, str) or bytes(memoryview(blob)[:4]) != ARRAY_MAGIC
+
+def decode_array(blob: Union[Blob, str]) -> np.ndarray:
+    """Decode a blob written by ``encode_array`` without copying its data
+
+    The result is a read-only view of the buffer. Rows written before the
+    migration hold JSON text and are parsed into float32 arrays.
+    """
+    if is_legacy_blob(blob):
+        text = blob if isinstance(blob, str) else bytes(blob).decode("utf-8")
+        return np.asarray(json.loads(text), dtype=np.float32)
+
+    buffer = memoryview(blob)
+    _, code, ndim, header_size = _HEADER.unpack_from(buffer)
+    shape = struct.unpack_from(f"<{ndim}I", buffer, _HEADER.size)
+    return np.frombuffer(
+        buffer,
+        dtype=_CODE_DTYPES[code],
+        offset=header_size
+    ).reshape(shape)
+
+class FeatureVector(TypeDecorator):
+    """NumPy array column stored as a compact little-endian blob
+
+    Values are written as ``dtype`` (float32 by default, float16 halves the
+    size again) and read back zero-copy with ``np.frombuffer``.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, dtype: str = "float32", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        return encode_array(value, self.dtype)
+
+    def process_result_value(self, value: Any, dialect) -> Optional[np.ndarray]:
+        if value is None:
+            return None
+        return decode_array(value)
+
+    def compare_values(self, x: Any, y: Any) -> bool:
+        # Arrays compare elementwise; the ORM needs one answer
+        if x is None or y is None:
+            return x is y
+        return np.array_equal(x, y)
+
+    def result_processor(self, dialect, coltype):
+        # Bypass LargeBinary's bytes() copy: decode straight from the driver's
+        # buffer, and accept legacy rows that come back as text
+        return lambda value: self.process_result_value(value, dialect)
@@ -1,34 +1,189 @@
 # backend/services/aws_service.py
 
+import asyncio
+import io
+import shutil
+import time
+import uuid
+import zipfile
 import boto3
 import logging
-from botocore.exceptions import ClientError
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from backend.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Failures worth retrying: service errors, connection problems, local I/O
+RETRYABLE_ERRORS = (ClientError, BotoCoreError, OSError)
+
+class LocalS3Client:
+    """Filesystem stand-in for S3: ``root/<bucket>/<key>``
+
+    Implements the boto3 client calls AWSService makes and the
+    ``ObjectStore`` calls of the model registry, for local development and
+    benchmarks. Missing objects raise ``FileNotFoundError`` like a 404.
+    ``latency`` seconds are slept per call to mimic a network round trip;
+    ``fail_first`` makes that many calls raise first.
+    """
+
+    def __init__(self, root: str, latency: float = 0.0, fail_first: int = 0):
+        self.root = Path(root)
+        self.latency = latency
+        self.fail_first = fail_first
+
+    def _path(self, bucket: str, key: str) -> Path:
+        if self.fail_first > 0:
+            self.fail_first -= 1
+            raise ConnectionError("Simulated transfer failure")
+        time.sleep(self.latency)
+        return self.root / bucket / key
+
+    def upload_fileobj(self, fileobj, bucket: str, key: str, **kwargs):
+        path = self._path(bucket, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as file:
+            shutil.copyfileobj(fileobj, file)
+
+    def upload_file(self, file_path: str, bucket: str, key: str, **kwargs):
+        with open(file_path, "rb") as file:
+            self.upload_fileobj(file, bucket, key)
+
+    def download_file(self, bucket: str, key: str, file_path: str, **kwargs):
+        shutil.copyfile(self._path(bucket, key), file_path)
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        return {"Body": io.BytesIO(self.get_object_bytes(Bucket, Key))}
+
+    def get_object_bytes(self, bucket: str, key: str) -> bytes:
+        return self._path(bucket, key).read_bytes()
+
+    def download_object(self, bucket: str, key: str, path: str) -> None:
+        self.download_file(bucket, key, path)
+
+    def put_object_file(self, bucket: str, key: str, path: str) -> None:
+        self.upload_file(path, bucket, key)
+
+class ByteBudget:
+    """Async limit on the bytes held by in-flight work
+
+    ``acquire`` waits until ``nbytes`` more fit within ``capacity``; a
+    request larger than the whole budget runs once nothing else holds any.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.used = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _ready(self) -> asyncio.Condition:
+        # Created on first use, inside the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self, nbytes: int):
+        async with self._ready():
+            await self._ready().wait_for(
+                lambda: self.used == 0 or self.used + nbytes <= self.capacity
+            )
+            self.used += nbytes
+
+    async def release(self, nbytes: int):
+        async with self._ready():
+            self.used -= nbytes
+            self._ready().notify_all()
+
+def pack_biomarker_arrays(
+    facial_data: np.ndarray,
+    vocal_data: np.ndarray,
+    compresslevel: int = 1
+) -> bytes:
+    """Compressed ``.npz`` with ``facial`` and ``vocal`` arrays
+
+    Same layout as ``np.savez_compressed`` (``np.load`` reads it), but at
+    deflate level 1: raw frames and PCM gain little from higher levels,
+    which cost several times the CPU.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as archive:
+        for name, array in (("facial", facial_data), ("vocal", vocal_data)):
+            with archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+                np.lib.format.write_array(member, np.asanyarray(array), allow_pickle=False)
+    return buffer.getvalue()
+
 class AWSService:
-    """AWS Service Integration"""
+    """AWS Service Integration
     
-    def __init__(self):
-        self.s3_client = boto3.client(
+    S3 transfers run on a bounded thread pool, never on the event loop.
+    Large objects go through boto3's managed multipart transfers with
+    ``TransferConfig`` from settings.
+    """
+    
+    def __init__(self, s3_client: Any = None):
+        aws = settings.aws
+        self.transfer_config = TransferConfig(
+            multipart_threshold=aws.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=aws.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=aws.S3_MAX_CONCURRENCY,
+            use_threads=True
+        )
+        # Enough pooled connections for every worker's parts in flight
+        client_config = Config(
+            max_pool_connections=aws.S3_TRANSFER_WORKERS * aws.S3_MAX_CONCURRENCY
+        )
+        self.s3_client = s3_client or boto3.client(
             's3',
-            aws_access_key_id=settings.aws.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.aws.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.aws.AWS_REGION
+            aws_access_key_id=aws.ACCESS_KEY_ID,
+            aws_secret_access_key=aws.SECRET_ACCESS_KEY,
+            region_name=aws.REGION,
+            config=client_config
         )
         
         self.sagemaker_client = boto3.client(
             'sagemaker',
-            aws_access_key_id=settings.aws.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.aws.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.aws.AWS_REGION
+            aws_access_key_id=aws.ACCESS_KEY_ID,
+            aws_secret_access_key=aws.SECRET_ACCESS_KEY,
+            region_name=aws.REGION
+        )
+        
+        self.transfer_executor = ThreadPoolExecutor(
+            max_workers=aws.S3_TRANSFER_WORKERS,
+            thread_name_prefix="s3-transfer"
         )
+        self._pending: Set[asyncio.Task] = set()
+        self._pending_slots: Optional[asyncio.Semaphore] = None
+        self._pending_bytes = ByteBudget(aws.S3_MAX_PENDING_UPLOAD_BYTES)
+        self.stats: Dict[str, float] = {
+            "uploads": 0,
+            "failed_uploads": 0,
+            "retries": 0,
+            "bytes_uploaded": 0,
+            "upload_seconds": 0.0
+        }
+    
+    async def _run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on the transfer pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.transfer_executor, partial(fn, *args, **kwargs))
     
     async def upload_file(self, file_path: str, bucket: str, object_name: str):
         """Upload a file to S3"""
         try:
-            self.s3_client.upload_file(file_path, bucket, object_name)
+            await self._run(
+                self.s3_client.upload_file,
+                file_path,
+                bucket,
+                object_name,
+                Config=self.transfer_config
+            )
             logger.info(f"Successfully uploaded {file_path} to {bucket}/{object_name}")
             return True
         except ClientError as e:
@@ -38,9 +193,134 @@ class AWSService:
     async def download_file(self, bucket: str, object_name: str, file_path: str):
         """Download a file from S3"""
         try:
-            self.s3_client.download_file(bucket, object_name, file_path)
+            await self._run(
+                self.s3_client.download_file,
+                bucket,
+                object_name,
+                file_path,
+                Config=self.transfer_config
+            )
             logger.info(f"Successfully downloaded {bucket}/{object_name} to {file_path}")
             return True
         except ClientError as e:
             logger.error(f"Error downloading file from S3: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    async def upload_bytes(self, data: bytes, bucket: str, key: str, retry: bool = True):
+        """Upload an in-memory object, retrying with backoff when ``retry``
+        
+        Raises the last error once attempts are exhausted.
+        """
+        attempts = settings.aws.S3_UPLOAD_MAX_ATTEMPTS if retry else 1
+        for attempt in range(1, attempts + 1):
+            start = time.perf_counter()
+            try:
+                await self._run(
+                    self.s3_client.upload_fileobj,
+                    io.BytesIO(data),
+                    bucket,
+                    key,
+                    Config=self.transfer_config
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt == attempts:
+                    raise
+                self.stats["retries"] += 1
+                delay = settings.aws.S3_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                logger.warning(f"Upload of {bucket}/{key} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            self.stats["uploads"] += 1
+            self.stats["bytes_uploaded"] += len(data)
+            self.stats["upload_seconds"] += time.perf_counter() - start
+            return
+    
+    async def upload_biomarker_data(
+        self,
+        session_id: str,
+        facial_data: np.ndarray,
+        vocal_data: np.ndarray,
+        window_index: Optional[int] = None,
+        wait: bool = False
+    ) -> str:
+        """Store one window's raw facial and vocal arrays as a compressed .npz
+        
+        Returns the object key. Unless ``wait``, the arrays are copied (the
+        caller may reuse their buffers) and packing and upload continue in
+        the background with retries. At most ``S3_MAX_PENDING_UPLOADS`` run
+        at once, holding at most ``S3_MAX_PENDING_UPLOAD_BYTES`` of copies;
+        further calls wait until both allow them.
+        """
+        now = datetime.utcnow()
+        window = f"w{window_index:06d}-" if window_index is not None else ""
+        key = (
+            f"biomarkers/{session_id}/{now.strftime('%Y/%m/%d')}/"
+            f"{window}{now.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.npz"
+        )
+        bucket = settings.aws.storage.DATA_BUCKET
+        
+        if wait:
+            body = await self._run(pack_biomarker_arrays, facial_data, vocal_data)
+            await self.upload_bytes(body, bucket, key)
+            return key
+        
+        if self._pending_slots is None:
+            self._pending_slots = asyncio.Semaphore(settings.aws.S3_MAX_PENDING_UPLOADS)
+        nbytes = facial_data.nbytes + vocal_data.nbytes
+        await self._pending_slots.acquire()
+        try:
+            await self._pending_bytes.acquire(nbytes)
+        except BaseException:
+            self._pending_slots.release()
+            raise
+        facial_copy, vocal_copy = np.array(facial_data), np.array(vocal_data)
+        
+        async def upload():
+            try:
+                body = await self._run(pack_biomarker_arrays, facial_copy, vocal_copy)
+                await self.upload_bytes(body, bucket, key)
+            except Exception as e:
+                self.stats["failed_uploads"] += 1
+                logger.error(f"Error uploading biomarker data {bucket}/{key}: {e}")
+            finally:
+                await self._pending_bytes.release(nbytes)
+                self._pending_slots.release()
+        
+        task = asyncio.create_task(upload())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return key
+    
+    async def flush(self):
+        """Wait for background uploads started so far"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending))
+    
+    def transfer_stats(self) -> Dict[str, float]:
+        """Upload counters and throughput for monitoring"""
+        stats = dict(self.stats)
+        stats["pending_uploads"] = len(self._pending)
+        stats["pending_upload_bytes"] = self._pending_bytes.used
+        stats["upload_mb_per_second"] = (
+            stats["bytes_uploaded"] / 2 ** 20 / stats["upload_seconds"]
+            if stats["upload_seconds"] else 0.0
+        )
+        return stats
+    
+    async def aclose(self):
+        """Finish background uploads and stop the transfer pool"""
+        await self.flush()
+        self.transfer_executor.shutdown(wait=True)
+    
+    def get_object_bytes(self, bucket: str, key: str) -> bytes:
+        """Read a small object; raises ClientError when missing"""
+        response = self.s3_client.get_object(Bucket=bucket, Key=key)
+        return response["Body"].read()
+    
+    def download_object(self, bucket: str, key: str, path: str):
+        """Download an object to ``path``; raises ClientError on failure"""
+        self.s3_client.download_file(bucket, key, path, Config=self.transfer_config)
+    
+    def put_object_file(self, bucket: str, key: str, path: str):
+        """Upload ``path`` as an object; raises ClientError on failure"""
+        self.s3_client.upload_file(path, bucket, key, Config=self.transfer_config)
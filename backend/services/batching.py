@@ -0,0 +1,184 @@
+# backend/services/batching.py
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class _PendingRequest:
+    tensor: torch.Tensor
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def size(self) -> int:
+        return self.tensor.shape[0]
+
+    @property
+    def key(self) -> Hashable:
+        # Requests batch together only when their rows have the same shape
+        return tuple(self.tensor.shape[1:]), self.tensor.dtype
+
+class MicroBatcher:
+    """Dynamic micro-batching in front of a batched inference function
+
+    Concurrent ``submit`` calls are collected until ``max_batch_size`` rows
+    are queued or the oldest request has waited ``max_latency_ms``. The
+    tensors are concatenated along dim 0, run through ``batch_fn`` in a
+    single call on a worker thread, and the output rows are scattered back
+    to each awaiting caller.
+
+    Each submitted tensor carries its own leading batch dimension, so a
+    request may contribute several rows (e.g. all frames of a window).
+    Only requests whose rows share a shape and dtype are batched together;
+    nothing is padded, so a request's output never depends on which other
+    requests shared its batch. Others are set aside for a later batch.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[torch.Tensor], torch.Tensor],
+        max_batch_size: int = 32,
+        max_latency_ms: float = 5.0,
+        name: str = "batcher",
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self.name = name
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=name
+        )
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Requests dequeued for a batch they could not join, oldest first
+        self._carried: Deque[_PendingRequest] = deque()
+        self.stats: Dict[str, int] = {"batches": 0, "requests": 0, "rows": 0}
+
+    async def submit(self, tensor: torch.Tensor) -> torch.Tensor:
+        """Queue a tensor of shape (N, ...) and wait for its N output rows"""
+        if self._worker is None or self._worker.done():
+            self._start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(tensor, future))
+        return await future
+
+    def _start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """Stop the worker; queued requests are cancelled"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._carried:
+            self._carried.popleft().future.cancel()
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        carried = self._carried
+
+        while True:
+            first = carried.popleft() if carried else await self._queue.get()
+            batch = [first]
+            rows = first.size
+            deadline = first.enqueued_at + self.max_latency
+
+            for request in list(carried):
+                if request.key == first.key and rows + request.size <= self.max_batch_size:
+                    carried.remove(request)
+                    batch.append(request)
+                    rows += request.size
+
+            # Collect more requests until the batch is full or the budget is spent
+            while rows < self.max_batch_size:
+                if not self._queue.empty():
+                    # Already-queued requests join without waiting
+                    request = self._queue.get_nowait()
+                else:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if request.key != first.key:
+                    carried.append(request)
+                    continue
+                if rows + request.size > self.max_batch_size:
+                    carried.append(request)
+                    break
+                batch.append(request)
+                rows += request.size
+
+            batch = [request for request in batch if not request.future.cancelled()]
+            if not batch:
+                continue
+
+            try:
+                stacked = self._stack([request.tensor for request in batch])
+                outputs = await loop.run_in_executor(
+                    self._executor,
+                    self._infer,
+                    stacked
+                )
+            except Exception as e:
+                logger.error(f"{self.name}: batched inference failed: {e}")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            self._scatter(batch, outputs)
+
+    def _infer(self, stacked: torch.Tensor) -> Any:
+        with torch.inference_mode():
+            return self.batch_fn(stacked)
+
+    def _stack(self, tensors: List[torch.Tensor]) -> torch.Tensor:
+        """Concatenate same-shaped requests along dim 0"""
+        if len(tensors) == 1:
+            return tensors[0]
+        return torch.cat(tensors, dim=0)
+
+    def _scatter(self, batch: List[_PendingRequest], outputs: Any):
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(batch)
+
+        offset = 0
+        for request in batch:
+            result = _slice_rows(outputs, offset, offset + request.size)
+            offset += request.size
+            if not request.future.done():
+                request.future.set_result(result)
+        self.stats["rows"] += offset
+
+def _slice_rows(outputs: Any, start: int, stop: int) -> Any:
+    """Take rows [start, stop) from a tensor or a dict/tuple of tensors"""
+    if isinstance(outputs, torch.Tensor):
+        return outputs[start:stop]
+    if isinstance(outputs, dict):
+        return {key: _slice_rows(value, start, stop) for key, value in outputs.items()}
+    if isinstance(outputs, (list, tuple)):
+        return type(outputs)(_slice_rows(value, start, stop) for value in outputs)
+    raise TypeError(f"Unsupported batch output type: {type(outputs).__name__}")
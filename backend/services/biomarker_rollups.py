@@ -0,0 +1,259 @@
+# backend/services/biomarker_rollups.py
+
+import copy
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.models.biomarker_model import (
+    BiomarkerDailyRollup,
+    BiomarkerHourlyRollup,
+    BiomarkerRecord
+)
+from backend.utils.biomarker_aggregation import MAPPING_FIELDS, SCALAR_METRICS
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_MODELS = {
+    "hour": BiomarkerHourlyRollup,
+    "day": BiomarkerDailyRollup
+}
+ROLLUP_METRICS = tuple(name.replace("_level", "") for name in SCALAR_METRICS)
+
+# (resolution, session_id, bucket_start)
+BucketKey = Tuple[str, str, datetime]
+Stats = Dict[str, Any]
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Start of the bucket containing ``timestamp``"""
+    if resolution == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if resolution == "day":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup resolution: {resolution}")
+
+def empty_stats() -> Stats:
+    stats: Stats = {"record_count": 0, "mapping_stats": {}}
+    for metric in ROLLUP_METRICS:
+        stats[f"{metric}_sum"] = 0.0
+        stats[f"{metric}_sumsq"] = 0.0
+        stats[f"{metric}_min"] = None
+        stats[f"{metric}_max"] = None
+    return stats
+
+def _min(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    return b if a is None else a if b is None else min(a, b)
+
+def _max(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    return b if a is None else a if b is None else max(a, b)
+
+def add_record(stats: Stats, record: Any):
+    """Fold one record into bucket stats in place"""
+    stats["record_count"] += 1
+    for metric, column in zip(ROLLUP_METRICS, SCALAR_METRICS):
+        value = float(getattr(record, column))
+        stats[f"{metric}_sum"] += value
+        stats[f"{metric}_sumsq"] += value * value
+        stats[f"{metric}_min"] = _min(stats[f"{metric}_min"], value)
+        stats[f"{metric}_max"] = _max(stats[f"{metric}_max"], value)
+
+    for field in MAPPING_FIELDS:
+        mapping = getattr(record, field)
+        if not mapping:
+            continue
+        field_stats = stats["mapping_stats"].setdefault(field, {})
+        for key, value in mapping.items():
+            value = float(np.mean(value))
+            entry = field_stats.setdefault(key, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += value
+            entry[2] += value * value
+
+def merge_stats(target: Stats, other: Stats) -> Stats:
+    """Combine two bucket stats into a new one"""
+    merged = copy.deepcopy(target)
+    merged["record_count"] += other["record_count"]
+    for metric in ROLLUP_METRICS:
+        merged[f"{metric}_sum"] += other[f"{metric}_sum"]
+        merged[f"{metric}_sumsq"] += other[f"{metric}_sumsq"]
+        merged[f"{metric}_min"] = _min(merged[f"{metric}_min"], other[f"{metric}_min"])
+        merged[f"{metric}_max"] = _max(merged[f"{metric}_max"], other[f"{metric}_max"])
+
+    for field, field_stats in other["mapping_stats"].items():
+        merged_field = merged["mapping_stats"].setdefault(field, {})
+        for key, (count, total, sumsq) in field_stats.items():
+            entry = merged_field.setdefault(key, [0, 0.0, 0.0])
+            entry[0] += count
+            entry[1] += total
+            entry[2] += sumsq
+    return merged
+
+def summarize_records(
+    records: Iterable[Any],
+    resolutions: Sequence[str] = tuple(ROLLUP_MODELS)
+) -> Dict[BucketKey, Stats]:
+    """Bucket stats for every resolution, keyed by bucket"""
+    buckets: Dict[BucketKey, Stats] = {}
+    for record in records:
+        for resolution in resolutions:
+            key = (resolution, record.session_id, bucket_start(record.timestamp, resolution))
+            stats = buckets.get(key)
+            if stats is None:
+                stats = buckets[key] = empty_stats()
+            add_record(stats, record)
+    return buckets
+
+def _row_stats(row: Any) -> Stats:
+    stats = {name: getattr(row, name) for name in empty_stats()}
+    stats["mapping_stats"] = stats["mapping_stats"] or {}
+    return stats
+
+def _apply_stats(row: Any, stats: Stats):
+    for name, value in stats.items():
+        # Fresh objects so the JSON column registers as changed
+        setattr(row, name, copy.deepcopy(value))
+
+def _bucket_query(model: Any, session_id: str, start: datetime):
+    return select(model).where(
+        model.session_id == session_id,
+        model.bucket_start == start
+    ).with_for_update().execution_options(populate_existing=True)
+
+async def update_rollups(db: AsyncSession, records: Sequence[BiomarkerRecord]):
+    """Fold newly flushed records into their hourly and daily buckets
+
+    Runs in the caller's transaction, so rollups commit or roll back together
+    with the records. Bucket rows are locked while they are updated.
+    """
+    for (resolution, session_id, start), stats in summarize_records(records).items():
+        model = ROLLUP_MODELS[resolution]
+        row = (await db.execute(_bucket_query(model, session_id, start))).scalar_one_or_none()
+
+        if row is None:
+            try:
+                async with db.begin_nested():
+                    row = model(session_id=session_id, bucket_start=start)
+                    _apply_stats(row, stats)
+                    db.add(row)
+                continue
+            except IntegrityError:
+                # Another writer created the bucket first; merge into it
+                row = (await db.execute(_bucket_query(model, session_id, start))).scalar_one()
+
+        _apply_stats(row, merge_stats(_row_stats(row), stats))
+
+async def load_rollups(
+    db: AsyncSession,
+    session_id: str,
+    resolution: str,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None
+) -> List[Any]:
+    """Buckets overlapping [start_time, end_time], oldest first
+
+    Bounds are widened to whole buckets.
+    """
+    model = ROLLUP_MODELS[resolution]
+    query = select(model).where(model.session_id == session_id)
+    if start_time:
+        query = query.where(model.bucket_start >= bucket_start(start_time, resolution))
+    if end_time:
+        query = query.where(model.bucket_start <= end_time)
+    result = await db.execute(query.order_by(model.bucket_start))
+    return result.scalars().all()
+
+def _stored_rollups(session: Session, session_id: Optional[str]) -> Dict[BucketKey, Stats]:
+    stored = {}
+    for resolution, model in ROLLUP_MODELS.items():
+        query = select(model)
+        if session_id:
+            query = query.where(model.session_id == session_id)
+        for row in session.execute(query).scalars():
+            stored[(resolution, row.session_id, row.bucket_start)] = _row_stats(row)
+    return stored
+
+def _stats_equal(a: Stats, b: Stats, rel_tol: float) -> bool:
+    def close(x, y):
+        if x is None or y is None:
+            return x is y
+        return math.isclose(x, y, rel_tol=rel_tol, abs_tol=1e-9)
+
+    for name in a:
+        if name == "mapping_stats":
+            fields_a, fields_b = a[name] or {}, b[name] or {}
+            if fields_a.keys() != fields_b.keys():
+                return False
+            for field, keys in fields_a.items():
+                if keys.keys() != fields_b[field].keys():
+                    return False
+                for key, values in keys.items():
+                    if not all(map(close, values, fields_b[field][key])):
+                        return False
+        elif not close(a[name], b[name]):
+            return False
+    return True
+
+def check_rollups(
+    session: Session,
+    session_id: Optional[str] = None,
+    repair: bool = False,
+    batch_size: int = 5000,
+    rel_tol: float = 1e-9
+) -> Dict[str, Any]:
+    """Recompute rollups from raw records and compare them with stored ones
+
+    With ``repair`` the rollups in scope (one session, or all) are replaced
+    by the recomputed buckets when they differ.
+    """
+    query = select(
+        BiomarkerRecord.session_id,
+        BiomarkerRecord.timestamp,
+        *(getattr(BiomarkerRecord, name) for name in SCALAR_METRICS + MAPPING_FIELDS)
+    ).order_by(BiomarkerRecord.session_id, BiomarkerRecord.timestamp)
+    if session_id:
+        query = query.where(BiomarkerRecord.session_id == session_id)
+
+    rows = session.execute(query.execution_options(yield_per=batch_size))
+    expected = summarize_records(rows)
+    stored = _stored_rollups(session, session_id)
+
+    missing = [key for key in expected if key not in stored]
+    extra = [key for key in stored if key not in expected]
+    mismatched = [
+        key for key in expected
+        if key in stored and not _stats_equal(expected[key], stored[key], rel_tol)
+    ]
+    report = {
+        "buckets": len(expected),
+        "missing": len(missing),
+        "extra": len(extra),
+        "mismatched": len(mismatched),
+        "examples": [
+            {"resolution": r, "session_id": s, "bucket_start": b.isoformat()}
+            for r, s, b in (missing + extra + mismatched)[:10]
+        ],
+        "repaired": False
+    }
+
+    if repair and (missing or extra or mismatched):
+        for resolution, model in ROLLUP_MODELS.items():
+            statement = delete(model)
+            if session_id:
+                statement = statement.where(model.session_id == session_id)
+            session.execute(statement)
+        for (resolution, bucket_session, start), stats in expected.items():
+            row = ROLLUP_MODELS[resolution](session_id=bucket_session, bucket_start=start)
+            _apply_stats(row, stats)
+            session.add(row)
+        session.commit()
+        report["repaired"] = True
+        logger.info(f"Rebuilt biomarker rollups: {report}")
+
+    return report
@@ -0,0 +1,220 @@
+# backend/services/cohort_analytics.py
+
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Float, Integer, and_, case, cast, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Select
+
+from backend.models.assessment_model import Assessment
+from backend.models.biomarker_model import BiomarkerRecord
+
+BUCKETS = ("day", "week", "month", "all")
+
+# Metrics and grouping columns each source exposes
+SOURCES = {
+    "assessments": {
+        "table": Assessment.__table__,
+        "metrics": ("total_score",),
+        "groups": ("assessment_type", "severity_level")
+    },
+    "biomarkers": {
+        "table": BiomarkerRecord.__table__,
+        "metrics": ("stress_level", "arousal_level", "valence_level"),
+        "groups": ()
+    }
+}
+
+# count, mean, min, max, std, share (of the bucket's rows), p0-p100
+_PERCENTILE = re.compile(r"^p(\d{1,2}|100)$")
+SIMPLE_AGGREGATES = ("count", "mean", "min", "max", "std", "share")
+
+@dataclass
+class CohortQuery:
+    """An aggregate request over one source table
+
+    ``rolling`` adds ``rolling_mean``, the row-weighted mean of the last
+    ``rolling`` buckets of each group.
+    """
+
+    source: str
+    metric: str
+    aggregates: Sequence[str] = ("count", "mean")
+    bucket: str = "week"
+    group_by: Sequence[str] = ()
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    filters: Dict[str, str] = field(default_factory=dict)
+    rolling: Optional[int] = None
+
+    def validate(self):
+        """Raise ValueError on anything that is not a known column or aggregate"""
+        if self.source not in SOURCES:
+            raise ValueError(f"source must be one of {sorted(SOURCES)}")
+        source = SOURCES[self.source]
+        if self.metric not in source["metrics"]:
+            raise ValueError(f"metric must be one of {list(source['metrics'])}")
+        if self.bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of {list(BUCKETS)}")
+        for name in (*self.group_by, *self.filters):
+            if name not in source["groups"]:
+                raise ValueError(f"{name!r} is not a grouping column of {self.source}")
+        if not self.aggregates:
+            raise ValueError("At least one aggregate is required")
+        for aggregate in self.aggregates:
+            if aggregate not in SIMPLE_AGGREGATES and not _PERCENTILE.match(aggregate):
+                raise ValueError(f"Unknown aggregate {aggregate!r}")
+        if self.rolling is not None and (self.rolling < 1 or self.bucket == "all"):
+            raise ValueError("rolling needs a time bucket and a positive window")
+
+def _percentile(aggregate: str) -> float:
+    return int(aggregate[1:]) / 100
+
+def bucket_expression(column: ColumnElement, bucket: str, dialect: str) -> ColumnElement:
+    """Start of the day/week/month containing ``column``; weeks start Monday"""
+    if dialect == "postgresql":
+        return func.date_trunc(bucket, column)
+    # SQLite date functions: 'weekday 0' is the next Sunday (or the same day)
+    if bucket == "day":
+        return func.date(column)
+    if bucket == "week":
+        return func.date(column, "weekday 0", "-6 days")
+    return func.date(column, "start of month")
+
+def build_query(query: CohortQuery, dialect: str) -> Select:
+    """Compile ``query`` into one aggregate SELECT for ``dialect``
+
+    PostgreSQL uses ``date_trunc`` and ``percentile_cont``. Elsewhere
+    (SQLite) buckets come from date functions and percentiles from ranking
+    window functions, interpolated the same way as ``percentile_cont``.
+    Either way only the result rows leave the database.
+    """
+    table = SOURCES[query.source]["table"]
+    value = table.c[query.metric]
+    conditions = [value.isnot(None)]
+    if query.start_time:
+        conditions.append(table.c.timestamp >= query.start_time)
+    if query.end_time:
+        conditions.append(table.c.timestamp < query.end_time)
+    for name, wanted in query.filters.items():
+        conditions.append(table.c[name] == wanted)
+
+    keys = []
+    if query.bucket != "all":
+        keys.append(bucket_expression(table.c.timestamp, query.bucket, dialect).label("bucket"))
+    keys.extend(table.c[name].label(name) for name in query.group_by)
+
+    percentiles = [a for a in query.aggregates if _PERCENTILE.match(a)]
+    native = dialect == "postgresql"
+    base = select(*keys, value.label("value")).where(and_(*conditions))
+    if percentiles and not native:
+        # 0-based rank and size of each row's group, for interpolation
+        partition = [base.selected_columns[key.name] for key in keys]
+        base = select(
+            *base.selected_columns,
+            (func.row_number().over(partition_by=partition, order_by=value) - 1).label("rank"),
+            func.count().over(partition_by=partition).label("size")
+        ).where(and_(*conditions))
+    rows = base.subquery("cohort")
+
+    group_columns = [rows.c[key.name] for key in keys]
+    outputs: List[ColumnElement] = list(group_columns)
+    count = func.count(rows.c.value)
+    for aggregate in query.aggregates:
+        if aggregate == "count":
+            outputs.append(count.label("count"))
+        elif aggregate == "mean":
+            outputs.append(func.avg(rows.c.value).label("mean"))
+        elif aggregate == "min":
+            outputs.append(func.min(rows.c.value).label("min"))
+        elif aggregate == "max":
+            outputs.append(func.max(rows.c.value).label("max"))
+        elif aggregate == "std":
+            # Finished in Python: not every dialect has sqrt or stddev
+            outputs.append(func.sum(rows.c.value).label("_sum"))
+            outputs.append(func.sum(rows.c.value * rows.c.value).label("_sumsq"))
+            outputs.append(count.label("_count"))
+        elif aggregate == "share":
+            bucket_partition = [rows.c.bucket] if query.bucket != "all" else []
+            outputs.append(
+                (cast(count, Float) / func.sum(count).over(partition_by=bucket_partition)).label("share")
+            )
+        elif native:
+            p = _percentile(aggregate)
+            outputs.append(func.percentile_cont(p).within_group(rows.c.value).label(aggregate))
+        else:
+            p = _percentile(aggregate)
+            position = literal(p) * (rows.c.size - 1)
+            lower = cast(position, Integer)
+            fraction = position - lower
+            outputs.append(func.sum(case(
+                (rows.c.rank == lower, rows.c.value * (1 - fraction)),
+                (rows.c.rank == lower + 1, rows.c.value * fraction),
+                else_=0.0
+            )).label(aggregate))
+
+    if query.rolling:
+        window = dict(
+            partition_by=[rows.c[name] for name in query.group_by],
+            order_by=rows.c.bucket,
+            rows=(-(query.rolling - 1), 0)
+        )
+        outputs.append((
+            cast(func.sum(func.sum(rows.c.value)).over(**window), Float)
+            / func.sum(count).over(**window)
+        ).label("rolling_mean"))
+
+    statement = select(*outputs)
+    if group_columns:
+        statement = statement.group_by(*group_columns).order_by(*group_columns)
+    return statement
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def to_columns(query: CohortQuery, rows: Sequence[Any]) -> Dict[str, List[Any]]:
+    """Result rows as one list per output column"""
+    names = (["bucket"] if query.bucket != "all" else []) + list(query.group_by)
+    outputs = list(query.aggregates) + (["rolling_mean"] if query.rolling else [])
+    columns: Dict[str, List[Any]] = {name: [] for name in names + outputs}
+    for row in rows:
+        mapping = row._mapping
+        for name in names:
+            columns[name].append(_jsonable(mapping[name]))
+        for name in outputs:
+            if name == "std":
+                n, total, sumsq = mapping["_count"], mapping["_sum"], mapping["_sumsq"]
+                variance = (float(sumsq) - float(total) ** 2 / n) / (n - 1) if n > 1 else None
+                value = math.sqrt(max(variance, 0.0)) if variance is not None else None
+            else:
+                value = mapping[name]
+            columns[name].append(_jsonable(value))
+    return columns
+
+async def run_cohort_query(db: AsyncSession, query: CohortQuery) -> Dict[str, Any]:
+    """Validate, compile and run ``query``; columnar results"""
+    query.validate()
+    dialect = db.get_bind().dialect.name
+    start = time.perf_counter()
+    rows = (await db.execute(build_query(query, dialect))).all()
+    return {
+        "source": query.source,
+        "metric": query.metric,
+        "bucket": query.bucket,
+        "dialect": dialect,
+        "row_count": len(rows),
+        "columns": to_columns(query, rows),
+        "query_ms": round((time.perf_counter() - start) * 1e3, 2)
+    }
@@ -0,0 +1,76 @@
+# backend/services/container.py
+
+import asyncio
+from typing import Any, Dict, List
+
+from backend.core.config import settings
+from backend.core.registry import registry
+
+# Factories import their service modules lazily so importing an endpoint
+# module does not pull in langchain/sklearn/cv2 or touch the network.
+
+def _create_rag_system():
+    from backend.services.rag_service import RAGSystem
+    return RAGSystem()
+
+def _create_aws_service():
+    from backend.services.aws_service import AWSService
+    return AWSService()
+
+def _create_nvidia_service():
+    from backend.services.nvidia_service import NvidiaService
+    return NvidiaService()
+
+def _create_model_registry():
+    from backend.services.model_registry import ModelRegistry
+    if settings.MODEL_STORE_PATH:
+        from backend.services.aws_service import LocalS3Client
+        store = LocalS3Client(settings.MODEL_STORE_PATH)
+    else:
+        store = registry.get("aws_service")
+    return ModelRegistry(
+        store,
+        bucket=settings.aws.storage.MODELS_BUCKET,
+        cache_dir=settings.MODEL_CACHE_DIR,
+        max_bytes=settings.MODEL_CACHE_MAX_BYTES
+    )
+
+def _create_biomarker_preprocessor():
+    from backend.utils.preprocessing import BiomarkerPreprocessor
+    return BiomarkerPreprocessor(num_workers=settings.nvidia.PREPROCESS_WORKERS)
+
+async def _close_nvidia_service(service):
+    await asyncio.gather(
+        service.facial_batcher.close(),
+        service.vocal_batcher.close()
+    )
+
+registry.register("rag_system", _create_rag_system, close=lambda rag: rag.aclose())
+registry.register("aws_service", _create_aws_service, close=lambda aws: aws.aclose())
+registry.register("nvidia_service", _create_nvidia_service, close=_close_nvidia_service)
+registry.register("model_registry", _create_model_registry, close=lambda models: models.close())
+registry.register(
+    "biomarker_preprocessor",
+    _create_biomarker_preprocessor,
+    close=lambda preprocessor: preprocessor.close()
+)
+
+rag_system = registry.proxy("rag_system")
+aws_service = registry.proxy("aws_service")
+nvidia_service = registry.proxy("nvidia_service")
+model_registry = registry.proxy("model_registry")
+preprocessor = registry.proxy("biomarker_preprocessor")
+
+async def startup() -> List[Dict[str, Any]]:
+    """Warm up registered services concurrently and start background ones
+
+    Call from the app startup hook.
+    """
+    if settings.SERVICE_WARM_UP:
+        await registry.warm_up(timeout=settings.SERVICE_WARM_UP_TIMEOUT)
+    await registry.start()
+    return registry.report()
+
+async def shutdown():
+    """Close built services; call from the app shutdown hook"""
+    await registry.shutdown()
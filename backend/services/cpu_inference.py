@@ -0,0 +1,198 @@
+# backend/services/cpu_inference.py
+
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Iterable, Sequence
+
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger(__name__)
+
+CPU_RUNTIMES = ("torchscript", "onnx", "eager")
+
+# Layers dynamic int8 quantization applies to; convolutions stay float32
+QUANTIZABLE_LAYERS = {nn.Linear, nn.LSTM, nn.GRU}
+
+@dataclass
+class CompiledModel:
+    """A model prepared for CPU inference, callable like the original"""
+
+    name: str
+    runtime: str
+    quantized: bool
+    drift: float
+    forward: Callable[[torch.Tensor], torch.Tensor]
+
+    def __call__(self, tensor: torch.Tensor) -> torch.Tensor:
+        with torch.inference_mode():
+            return self.forward(tensor)
+
+def relative_drift(reference: torch.Tensor, output: torch.Tensor) -> float:
+    """Relative L2 error of ``output`` against ``reference``"""
+    reference = reference.float()
+    scale = torch.linalg.vector_norm(reference).item()
+    error = torch.linalg.vector_norm(output.float() - reference).item()
+    return error / scale if scale > 0 else error
+
+def available_cores() -> int:
+    """Cores this process may run on; all of them where affinity is unsupported"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def configure_threads(intra_op_threads: int = 0, inter_op_threads: int = 1):
+    """Set torch's intra-op and inter-op thread pools
+
+    ``intra_op_threads=0`` uses one thread per available core. The inter-op
+    pool can only be sized before torch first uses it, so later calls
+    leave it as is.
+    """
+    torch.set_num_threads(intra_op_threads or available_cores())
+    try:
+        torch.set_num_interop_threads(max(inter_op_threads, 1))
+    except RuntimeError:
+        logger.debug("Inter-op thread pool already started, keeping its size")
+
+def measure_drift(
+    compiled: CompiledModel,
+    model: nn.Module,
+    inputs: Iterable[torch.Tensor]
+) -> float:
+    """Worst relative error of ``compiled`` against eager ``model`` over ``inputs``"""
+    with torch.inference_mode():
+        return max(relative_drift(model(tensor), compiled(tensor)) for tensor in inputs)
+
+class CPUInferenceBackend:
+    """Export, quantize and run models on the CPU
+
+    Models are dynamically quantized to int8 (Linear/LSTM/GRU weights) and
+    exported to TorchScript or ONNX Runtime. Each compiled model is checked
+    against eager float32 on the example inputs; when the relative error
+    exceeds ``max_drift`` the unquantized export is used instead, and when
+    the export itself fails, eager mode.
+    """
+
+    def __init__(
+        self,
+        runtime: str = "torchscript",
+        quantize: bool = True,
+        intra_op_threads: int = 0,
+        inter_op_threads: int = 1,
+        max_drift: float = 0.05
+    ):
+        if runtime not in CPU_RUNTIMES:
+            raise ValueError(f"Unknown CPU runtime {runtime!r}, expected one of {CPU_RUNTIMES}")
+        self.runtime = runtime
+        self.quantize = quantize
+        self.intra_op_threads = intra_op_threads or available_cores()
+        self.inter_op_threads = inter_op_threads
+        self.max_drift = max_drift
+        configure_threads(self.intra_op_threads, self.inter_op_threads)
+
+    def compile(
+        self,
+        model: nn.Module,
+        example_inputs: Sequence[torch.Tensor],
+        name: str = "model"
+    ) -> CompiledModel:
+        """Prepare ``model`` for CPU inference, checking drift on ``example_inputs``
+
+        Inputs may differ in batch size (and sequence length); the first
+        one is used for tracing.
+        """
+        model = model.cpu().eval()
+        attempts = [(self.runtime, self.quantize)]
+        if self.quantize and self.runtime != "eager":
+            attempts.append((self.runtime, False))
+        if attempts[-1] != ("eager", False):
+            attempts.append(("eager", False))
+
+        for index, (runtime, quantize) in enumerate(attempts):
+            try:
+                forward = self._build(model, example_inputs[0], runtime, quantize)
+            except Exception as e:
+                logger.warning(f"{name}: {runtime} export failed ({e}), falling back")
+                continue
+            compiled = CompiledModel(name, runtime, quantize, 0.0, forward)
+            compiled.drift = measure_drift(compiled, model, example_inputs)
+            # Eager float32 is the last resort and is kept whatever its drift
+            if compiled.drift <= self.max_drift or index == len(attempts) - 1:
+                logger.info(
+                    f"{name}: CPU {runtime}{' int8' if quantize else ''}, "
+                    f"drift {compiled.drift:.2e}, {self.intra_op_threads} threads"
+                )
+                return compiled
+            logger.warning(
+                f"{name}: {runtime}{' int8' if quantize else ''} drift "
+                f"{compiled.drift:.2e} exceeds {self.max_drift:.2e}, falling back"
+            )
+        raise RuntimeError(f"{name}: no CPU runtime available")
+
+    def _build(
+        self,
+        model: nn.Module,
+        example: torch.Tensor,
+        runtime: str,
+        quantize: bool
+    ) -> Callable[[torch.Tensor], torch.Tensor]:
+        if runtime == "onnx":
+            return self._build_onnx(model, example, quantize)
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(
+                model,
+                QUANTIZABLE_LAYERS,
+                dtype=torch.qint8
+            )
+        if runtime == "eager":
+            return model
+        with torch.inference_mode():
+            traced = torch.jit.trace(model, example, check_trace=False)
+        return torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+    def _build_onnx(
+        self,
+        model: nn.Module,
+        example: torch.Tensor,
+        quantize: bool
+    ) -> Callable[[torch.Tensor], torch.Tensor]:
+        import onnxruntime
+
+        dynamic_axes = {"input": {0: "batch"}, "output": {0: "batch"}}
+        if example.dim() == 3:
+            dynamic_axes["input"][2] = "time"
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "model.onnx")
+            torch.onnx.export(
+                model,
+                (example,),
+                path,
+                input_names=["input"],
+                output_names=["output"],
+                dynamic_axes=dynamic_axes
+            )
+            if quantize:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                quantized_path = os.path.join(workdir, "model.int8.onnx")
+                quantize_dynamic(path, quantized_path, weight_type=QuantType.QInt8)
+                path = quantized_path
+            with open(path, "rb") as file:
+                model_bytes = file.read()
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = max(self.inter_op_threads, 1)
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = onnxruntime.InferenceSession(
+            model_bytes,
+            options,
+            providers=["CPUExecutionProvider"]
+        )
+
+        def forward(tensor: torch.Tensor) -> torch.Tensor:
+            (output,) = session.run(["output"], {"input": tensor.contiguous().numpy()})
+            return torch.from_numpy(output)
+
+        return forward
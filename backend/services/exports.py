@@ -0,0 +1,220 @@
+# backend/services/exports.py
+
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import JSON, DateTime, Float, Integer, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from backend.models.assessment_model import ASSESSMENT_FIELDS, Assessment
+from backend.models.biomarker_model import BiomarkerRecord
+from backend.models.types import FeatureVector
+
+FORMATS = ("ndjson", "arrow")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream"
+}
+
+# Fastest deflate level: about 5x the throughput of the default (6) for
+# roughly 10% larger output, so compression keeps up with the cursor
+GZIP_LEVEL = 1
+
+# Exported columns per source, in output order
+SOURCES = {
+    "assessments": (Assessment.__table__, ASSESSMENT_FIELDS),
+    "biomarkers": (
+        BiomarkerRecord.__table__,
+        tuple(column.name for column in BiomarkerRecord.__table__.columns)
+    )
+}
+
+def arrow_available() -> bool:
+    """True when pyarrow can be imported for ``format="arrow"``"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def export_query(
+    source: str,
+    session_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None
+) -> Select:
+    """Rows of ``source`` in a stable order
+
+    One session walks the (session_id, timestamp) index; a bulk export
+    walks the primary key.
+    """
+    table, fields = SOURCES[source]
+    query = select(*(table.c[name] for name in fields))
+    if session_id is not None:
+        query = query.where(table.c.session_id == session_id).order_by(table.c.timestamp, table.c.id)
+    else:
+        query = query.order_by(table.c.id)
+    if start_time:
+        query = query.where(table.c.timestamp >= start_time)
+    if end_time:
+        query = query.where(table.c.timestamp <= end_time)
+    return query
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+class NDJSONEncoder:
+    """One JSON object per row, newline-terminated"""
+
+    def __init__(self, columns: Sequence[Any]):
+        self.fields = [column.name for column in columns]
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        dumps = json.JSONEncoder(separators=(",", ":")).encode
+        lines = [
+            dumps({name: _json_value(value) for name, value in zip(self.fields, row)})
+            for row in rows
+        ]
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+    def close(self) -> bytes:
+        return b""
+
+class ArrowEncoder:
+    """Arrow IPC stream: the schema, then one record batch per fetch
+
+    Feature vectors become ``list<float32>`` columns and JSON columns hold
+    their JSON text.
+    """
+
+    def __init__(self, columns: Sequence[Any]):
+        import pyarrow as pa
+
+        self._pa = pa
+        self.fields = [column.name for column in columns]
+        self._kinds = [self._kind(column) for column in columns]
+        types = {
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "timestamp": pa.timestamp("us"),
+            "vector": pa.list_(pa.float32()),
+            "json": pa.string(),
+            "string": pa.string()
+        }
+        self.schema = pa.schema([(name, types[kind]) for name, kind in zip(self.fields, self._kinds)])
+        self._sink = io.BytesIO()
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    @staticmethod
+    def _kind(column: Any) -> str:
+        column_type = column.type
+        if isinstance(column_type, FeatureVector):
+            return "vector"
+        if isinstance(column_type, JSON):
+            return "json"
+        if isinstance(column_type, DateTime):
+            return "timestamp"
+        if isinstance(column_type, Integer):
+            return "int"
+        if isinstance(column_type, Float):
+            return "float"
+        return "string"
+
+    def _vector_array(self, values: List[Optional[np.ndarray]]):
+        pa = self._pa
+        lengths = np.fromiter((0 if v is None else v.size for v in values), dtype=np.int32, count=len(values))
+        offsets = np.zeros(len(values) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        present = [v.reshape(-1) for v in values if v is not None]
+        flat = np.concatenate(present).astype(np.float32, copy=False) if present else np.empty(0, np.float32)
+        # A null offset marks a null list
+        mask = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+        return pa.ListArray.from_arrays(
+            pa.array(offsets, mask=np.append(mask, False)),
+            pa.array(flat)
+        )
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def header(self) -> bytes:
+        return self._drain()
+
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        pa = self._pa
+        arrays = []
+        for index, (kind, field) in enumerate(zip(self._kinds, self.schema)):
+            values = [row[index] for row in rows]
+            if kind == "vector":
+                arrays.append(self._vector_array(values))
+            elif kind == "json":
+                arrays.append(pa.array(
+                    [None if v is None else json.dumps(v) for v in values],
+                    type=field.type
+                ))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        return self._drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._drain()
+
+ENCODERS = {"ndjson": NDJSONEncoder, "arrow": ArrowEncoder}
+
+async def stream_export(
+    db: AsyncSession,
+    query: Select,
+    format: str = "ndjson",
+    compress: bool = False,
+    batch_size: int = 2000
+) -> AsyncIterator[bytes]:
+    """Encoded chunks of ``query``'s rows, ``batch_size`` rows at a time
+
+    Rows come through a server-side cursor (``yield_per``), so memory stays
+    bounded by one batch however many rows match. ``compress`` wraps the
+    output in a gzip stream.
+    """
+    encoder = ENCODERS[format](list(query.selected_columns))
+    gzip = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+
+    def emit(data: bytes) -> bytes:
+        return gzip.compress(data) if gzip else data
+
+    chunk = emit(encoder.header())
+    if chunk:
+        yield chunk
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    try:
+        async for rows in result.partitions():
+            chunk = emit(encoder.encode(rows))
+            if chunk:
+                yield chunk
+    finally:
+        await result.close()
+    yield emit(encoder.close()) + (gzip.flush() if gzip else b"")
+
+def describe_export(source: str, format: str, compress: bool) -> Dict[str, str]:
+    """Media type and download file name of an export"""
+    return {
+        "media_type": "application/gzip" if compress else MEDIA_TYPES[format],
+        "filename": f"{source}.{format}" + (".gz" if compress else "")
+    }
@@ -0,0 +1,334 @@
+# backend/services/job_queue.py
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+class SQLiteJobQueue:
+    """Durable job queue stored in a local SQLite file
+
+    Local stand-in for a real broker: jobs survive restarts, a claim is an
+    atomic status transition so several workers (or processes) never run the
+    same job twice, and jobs whose lease expired while ``running`` (crashed
+    or hung worker) are claimed again, or failed once out of attempts.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 600.0):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                result TEXT,
+                error TEXT,
+                available_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, available_at)"
+        )
+        self.requeue_expired()
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        max_attempts: int = 3
+    ) -> str:
+        """Add a job and return its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, kind, payload, status, max_attempts, "
+                "available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), QUEUED, max_attempts, now, now, now)
+            )
+        return job_id
+
+    def enqueue_many(
+        self,
+        kind: str,
+        payloads: List[Dict[str, Any]],
+        max_attempts: int = 3
+    ) -> List[str]:
+        """Add several jobs in one transaction and return their ids in order"""
+        job_ids = [uuid.uuid4().hex for _ in payloads]
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT INTO jobs (id, kind, payload, status, max_attempts, "
+                    "available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (job_id, kind, json.dumps(payload), QUEUED, max_attempts, now, now, now)
+                        for job_id, payload in zip(job_ids, payloads)
+                    ]
+                )
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+        return job_ids
+
+    def claim(self, kinds: List[str]) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest available job of ``kinds`` to running
+
+        Running jobs whose lease expired are available again; those already
+        out of attempts are failed instead.
+        """
+        now = time.time()
+        placeholders = ",".join("?" for _ in kinds)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                    "WHERE status = ? AND available_at < ? AND attempts >= max_attempts",
+                    (FAILED, "lease expired", now, RUNNING, now)
+                )
+                row = self._db.execute(
+                    f"SELECT * FROM jobs WHERE ((status = ? AND available_at <= ?) "
+                    f"OR (status = ? AND available_at < ?)) "
+                    f"AND kind IN ({placeholders}) ORDER BY available_at LIMIT 1",
+                    (QUEUED, now, RUNNING, now, *kinds)
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+                self._db.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, "
+                    "available_at = ?, updated_at = ? WHERE id = ?",
+                    (RUNNING, now + self.lease_seconds, now, row["id"])
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        job = self._to_dict(row)
+        job["attempts"] += 1
+        job["status"] = RUNNING
+        return job
+
+    def complete(self, job_id: str, result: Any):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (SUCCEEDED, json.dumps(result, default=str), time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str, retry_delay: float) -> str:
+        """Record a failed attempt; requeue it unless attempts are exhausted"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+            status = QUEUED if row and row["attempts"] < row["max_attempts"] else FAILED
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, available_at = ?, updated_at = ? "
+                "WHERE id = ?",
+                (status, error, now + retry_delay, now, job_id)
+            )
+        return status
+
+    def release(self, job_id: str):
+        """Give a running job back to the queue without counting the attempt"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), "
+                "available_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (QUEUED, now, now, job_id, RUNNING)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def requeue_expired(self) -> int:
+        """Return running jobs whose lease expired (crashed worker) to the queue"""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? "
+                "WHERE status = ? AND available_at < ?",
+                (QUEUED, time.time(), RUNNING, time.time())
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+class JobWorkerPool:
+    """Async workers that run queued jobs with bounded concurrency and retries
+
+    Workers are started at app startup (the registry start hook) or, failing
+    that, on the first ``enqueue`` from a running event loop.
+    Failed jobs are retried with exponential backoff up to the job's
+    ``max_attempts``; waiters are woken as soon as a job finishes.
+    """
+
+    def __init__(
+        self,
+        queue: SQLiteJobQueue,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_backoff: float = 2.0,
+        poll_interval: float = 0.5
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._finished: Dict[str, asyncio.Event] = {}
+
+    def register(self, kind: str, handler: JobHandler):
+        """Register the coroutine that processes jobs of ``kind``"""
+        self._handlers[kind] = handler
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        job_id = self.queue.enqueue(kind, payload, max_attempts=self.max_attempts)
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def enqueue_many(self, kind: str, payloads: List[Dict[str, Any]]) -> List[str]:
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        job_ids = self.queue.enqueue_many(kind, payloads, max_attempts=self.max_attempts)
+        if job_ids:
+            self.start()
+            self._wakeup.set()
+        return job_ids
+
+    def start(self):
+        """Start the workers on the running loop if they are not running"""
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        if self._workers:
+            return
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            loop.create_task(self._work(), name=f"job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        # wait_for can swallow a cancel that lands as the wakeup fires, so
+        # idle workers also check the flag before waiting again
+        self._stopping = True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._stopping = False
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait until a job succeeds or fails for good, or the timeout passes"""
+        deadline = time.monotonic() + timeout
+        event = self._finished.setdefault(job_id, asyncio.Event())
+        try:
+            while True:
+                job = self.queue.get(job_id)
+                if job is None or job["status"] in (SUCCEEDED, FAILED):
+                    return job
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return job
+                # Jobs finished by other processes are seen on the next poll
+                try:
+                    await asyncio.wait_for(
+                        event.wait(),
+                        min(remaining, self.poll_interval)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if not event.is_set():
+                self._finished.pop(job_id, None)
+
+    async def _work(self):
+        kinds = list(self._handlers)
+        while not self._stopping:
+            job = self.queue.claim(kinds)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                result = await self._handlers[job["kind"]](job["payload"])
+            except asyncio.CancelledError:
+                # Shutdown is not the job's fault; hand it back untouched
+                self.queue.release(job["id"])
+                raise
+            except Exception as e:
+                delay = self.retry_backoff * 2 ** (job["attempts"] - 1)
+                status = self.queue.fail(job["id"], str(e), retry_delay=delay)
+                logger.error(
+                    f"Job {job['id']} ({job['kind']}) attempt {job['attempts']} "
+                    f"failed: {e}; {status}"
+                )
+                if status == QUEUED:
+                    continue
+            else:
+                self.queue.complete(job["id"], result)
+
+            event = self._finished.pop(job["id"], None)
+            if event is not None:
+                event.set()
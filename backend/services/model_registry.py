@@ -0,0 +1,261 @@
+# backend/services/model_registry.py
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+class ObjectStore(Protocol):
+    """What the registry needs from S3 (AWSService or aws_service.LocalS3Client)"""
+
+    def get_object_bytes(self, bucket: str, key: str) -> bytes: ...
+
+    def download_object(self, bucket: str, key: str, path: str) -> None: ...
+
+    def put_object_file(self, bucket: str, key: str, path: str) -> None: ...
+
+class ModelNotFoundError(KeyError):
+    """No manifest for the requested model name and version"""
+
+class ChecksumMismatchError(ValueError):
+    """A downloaded artifact does not match its manifest"""
+
+def _is_missing(error: Exception) -> bool:
+    """Whether a store error means the object does not exist"""
+    if isinstance(error, FileNotFoundError):
+        return True
+    # botocore ClientError
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+    return False
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ModelRegistry:
+    """Resolve ``name``/``version`` to model weights cached on local disk
+
+    The bucket holds ``models/<name>/<version>/manifest.json`` naming the
+    artifact file next to it with its SHA-256 and size. Artifacts are cached
+    under ``objects/<sha256>`` so identical weights are stored once, and
+    are checksummed after download, before being moved into place.
+    Versions are immutable, so manifests are cached too and a warm start
+    needs no network.
+
+    The cache directory may be shared by several worker processes: downloads
+    and eviction hold a file lock, and the least recently used artifacts
+    (by mtime, refreshed on every resolve) are evicted beyond ``max_bytes``.
+    Artifacts resolved by this process are never evicted by it.
+    """
+
+    def __init__(
+        self,
+        store: ObjectStore,
+        bucket: str,
+        cache_dir: str,
+        max_bytes: int = 10 * 1024 ** 3,
+        prefix: str = "models"
+    ):
+        self.store = store
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.max_bytes = max_bytes
+        self.root = Path(cache_dir)
+        self.objects = self.root / "objects"
+        self.manifests = self.root / "manifests"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.manifests.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.root / ".lock"
+        self._thread_lock = threading.Lock()
+        self._download_lock = threading.Lock()
+        self._pinned: set = set()
+        self._prefetches: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats: Dict[str, int] = {"hits": 0, "downloads": 0, "evictions": 0}
+
+    @contextmanager
+    def _locked(self):
+        with self._download_lock, open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _key(self, name: str, version: str, file: str) -> str:
+        return f"{self.prefix}/{name}/{version}/{file}"
+
+    def manifest(self, name: str, version: str) -> Dict[str, Any]:
+        """The artifact manifest of a model version, cached locally"""
+        cached = self.manifests / name / f"{version}.json"
+        if cached.exists():
+            return json.loads(cached.read_text())
+        try:
+            manifest = json.loads(
+                self.store.get_object_bytes(self.bucket, self._key(name, version, "manifest.json"))
+            )
+        except Exception as e:
+            if _is_missing(e):
+                raise ModelNotFoundError(f"{name}/{version}: {e}") from e
+            raise
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        temp = cached.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(manifest))
+        os.replace(temp, cached)
+        return manifest
+
+    def resolve(self, name: str, version: str, pin: bool = True) -> Path:
+        """Local path of the version's artifact, downloading it if needed
+        
+        Pinned artifacts are in use by this process and skipped by its
+        eviction.
+        """
+        manifest = self.manifest(name, version)
+        digest = manifest["sha256"]
+        path = self.objects / digest
+        if pin:
+            with self._thread_lock:
+                self._pinned.add(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Not cached, or evicted by another worker since; download below
+            pass
+        else:
+            self.stats["hits"] += 1
+            return path
+
+        with self._locked():
+            # Another process may have finished the download meanwhile
+            if not path.exists():
+                self._download(name, version, manifest, path)
+                self.stats["downloads"] += 1
+                self._evict(keep=digest)
+        return path
+
+    def _download(self, name: str, version: str, manifest: Dict[str, Any], path: Path):
+        handle, temp = tempfile.mkstemp(dir=self.objects, prefix=".download-")
+        os.close(handle)
+        try:
+            self.store.download_object(self.bucket, self._key(name, version, manifest["file"]), temp)
+            size = os.path.getsize(temp)
+            digest = file_sha256(temp)
+            if digest != manifest["sha256"] or size != manifest.get("size", size):
+                raise ChecksumMismatchError(
+                    f"{name}/{version}: expected sha256 {manifest['sha256']} "
+                    f"({manifest.get('size')} bytes), got {digest} ({size} bytes)"
+                )
+            os.chmod(temp, 0o444)
+            os.replace(temp, path)
+            logger.info(f"Cached model {name}/{version} ({size} bytes) as {digest[:12]}")
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    def _evict(self, keep: str):
+        entries = []
+        for entry in os.scandir(self.objects):
+            if entry.name.startswith("."):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.name))
+        total = sum(size for _, size, _ in entries)
+        with self._thread_lock:
+            pinned = set(self._pinned)
+        for _, size, digest in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if digest == keep or digest in pinned:
+                continue
+            # Processes that already mapped the file keep their pages
+            os.unlink(self.objects / digest)
+            total -= size
+            self.stats["evictions"] += 1
+            logger.info(f"Evicted cached model {digest[:12]} ({size} bytes)")
+
+    def verify(self, name: str, version: str) -> bool:
+        """Re-hash a cached artifact against its manifest"""
+        manifest = self.manifest(name, version)
+        path = self.objects / manifest["sha256"]
+        return path.exists() and file_sha256(str(path)) == manifest["sha256"]
+
+    def load(self, name: str, version: str, map_location: str = "cpu") -> Any:
+        """Load the version's weights memory-mapped from the cache
+
+        ``.pt``/``.pth`` state dicts go through ``torch.load(mmap=True)`` and
+        ``.npy`` arrays through ``np.load(mmap_mode="r")``, so worker
+        processes loading the same artifact share its page cache pages
+        instead of each holding a private copy.
+        """
+        path = self.resolve(name, version)
+        suffix = Path(self.manifest(name, version)["file"]).suffix
+        if suffix in (".pt", ".pth"):
+            import torch
+            return torch.load(path, map_location=map_location, mmap=True, weights_only=True)
+        if suffix == ".npy":
+            import numpy as np
+            return np.load(path, mmap_mode="r")
+        raise ValueError(f"Unsupported model artifact type {suffix!r}")
+
+    def prefetch(self, name: str, version: str) -> Future:
+        """Download a version in the background, e.g. the next release
+
+        Repeated calls for the same version share one download.
+        """
+        key = f"{name}/{version}"
+        with self._thread_lock:
+            future = self._prefetches.get(key)
+            if future is not None and not (future.done() and future.exception()):
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-prefetch")
+            # Not in use yet, so a prefetched version stays evictable
+            future = self._executor.submit(self.resolve, name, version, False)
+            self._prefetches[key] = future
+            return future
+
+    def publish(self, name: str, version: str, path: str) -> Dict[str, Any]:
+        """Upload an artifact and its manifest to the bucket"""
+        manifest = {
+            "file": Path(path).name,
+            "sha256": file_sha256(path),
+            "size": os.path.getsize(path)
+        }
+        self.store.put_object_file(self.bucket, self._key(name, version, manifest["file"]), path)
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+            json.dump(manifest, file)
+        try:
+            self.store.put_object_file(self.bucket, self._key(name, version, "manifest.json"), file.name)
+        finally:
+            os.unlink(file.name)
+        return manifest
+
+    def cached(self) -> List[Dict[str, Any]]:
+        """Cached artifacts, least recently used first"""
+        entries = [
+            {"sha256": entry.name, "size": entry.stat().st_size, "used_at": entry.stat().st_mtime}
+            for entry in os.scandir(self.objects)
+            if not entry.name.startswith(".")
+        ]
+        return sorted(entries, key=lambda entry: entry["used_at"])
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
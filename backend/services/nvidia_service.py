@@ -2,19 +2,190 @@
 
 import torch
 import logging
+import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence
 from backend.core.config import settings
+from backend.services.batching import MicroBatcher
+from backend.services.cpu_inference import CPUInferenceBackend
+from backend.utils.prosody import VoiceFeatureConfig, extract_voice_features
 
 logger = logging.getLogger(__name__)
 
+# Columns of the emotion head's output
+EMOTION_OUTPUTS = ("arousal", "valence", "stress")
+
+# Columns of the action unit head's output (FACS units, as OpenFace reports them)
+ACTION_UNITS = (
+    "AU01", "AU02", "AU04", "AU05", "AU06", "AU07", "AU09", "AU10", "AU12",
+    "AU14", "AU15", "AU17", "AU20", "AU23", "AU25", "AU26", "AU45"
+)
+
+Model = Callable[[torch.Tensor], torch.Tensor]
+
+class ModelNotLoadedError(RuntimeError):
+    """Inference was requested before its model was loaded"""
+
 class NvidiaService:
     """Nvidia GPU Service Integration"""
     
     def __init__(self):
-        self.device = torch.device(
-            "cuda" if torch.cuda.is_available() else "cpu"
+        self.backend = self._select_backend()
+        self.device = torch.device(self.backend)
+        self.cpu_inference: Optional[CPUInferenceBackend] = None
+        if self.backend == "cuda":
+            torch.cuda.set_device(int(settings.nvidia.CUDA_VISIBLE_DEVICES))
+        else:
+            self.cpu_inference = CPUInferenceBackend(
+                runtime=settings.nvidia.CPU_RUNTIME,
+                quantize=settings.nvidia.CPU_QUANTIZE,
+                intra_op_threads=settings.nvidia.CPU_INTRA_OP_THREADS,
+                inter_op_threads=settings.nvidia.CPU_INTER_OP_THREADS,
+                max_drift=settings.nvidia.CPU_MAX_DRIFT
+            )
+        
+        # Set by load_models
+        self.facial_model: Optional[Model] = None
+        self.vocal_model: Optional[Model] = None
+        self.emotion_model: Optional[Model] = None
+        self.action_unit_model: Optional[Model] = None
+        
+        # Concurrent requests share forward passes through these batchers
+        self.facial_batcher = MicroBatcher(
+            lambda batch: self.extract_facial_features(self.to_device(batch)),
+            max_batch_size=settings.nvidia.INFERENCE_MAX_BATCH_SIZE,
+            max_latency_ms=settings.nvidia.INFERENCE_MAX_LATENCY_MS,
+            name="facial-batcher"
+        )
+        self.vocal_batcher = MicroBatcher(
+            lambda batch: self.extract_vocal_features(self.to_device(batch)),
+            max_batch_size=settings.nvidia.INFERENCE_MAX_BATCH_SIZE,
+            max_latency_ms=settings.nvidia.INFERENCE_MAX_LATENCY_MS,
+            name="vocal-batcher"
         )
+        self.voice_config = VoiceFeatureConfig()
+    
+    @staticmethod
+    def _select_backend() -> str:
+        """``cuda`` or ``cpu`` from INFERENCE_BACKEND and what is available"""
+        requested = settings.nvidia.INFERENCE_BACKEND
+        if requested not in ("auto", "cuda", "cpu"):
+            raise ValueError(f"Unknown INFERENCE_BACKEND {requested!r}")
+        if requested == "cpu":
+            return "cpu"
         if torch.cuda.is_available():
-            torch.cuda.set_device(int(settings.nvidia.CUDA_VISIBLE_DEVICES))
+            return "cuda"
+        if requested == "cuda":
+            logger.warning("INFERENCE_BACKEND is cuda but no GPU is available, using CPU")
+        return "cpu"
+    
+    def optimize_model(
+        self,
+        model: torch.nn.Module,
+        example_inputs: Sequence[torch.Tensor],
+        name: str = "model"
+    ):
+        """Prepare a model for inference on the selected backend
+        
+        On a GPU this is ``setup_tensorrt``; on the CPU the model is
+        quantized and exported (see CPUInferenceBackend), with
+        ``example_inputs`` used for tracing and the drift check.
+        """
+        if self.cpu_inference is None:
+            return self.setup_tensorrt(model.to(self.device).eval())
+        return self.cpu_inference.compile(model, example_inputs, name)
+    
+    def to_device(self, tensor: torch.Tensor) -> torch.Tensor:
+        """Move a tensor to the inference device"""
+        return tensor.to(self.device, non_blocking=True)
+    
+    def load_models(
+        self,
+        facial: torch.nn.Module,
+        vocal: torch.nn.Module,
+        emotion: torch.nn.Module,
+        action_units: torch.nn.Module,
+        vocal_samples: int = 16000
+    ):
+        """Prepare the models through ``optimize_model`` and start serving them
+        
+        ``facial`` maps (N, 3, 224, 224) frames and ``vocal`` (N, 1, T)
+        audio to feature rows; ``emotion`` and ``action_units`` map facial
+        features to one column per ``EMOTION_OUTPUTS`` / ``ACTION_UNITS``
+        entry. ``vocal_samples`` is the clip length traced for export.
+        """
+        facial_example = torch.rand(1, 3, 224, 224)
+        vocal_example = torch.rand(1, 1, vocal_samples) * 2 - 1
+        with torch.inference_mode():
+            features = facial.cpu().eval()(facial_example)
+        
+        self.facial_model = self.optimize_model(facial, [facial_example], "facial")
+        self.vocal_model = self.optimize_model(vocal, [vocal_example], "vocal")
+        self.emotion_model = self.optimize_model(emotion, [features], "emotion")
+        self.action_unit_model = self.optimize_model(action_units, [features], "action_units")
+    
+    @staticmethod
+    def _require(model: Optional[Model], name: str) -> Model:
+        if model is None:
+            raise ModelNotLoadedError(f"No {name} model is loaded; call NvidiaService.load_models first")
+        return model
+    
+    def extract_facial_features(self, tensor: torch.Tensor) -> torch.Tensor:
+        """Facial feature rows of a (N, C, H, W) batch on the inference device"""
+        return self._require(self.facial_model, "facial")(tensor)
+    
+    def extract_vocal_features(self, tensor: torch.Tensor) -> torch.Tensor:
+        """Vocal feature rows of a (N, 1, T) batch on the inference device"""
+        return self._require(self.vocal_model, "vocal")(tensor)
+    
+    def _head_columns(
+        self,
+        model: Optional[Model],
+        name: str,
+        features: torch.Tensor,
+        columns: Sequence[str]
+    ) -> Dict[str, List[float]]:
+        with torch.inference_mode():
+            scores = self._require(model, name)(self.to_device(features)).float().cpu()
+        if scores.shape[-1] != len(columns):
+            raise ValueError(f"The {name} model returned {scores.shape[-1]} columns, expected {len(columns)}")
+        return {column: scores[:, i].tolist() for i, column in enumerate(columns)}
+    
+    def process_emotions(self, features: torch.Tensor) -> Dict[str, List[float]]:
+        """Arousal, valence and stress per row of facial features"""
+        return self._head_columns(self.emotion_model, "emotion", features, EMOTION_OUTPUTS)
+    
+    def process_action_units(self, features: torch.Tensor) -> Dict[str, List[float]]:
+        """Action unit intensities per row of facial features"""
+        return self._head_columns(self.action_unit_model, "action_units", features, ACTION_UNITS)
+    
+    async def extract_facial_features_batched(
+        self,
+        tensor: torch.Tensor
+    ) -> torch.Tensor:
+        """Extract facial features, micro-batched with concurrent requests"""
+        return await self.facial_batcher.submit(tensor)
+    
+    async def extract_vocal_features_batched(
+        self,
+        tensor: torch.Tensor
+    ) -> torch.Tensor:
+        """Extract vocal features, micro-batched with concurrent requests
+        
+        Only clips of the same length share a forward pass; nothing is padded.
+        """
+        return await self.vocal_batcher.submit(tensor)
+    
+    def process_prosody(
+        self,
+        audio: np.ndarray,
+        sample_rate: int = 16000
+    ) -> Dict[str, Dict[str, float]]:
+        """Prosody and voice quality of raw audio, computed on the CPU
+        
+        Returns ``{"prosody": {...}, "quality": {...}}``; see
+        ``extract_voice_features``. Call it off the event loop.
+        """
+        return extract_voice_features(audio, sample_rate, self.voice_config)
     
     def setup_tensorrt(self, model):
         """Setup TensorRT for model optimization"""
@@ -43,4 +214,8 @@ class NvidiaService:
                 "memory_allocated": torch.cuda.memory_allocated(),
                 "memory_cached": torch.cuda.memory_cached()
             }
-        return {"status": "GPU not available"}
\ No newline at end of file
+        return {
+            "status": "GPU not available",
+            "inference_backend": f"cpu/{settings.nvidia.CPU_RUNTIME}",
+            "threads": torch.get_num_threads()
+        }
\ No newline at end of file
@@ -1,46 +1,155 @@
 # backend/services/rag_service.py
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator
+import asyncio
 import anthropic
 import openai
 from langchain.embeddings import OpenAIEmbeddings
 from langchain.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from backend.core.cache import ResultCache, canonical_key
 from backend.core.config import settings
 from backend.core.logging import logger
+from backend.services.vector_index import PersistentVectorIndex
+
+CLAUDE_ANALYSIS_PROMPT = """
+        Based on the provided assessment data and RDoC framework context, 
+        provide a comprehensive analysis of the patient's mental health status.
+        
+        Assessment Data:
+        {assessment_data}
+        
+        RDoC Context:
+        {context}
+        
+        Please analyze:
+        1. Key symptoms and their severity
+        2. Relevant RDoC domains and constructs
+        3. Potential underlying mechanisms
+        4. Risk assessment
+        5. Treatment implications
+        """
+
+GPT4_RECOMMENDATIONS_PROMPT = """
+        Based on the assessment data, RDoC framework context and clinical
+        analysis below, recommend evidence-based next steps for treatment.
+        
+        Assessment Data:
+        {assessment_data}
+        
+        RDoC Context:
+        {context}
+        
+        Clinical Analysis:
+        {analysis}
+        
+        Please provide:
+        1. Prioritized treatment recommendations
+        2. Targeted RDoC domains for each recommendation
+        3. Monitoring and follow-up suggestions
+        """
 
 class RAGSystem:
     """Retrieval Augmented Behavioral Generative System"""
     
     def __init__(self):
-        self.anthropic_client = anthropic.Anthropic(
-            api_key=settings.ANTHROPIC_API_KEY
-        )
-        self.openai_client = openai.OpenAI(
-            api_key=settings.OPENAI_API_KEY
-        )
+        self._create_clients()
         
         # Initialize embeddings
-        self.embeddings = OpenAIEmbeddings()
+        self.embeddings = OpenAIEmbeddings(model=settings.rag.EMBEDDING_MODEL)
         
         # Load RDoC knowledge base
+        self.kb_fingerprint = ""
         self.rdoc_kb = self._load_rdoc_knowledge_base()
+        
+        # Cache analyses for repeated answer vectors; disabled, neither tier keeps any
+        enabled = settings.rag.RAG_CACHE_ENABLED
+        self.analysis_cache = ResultCache(
+            settings.rag.RAG_CACHE_PATH if enabled else None,
+            version=self._cache_version(),
+            max_memory_entries=settings.rag.RAG_CACHE_MEMORY_ENTRIES if enabled else 0,
+            max_disk_entries=settings.rag.RAG_CACHE_MAX_DISK_ENTRIES,
+            ttl_seconds=settings.rag.RAG_CACHE_TTL_SECONDS
+        )
+        self.analysis_cache.purge_stale()
+    
+    def _create_clients(self):
+        """Create async LLM clients; each keeps a pooled keep-alive connection set"""
+        self.anthropic_client = anthropic.AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.rag.ANTHROPIC_BASE_URL,
+            timeout=settings.rag.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.rag.LLM_MAX_RETRIES
+        )
+        self.openai_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.rag.OPENAI_BASE_URL,
+            timeout=settings.rag.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.rag.LLM_MAX_RETRIES
+        )
+    
+    async def aclose(self):
+        """Close pooled LLM connections"""
+        await asyncio.gather(
+            self.anthropic_client.close(),
+            self.openai_client.close()
+        )
+    
+    def _cache_version(self) -> str:
+        """Fingerprint of everything that shapes an analysis besides its input"""
+        return canonical_key({
+            "knowledge_base": self.kb_fingerprint,
+            "prompt_version": settings.rag.PROMPT_VERSION,
+            "prompts": [CLAUDE_ANALYSIS_PROMPT, GPT4_RECOMMENDATIONS_PROMPT],
+            "models": [settings.rag.CLAUDE_MODEL, settings.rag.GPT4_MODEL]
+        })
+    
+    def invalidate_cache(self):
+        """Drop cached analyses, e.g. after prompts or the knowledge base change"""
+        self.analysis_cache.clear()
+        self.analysis_cache.set_version(self._cache_version())
+    
+    @staticmethod
+    def _canonical_assessment(assessment_data: Dict[str, Any]) -> Dict[str, Any]:
+        """The fields of an assessment payload that shape its analysis
+        
+        Prompts are built from exactly this payload and the cache key hashes
+        it, so two payloads share a cache entry only when they would get the
+        same prompt. Raises ValueError unless every answer is an integer.
+        """
+        responses = assessment_data.get("responses") or {}
+        if not isinstance(responses, dict):
+            raise ValueError("responses must map item numbers to answers")
+        if not all(
+            isinstance(value, int) and not isinstance(value, bool)
+            for value in responses.values()
+        ):
+            raise ValueError("Responses must be integers")
+        return {
+            "type": assessment_data.get("type"),
+            "responses": {str(question): value for question, value in responses.items()},
+            "total_score": assessment_data.get("total_score"),
+            "severity": assessment_data.get("severity")
+        }
     
     def _load_rdoc_knowledge_base(self) -> FAISS:
-        """Load and index RDoC framework knowledge"""
+        """Load the RDoC vector index, embedding only new or changed chunks"""
         # Load RDoC documents
         rdoc_docs = self._load_rdoc_documents()
         
-        # Split documents
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
+        # Fingerprint the corpus so cached analyses follow knowledge base changes
+        self.kb_fingerprint = canonical_key(
+            [doc.page_content for doc in rdoc_docs]
         )
-        texts = text_splitter.split_documents(rdoc_docs)
         
-        # Create vector store
-        vector_store = FAISS.from_documents(texts, self.embeddings)
-        return vector_store
+        # Load the persisted index, re-embedding only what changed
+        self.rdoc_index = PersistentVectorIndex(
+            settings.rag.RAG_INDEX_DIR,
+            self.embeddings,
+            embedding_model=settings.rag.EMBEDDING_MODEL,
+            chunk_size=settings.rag.RAG_CHUNK_SIZE,
+            chunk_overlap=settings.rag.RAG_CHUNK_OVERLAP
+        )
+        return self.rdoc_index.load_or_build(rdoc_docs)
     
     async def analyze_assessment(
         self,
@@ -48,8 +157,14 @@ class RAGSystem:
     ) -> Dict[str, Any]:
         """Analyze assessment using RAG system"""
         
+        assessment_data = self._canonical_assessment(assessment_data)
+        cache_key = canonical_key(assessment_data)
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Retrieve relevant RDoC context
-        context = self._retrieve_rdoc_context(assessment_data)
+        context = await self._retrieve_rdoc_context(assessment_data)
         
         # Generate analysis using Claude
         claude_analysis = await self._generate_claude_analysis(
@@ -57,52 +172,150 @@ class RAGSystem:
             context
         )
         
-        # Generate recommendations using GPT-4
+        # Generate recommendations using GPT-4 (builds on the analysis)
         gpt4_recommendations = await self._generate_gpt4_recommendations(
             assessment_data,
             context,
             claude_analysis
         )
         
-        return {
+        analysis = {
             "rdoc_context": context,
             "claude_analysis": claude_analysis,
             "gpt4_recommendations": gpt4_recommendations
         }
+        return self.analysis_cache.set(cache_key, analysis)
     
-    async def _generate_claude_analysis(
+    async def stream_assessment_analysis(
         self,
-        assessment_data: Dict[str, Any],
-        context: str
-    ) -> Dict[str, Any]:
-        """Generate analysis using Claude"""
+        assessment_data: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Analyze assessment, yielding events as tokens arrive
         
-        prompt = f"""
-        Based on the provided assessment data and RDoC framework context, 
-        provide a comprehensive analysis of the patient's mental health status.
+        Yields ``{"event": ..., "data": ...}`` dicts: ``context`` once
+        retrieval completes, ``claude_delta`` and ``gpt4_delta`` text chunks,
+        then ``analysis`` with the same payload ``analyze_assessment`` returns.
+        """
+        assessment_data = self._canonical_assessment(assessment_data)
+        cache_key = canonical_key(assessment_data)
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            yield {"event": "analysis", "data": cached}
+            return
         
-        Assessment Data:
-        {assessment_data}
+        context = await self._retrieve_rdoc_context(assessment_data)
+        yield {"event": "context", "data": context}
         
-        RDoC Context:
-        {context}
+        claude_parts: List[str] = []
+        async with self.anthropic_client.messages.stream(
+            **self._claude_request(assessment_data, context)
+        ) as stream:
+            async for text in stream.text_stream:
+                claude_parts.append(text)
+                yield {"event": "claude_delta", "data": text}
+        claude_analysis = "".join(claude_parts)
         
-        Please analyze:
-        1. Key symptoms and their severity
-        2. Relevant RDoC domains and constructs
-        3. Potential underlying mechanisms
-        4. Risk assessment
-        5. Treatment implications
-        """
+        gpt4_parts: List[str] = []
+        stream = await self.openai_client.chat.completions.create(
+            **self._gpt4_request(assessment_data, context, claude_analysis),
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                text = chunk.choices[0].delta.content
+                gpt4_parts.append(text)
+                yield {"event": "gpt4_delta", "data": text}
         
-        response = await self.anthropic_client.messages.create(
-            model="claude-3-sonnet-20240229",
-            max_tokens=2000,
-            temperature=0.7,
-            messages=[{
+        analysis = {
+            "rdoc_context": context,
+            "claude_analysis": claude_analysis,
+            "gpt4_recommendations": "".join(gpt4_parts)
+        }
+        yield {"event": "analysis", "data": self.analysis_cache.set(cache_key, analysis)}
+    
+    async def _retrieve_rdoc_context(
+        self,
+        assessment_data: Dict[str, Any]
+    ) -> str:
+        """Retrieve RDoC passages relevant to the assessment"""
+        responses = assessment_data.get("responses") or {}
+        elevated = [str(question) for question, value in responses.items() if value >= 2]
+        query = (
+            f"{assessment_data.get('type')} assessment with "
+            f"{assessment_data.get('severity')} severity; "
+            f"elevated items: {', '.join(elevated) or 'none'}"
+        )
+        
+        # Query embedding is awaited; the FAISS search itself is in-memory
+        docs = await asyncio.wait_for(
+            self.rdoc_kb.asimilarity_search(query, k=settings.rag.RAG_RETRIEVAL_K),
+            timeout=settings.rag.LLM_TIMEOUT_SECONDS
+        )
+        return "\n\n".join(doc.page_content for doc in docs)
+    
+    def _claude_request(
+        self,
+        assessment_data: Dict[str, Any],
+        context: str
+    ) -> Dict[str, Any]:
+        prompt = CLAUDE_ANALYSIS_PROMPT.format(
+            assessment_data=assessment_data,
+            context=context
+        )
+        return {
+            "model": settings.rag.CLAUDE_MODEL,
+            "max_tokens": 2000,
+            "temperature": 0.7,
+            "messages": [{
                 "role": "user",
                 "content": prompt
-            }]
+            }],
+            "timeout": settings.rag.LLM_TIMEOUT_SECONDS
+        }
+    
+    def _gpt4_request(
+        self,
+        assessment_data: Dict[str, Any],
+        context: str,
+        claude_analysis: str
+    ) -> Dict[str, Any]:
+        prompt = GPT4_RECOMMENDATIONS_PROMPT.format(
+            assessment_data=assessment_data,
+            context=context,
+            analysis=claude_analysis
         )
-        
-        return response.content
\ No newline at end of file
+        return {
+            "model": settings.rag.GPT4_MODEL,
+            "max_tokens": 1500,
+            "temperature": 0.7,
+            "messages": [{
+                "role": "user",
+                "content": prompt
+            }],
+            "timeout": settings.rag.LLM_TIMEOUT_SECONDS
+        }
+    
+    async def _generate_claude_analysis(
+        self,
+        assessment_data: Dict[str, Any],
+        context: str
+    ) -> str:
+        """Generate analysis using Claude"""
+        response = await self.anthropic_client.messages.create(
+            **self._claude_request(assessment_data, context)
+        )
+        return "".join(
+            block.text for block in response.content if block.type == "text"
+        )
+    
+    async def _generate_gpt4_recommendations(
+        self,
+        assessment_data: Dict[str, Any],
+        context: str,
+        claude_analysis: str
+    ) -> str:
+        """Generate recommendations using GPT-4"""
+        response = await self.openai_client.chat.completions.create(
+            **self._gpt4_request(assessment_data, context, claude_analysis)
+        )
+        return response.choices[0].message.content
\ No newline at end of file
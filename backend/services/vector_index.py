@@ -0,0 +1,175 @@
+# backend/services/vector_index.py
+
+import fcntl
+import hashlib
+import json
+import logging
+import pickle
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.vectorstores import FAISS
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_FORMAT = 1
+
+def chunk_id(chunk: Document) -> str:
+    """Content hash identifying a chunk (and its vector) across rebuilds"""
+    digest = hashlib.sha256()
+    digest.update(str(chunk.metadata.get("source", "")).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(chunk.page_content.encode("utf-8"))
+    return digest.hexdigest()
+
+class PersistentVectorIndex:
+    """FAISS index persisted on disk with a manifest of chunk content hashes
+
+    The first build embeds every chunk and saves the index next to a manifest
+    of chunk ids (SHA-256 of source and content). Later loads diff the current
+    chunks against the manifest, delete vectors for chunks that disappeared
+    and embed only chunks that are new or changed. An unchanged index is read
+    memory-mapped when FAISS supports it, so worker processes share its pages.
+    """
+
+    def __init__(
+        self,
+        index_dir: str,
+        embeddings: Any,
+        embedding_model: str = "",
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200
+    ):
+        self.index_dir = Path(index_dir)
+        self.embeddings = embeddings
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap
+        )
+        # Any change here invalidates every stored vector
+        self.signature = {
+            "format": MANIFEST_FORMAT,
+            "embedding_model": embedding_model,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap
+        }
+        self.stats: Dict[str, Any] = {}
+
+    def split(self, documents: List[Document]) -> Dict[str, Document]:
+        """Split documents into chunks keyed by content hash"""
+        chunks: Dict[str, Document] = {}
+        for chunk in self.splitter.split_documents(documents):
+            chunks.setdefault(chunk_id(chunk), chunk)
+        return chunks
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        path = self.index_dir / MANIFEST_FILE
+        if not path.exists():
+            return None
+        try:
+            manifest = json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable vector index manifest: {e}")
+            return None
+        if manifest.get("signature") != self.signature:
+            logger.info("Vector index signature changed, rebuilding")
+            return None
+        return manifest
+
+    def _save(self, store: FAISS, chunk_ids: List[str]):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        store.save_local(str(self.index_dir))
+        manifest = {
+            "signature": self.signature,
+            "chunks": sorted(chunk_ids),
+            "updated_at": time.time()
+        }
+        tmp = self.index_dir / f"{MANIFEST_FILE}.tmp"
+        tmp.write_text(json.dumps(manifest))
+        tmp.replace(self.index_dir / MANIFEST_FILE)
+
+    def _load(self, mmap: bool) -> FAISS:
+        if mmap:
+            index = _read_index_mmap(self.index_dir / "index.faiss")
+            if index is not None:
+                with open(self.index_dir / "index.pkl", "rb") as f:
+                    docstore, index_to_docstore_id = pickle.load(f)
+                return FAISS(self.embeddings, index, docstore, index_to_docstore_id)
+
+        return FAISS.load_local(
+            str(self.index_dir),
+            self.embeddings,
+            allow_dangerous_deserialization=True
+        )
+
+    @contextmanager
+    def _locked(self):
+        # Workers booting together build or update the index only once
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_dir / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load_or_build(self, documents: List[Document]) -> FAISS:
+        """Return an index for ``documents``, embedding only what changed"""
+        with self._locked():
+            return self._load_or_build(documents)
+
+    def _load_or_build(self, documents: List[Document]) -> FAISS:
+        start = time.perf_counter()
+        chunks = self.split(documents)
+        manifest = self._read_manifest()
+
+        if manifest is None:
+            ids = list(chunks)
+            store = FAISS.from_documents(
+                [chunks[i] for i in ids],
+                self.embeddings,
+                ids=ids
+            )
+            self._save(store, ids)
+            self.stats = {"mode": "build", "embedded": len(ids), "removed": 0}
+        else:
+            stored = set(manifest["chunks"])
+            added = [i for i in chunks if i not in stored]
+            removed = [i for i in stored if i not in chunks]
+
+            if not added and not removed:
+                store = self._load(mmap=True)
+            else:
+                store = self._load(mmap=False)
+                if removed:
+                    store.delete(removed)
+                if added:
+                    store.add_documents([chunks[i] for i in added], ids=added)
+                self._save(store, list(chunks))
+            self.stats = {
+                "mode": "load" if not added and not removed else "update",
+                "embedded": len(added),
+                "removed": len(removed)
+            }
+
+        self.stats["chunks"] = len(chunks)
+        self.stats["seconds"] = time.perf_counter() - start
+        logger.info(f"RDoC vector index ready: {self.stats}")
+        return store
+
+def _read_index_mmap(path: Path) -> Optional[Any]:
+    """Read a FAISS index memory-mapped, or None if unsupported"""
+    try:
+        import faiss
+        return faiss.read_index(
+            str(path),
+            faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        )
+    except Exception as e:
+        logger.debug(f"Memory-mapped FAISS load unavailable: {e}")
+        return None
@@ -0,0 +1,305 @@
+# backend/utils/biomarker_aggregation.py
+
+import numpy as np
+from itertools import chain
+from operator import attrgetter
+from typing import Any, Dict, List, Sequence, Tuple
+
+SCALAR_METRICS = ("arousal_level", "valence_level", "stress_level")
+MAPPING_FIELDS = (
+    "facial_emotions",
+    "facial_action_units",
+    "vocal_prosody",
+    "vocal_quality"
+)
+
+TREND_THRESHOLD = 0.1
+
+def _as_scalar(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return value
+    return float(np.mean(value))
+
+class FeatureMatrix:
+    """Fixed-schema matrix of per-record mapping values
+
+    One row per record, one column per key (in first-seen order). Records that
+    do not report a key hold NaN in that cell.
+    """
+
+    def __init__(self, keys: List[str], values: np.ndarray):
+        self.keys = keys
+        self.values = values
+
+    @property
+    def valid(self) -> np.ndarray:
+        return ~np.isnan(self.values)
+
+class BiomarkerColumns:
+    """Columnar view over a sequence of biomarker records
+
+    Materializes the records once into NumPy arrays: a float64 column per
+    scalar metric and a ``FeatureMatrix`` per JSON mapping column. Every
+    aggregate is then computed with vectorized reductions over those arrays.
+    """
+
+    def __init__(self, records: Sequence[Any]):
+        self.record_count = len(records)
+
+        # One attribute sweep per field, no per-record Python loop body
+        fields = ("timestamp",) + SCALAR_METRICS + MAPPING_FIELDS
+        columns = {field: list(map(attrgetter(field), records)) for field in fields}
+
+        self.timestamps = columns["timestamp"]
+        self.scalars = {
+            name: np.array(columns[name], dtype=np.float64)
+            for name in SCALAR_METRICS
+        }
+        self.matrices = {
+            field: self._build_matrix(columns[field])
+            for field in MAPPING_FIELDS
+        }
+
+    def _build_matrix(self, mappings: Sequence[Dict[str, Any]]) -> FeatureMatrix:
+        present = [row for row, mapping in enumerate(mappings) if mapping]
+        present_mappings = [mappings[row] for row in present]
+
+        # Identify each record's key layout; most records share a handful
+        layout_index: Dict[Tuple[str, ...], int] = {}
+        layout_ids = np.array(
+            [
+                layout_index.setdefault(layout, len(layout_index))
+                for layout in map(tuple, present_mappings)
+            ],
+            dtype=np.intp
+        )
+
+        # Schema in first-seen order (layouts are ordered by first record)
+        key_index: Dict[str, int] = {}
+        for layout in layout_index:
+            for key in layout:
+                key_index.setdefault(key, len(key_index))
+
+        # Column-major so each key's series is contiguous for the reductions
+        values = np.full(
+            (self.record_count, len(key_index)),
+            np.nan,
+            dtype=np.float64,
+            order="F"
+        )
+        if not present:
+            return FeatureMatrix(list(key_index), values)
+
+        # Flat value stream plus matching (row, column) coordinates
+        layout_cols = [
+            np.array([key_index[key] for key in layout], dtype=np.intp)
+            for layout in layout_index
+        ]
+        layout_lengths = np.array([len(cols) for cols in layout_cols], dtype=np.intp)
+        layout_starts = np.concatenate(([0], np.cumsum(layout_lengths)[:-1]))
+        lengths = layout_lengths[layout_ids]
+        total = int(lengths.sum())
+
+        try:
+            flat = np.fromiter(
+                chain.from_iterable(map(dict.values, present_mappings)),
+                dtype=np.float64,
+                count=total
+            )
+        except (TypeError, ValueError):
+            # Per-frame series (e.g. emotions of a video upload) count as
+            # their mean, as in the rollups
+            flat = np.fromiter(
+                map(_as_scalar, chain.from_iterable(map(dict.values, present_mappings))),
+                dtype=np.float64,
+                count=total
+            )
+        record_starts = np.cumsum(lengths) - lengths
+        offsets = np.arange(total) - np.repeat(record_starts, lengths)
+        cols = np.concatenate(layout_cols)[
+            np.repeat(layout_starts[layout_ids], lengths) + offsets
+        ]
+        rows = np.repeat(np.array(present, dtype=np.intp), lengths)
+        values[rows, cols] = flat
+
+        return FeatureMatrix(list(key_index), values)
+
+    def scalar_summary(self, window: int = 3) -> Dict[str, Dict[str, Any]]:
+        """Mean, std and trend for arousal, valence and stress"""
+        keys = [name.replace("_level", "") for name in SCALAR_METRICS]
+        values = np.column_stack([self.scalars[name] for name in SCALAR_METRICS])
+        return _summarize(FeatureMatrix(keys, values), window)
+
+    def mapping_means(self, field: str) -> Dict[str, np.float64]:
+        """Per-key mean over the records that report the key"""
+        matrix = self.matrices[field]
+        if not matrix.keys:
+            return {}
+        means = _masked_mean(matrix.values, matrix.valid)
+        return dict(zip(matrix.keys, means))
+
+    def mapping_summary(
+        self,
+        field: str,
+        window: int = 3
+    ) -> Dict[str, Dict[str, Any]]:
+        """Per-key mean, std and trend over the records that report the key"""
+        return _summarize(self.matrices[field], window)
+
+class RollupColumns:
+    """Columnar view over rollup buckets with the BiomarkerColumns interface
+
+    Means and standard deviations are exact, pooled from each bucket's
+    counts, sums and sums of squares; trends follow the per-bucket means.
+    """
+
+    def __init__(self, rollups: Sequence[Any]):
+        self.timestamps = [rollup.bucket_start for rollup in rollups]
+        counts = np.array([rollup.record_count for rollup in rollups], dtype=np.float64)
+        self.record_count = int(counts.sum())
+
+        metrics = [name.replace("_level", "") for name in SCALAR_METRICS]
+        self._scalars = (
+            metrics,
+            np.repeat(counts[:, None], len(metrics), axis=1),
+            np.column_stack([
+                [getattr(rollup, f"{metric}_sum") for rollup in rollups]
+                for metric in metrics
+            ]) if rollups else np.empty((0, len(metrics))),
+            np.column_stack([
+                [getattr(rollup, f"{metric}_sumsq") for rollup in rollups]
+                for metric in metrics
+            ]) if rollups else np.empty((0, len(metrics)))
+        )
+        self._mappings = {
+            field: self._build_stats(
+                [(rollup.mapping_stats or {}).get(field, {}) for rollup in rollups]
+            )
+            for field in MAPPING_FIELDS
+        }
+
+    @staticmethod
+    def _build_stats(
+        bucket_stats: Sequence[Dict[str, Sequence[float]]]
+    ) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        key_index: Dict[str, int] = {}
+        for stats in bucket_stats:
+            for key in stats:
+                key_index.setdefault(key, len(key_index))
+
+        # (buckets, keys, [count, sum, sumsq])
+        values = np.zeros((len(bucket_stats), len(key_index), 3), dtype=np.float64)
+        for row, stats in enumerate(bucket_stats):
+            for key, entry in stats.items():
+                values[row, key_index[key]] = entry
+        return list(key_index), values[..., 0], values[..., 1], values[..., 2]
+
+    def scalar_summary(self, window: int = 3) -> Dict[str, Dict[str, Any]]:
+        """Mean, std and trend for arousal, valence and stress"""
+        return _summarize_pooled(*self._scalars, window)
+
+    def mapping_means(self, field: str) -> Dict[str, np.float64]:
+        """Per-key mean over the records that report the key"""
+        keys, counts, sums, _ = self._mappings[field]
+        if not keys:
+            return {}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums.sum(axis=0) / counts.sum(axis=0)
+        return dict(zip(keys, means))
+
+    def mapping_summary(
+        self,
+        field: str,
+        window: int = 3
+    ) -> Dict[str, Dict[str, Any]]:
+        """Per-key mean, std and trend over the records that report the key"""
+        return _summarize_pooled(*self._mappings[field], window)
+
+def _masked_mean(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    counts = valid.sum(axis=0)
+    totals = np.where(valid, values, 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return totals / counts
+
+def _masked_std(
+    values: np.ndarray,
+    valid: np.ndarray,
+    means: np.ndarray
+) -> np.ndarray:
+    counts = valid.sum(axis=0)
+    deviations = np.where(valid, values - means, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.sqrt((deviations ** 2).sum(axis=0) / counts)
+
+def calculate_trends(
+    values: np.ndarray,
+    valid: np.ndarray,
+    window: int = 3
+) -> List[str]:
+    """Vectorized equivalent of the moving-average trend per column
+
+    The first and last entries of a ``window`` moving average over a column's
+    valid values are the means of its first and last ``window`` valid values,
+    so the trend only needs those two sums per column.
+    """
+    counts = valid.sum(axis=0)
+    from_start = np.cumsum(valid, axis=0)
+    from_end = counts - from_start + valid
+
+    weighted = np.where(valid, values * (1.0 / window), 0.0)
+    head = np.where(valid & (from_start <= window), weighted, 0.0).sum(axis=0)
+    tail = np.where(valid & (from_end <= window), weighted, 0.0).sum(axis=0)
+    trend = tail - head
+
+    labels = np.where(trend > 0, "increasing", "decreasing").astype(object)
+    labels[np.abs(trend) < TREND_THRESHOLD] = "stable"
+    labels[counts - window + 1 < 2] = "stable"
+    labels[counts < window] = "insufficient_data"
+    return labels.tolist()
+
+def _summarize(
+    matrix: FeatureMatrix,
+    window: int
+) -> Dict[str, Dict[str, Any]]:
+    if not matrix.keys:
+        return {}
+
+    valid = matrix.valid
+    means = _masked_mean(matrix.values, valid)
+    stds = _masked_std(matrix.values, valid, means)
+    trends = calculate_trends(matrix.values, valid, window)
+
+    return {
+        key: {
+            "mean": float(mean),
+            "std": float(std),
+            "trend": trend
+        }
+        for key, mean, std, trend in zip(matrix.keys, means, stds, trends)
+    }
+
+def _summarize_pooled(
+    keys: List[str],
+    counts: np.ndarray,
+    sums: np.ndarray,
+    sumsqs: np.ndarray,
+    window: int
+) -> Dict[str, Dict[str, Any]]:
+    if not keys:
+        return {}
+
+    total = counts.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums.sum(axis=0) / total
+        variances = np.maximum(sumsqs.sum(axis=0) / total - means ** 2, 0.0)
+        bucket_means = sums / counts
+    trends = calculate_trends(bucket_means, counts > 0, window)
+
+    return {
+        key: {
+            "mean": float(mean),
+            "std": float(std),
+            "trend": trend
+        }
+        for key, mean, std, trend in zip(keys, means, np.sqrt(variances), trends)
+    }
@@ -0,0 +1,88 @@
+# backend/utils/feature_backfill.py
+"""Rewrite biomarker feature vectors still stored as JSON into compact blobs
+
+Run after migration 006 from the repository root:
+
+    python -m backend.utils.feature_backfill --batch-size 500
+"""
+
+import argparse
+import logging
+from typing import Dict
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+
+from backend.models.types import decode_array, encode_array, is_legacy_blob
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = ("facial_features", "vocal_features")
+
+# Untyped columns: read raw driver values so legacy text is not coerced
+_records = sa.table(
+    "biomarker_records",
+    sa.column("id"),
+    *(sa.column(name) for name in FEATURE_COLUMNS)
+)
+
+def backfill_feature_vectors(
+    engine: Engine,
+    batch_size: int = 500,
+    dtype: str = "float32"
+) -> Dict[str, int]:
+    """Convert legacy JSON feature rows in id order, one transaction per batch
+
+    Safe to re-run or interrupt: rows already in the compact format are
+    skipped.
+    """
+    counts = {"rows_scanned": 0, **{name: 0 for name in FEATURE_COLUMNS}}
+    last_id = None
+
+    while True:
+        query = sa.select(_records).order_by(_records.c.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(_records.c.id > last_id)
+
+        with engine.begin() as connection:
+            rows = connection.execute(query).all()
+            if not rows:
+                break
+
+            for name in FEATURE_COLUMNS:
+                updates = [
+                    {
+                        "record_id": row.id,
+                        "value": encode_array(decode_array(row._mapping[name]), dtype)
+                    }
+                    for row in rows
+                    if row._mapping[name] is not None and is_legacy_blob(row._mapping[name])
+                ]
+                if updates:
+                    connection.execute(
+                        sa.update(_records)
+                        .where(_records.c.id == sa.bindparam("record_id"))
+                        .values({name: sa.bindparam("value", type_=sa.LargeBinary)}),
+                        updates
+                    )
+                    counts[name] += len(updates)
+
+        counts["rows_scanned"] += len(rows)
+        last_id = rows[-1].id
+        logger.info(f"Feature backfill progress: {counts}")
+
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    args = parser.parse_args()
+
+    from backend.core.database import get_engine
+
+    counts = backfill_feature_vectors(get_engine(), args.batch_size, args.dtype)
+    print(f"Converted {counts}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# backend/utils/lake_export.py
+"""Export new assessments and biomarker records to the Parquet data lake
+
+Each run appends the rows added since the stored watermark as
+``<table>/date=YYYY-MM-DD/session=<id>/part-<first id>.parquet`` under
+``DATA_LAKE_DIR``; ``ml_pipeline.utils.data_loader`` reads them back.
+
+Run from the repository root (e.g. from cron):
+
+    python -m backend.utils.lake_export --table biomarker_records
+    python -m backend.utils.lake_export --table assessments --batch-size 100000
+"""
+
+import argparse
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection, Engine
+
+from backend.models.assessment_model import Assessment
+from backend.models.biomarker_model import BiomarkerRecord
+
+logger = logging.getLogger(__name__)
+
+# Exported columns; feature vectors become fixed-size float32 lists and
+# JSON mappings their JSON text
+TABLES = {
+    "biomarker_records": {
+        "table": BiomarkerRecord.__table__,
+        "columns": (
+            "id", "session_id", "timestamp",
+            "facial_features", "facial_action_units", "facial_emotions",
+            "vocal_features", "vocal_prosody", "vocal_quality",
+            "arousal_level", "valence_level", "stress_level"
+        ),
+        "vectors": ("facial_features", "vocal_features"),
+        "json": ("facial_action_units", "facial_emotions", "vocal_prosody", "vocal_quality")
+    },
+    "assessments": {
+        "table": Assessment.__table__,
+        "columns": (
+            "id", "session_id", "timestamp", "assessment_type",
+            "scores", "total_score", "severity_level"
+        ),
+        "vectors": (),
+        "json": ("scores",)
+    }
+}
+
+STATE_FILE = "_state.json"
+
+# Partition value for rows without a timestamp or session (as Hive does)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+def load_state(directory: Path) -> Dict[str, Any]:
+    """Watermark of one table's export: last exported id and vector sizes"""
+    path = directory / STATE_FILE
+    if not path.exists():
+        return {"last_id": 0, "rows": 0, "feature_dims": {}}
+    return json.loads(path.read_text())
+
+def _save_state(directory: Path, state: Dict[str, Any]):
+    temporary = directory / f".{STATE_FILE}.tmp"
+    temporary.write_text(json.dumps(state, indent=2))
+    os.replace(temporary, directory / STATE_FILE)
+
+def _arrow_type(column: Any, spec: Dict[str, Any], dims: Dict[str, int]) -> pa.DataType:
+    if column.name in spec["vectors"]:
+        return pa.list_(pa.float32(), dims[column.name])
+    if column.name in spec["json"]:
+        return pa.string()
+    if isinstance(column.type, sa.Integer):
+        return pa.int64()
+    if isinstance(column.type, sa.Float):
+        return pa.float64()
+    if isinstance(column.type, sa.DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+def _vector_array(name: str, values: Sequence[Optional[np.ndarray]], dim: int) -> pa.Array:
+    """Fixed-size float32 list column; missing vectors are nulls"""
+    matrix = np.zeros((len(values), dim), dtype=np.float32)
+    valid = np.ones(len(values), dtype=bool)
+    for i, vector in enumerate(values):
+        if vector is None:
+            valid[i] = False
+        elif vector.size != dim:
+            raise ValueError(f"{name} has {vector.size} values; the lake stores {dim}")
+        else:
+            matrix[i] = vector.reshape(-1)
+    validity = None if valid.all() else pa.py_buffer(np.packbits(valid, bitorder="little"))
+    return pa.Array.from_buffers(
+        pa.list_(pa.float32(), dim),
+        len(values),
+        [validity],
+        children=[pa.array(matrix.reshape(-1))]
+    )
+
+def _arrow_table(rows: Sequence[Any], columns: Sequence[Any], spec: Dict[str, Any], dims: Dict[str, int]) -> pa.Table:
+    arrays = []
+    for index, column in enumerate(columns):
+        values = [row[index] for row in rows]
+        if column.name in spec["vectors"]:
+            arrays.append(_vector_array(column.name, values, dims[column.name]))
+        elif column.name in spec["json"]:
+            arrays.append(pa.array([None if v is None else json.dumps(v) for v in values], pa.string()))
+        else:
+            arrays.append(pa.array(values, _arrow_type(column, spec, dims)))
+    return pa.Table.from_arrays(arrays, names=[column.name for column in columns])
+
+def _partition(row: Any) -> Tuple[str, str]:
+    day = row.timestamp.date().isoformat() if row.timestamp is not None else NULL_PARTITION
+    # Session ids are URI-encoded, as pyarrow's Hive partitioning expects
+    session = quote(row.session_id, safe="") if row.session_id is not None else NULL_PARTITION
+    return day, session
+
+def _first_dim(connection: Connection, table: sa.Table, name: str) -> Optional[int]:
+    """Size of the first stored vector in ``name``, None if there is none"""
+    vector = connection.execute(
+        sa.select(table.c[name]).where(table.c[name].isnot(None)).order_by(table.c.id).limit(1)
+    ).scalar()
+    return None if vector is None else int(vector.size)
+
+def _settled_id(connection: Connection, table: sa.Table, settle_seconds: float) -> Optional[int]:
+    """First id still inside the settle window; it and later ids wait"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settle_seconds)
+    return connection.execute(sa.select(sa.func.min(table.c.id)).where(table.c.timestamp > cutoff)).scalar()
+
+def export_increment(
+    engine: Engine,
+    root: str,
+    table_name: str = "biomarker_records",
+    batch_size: int = 50000,
+    settle_seconds: float = 60.0,
+    feature_dims: Optional[Dict[str, int]] = None
+) -> Dict[str, int]:
+    """Write rows past the watermark in id order, one file per partition and batch
+
+    The watermark moves after each batch's files are in place, so an
+    interrupted run resumes where it stopped; files are named after their
+    first id and a retried batch overwrites its own parts. Rows newer than
+    ``settle_seconds`` (and every id after the first of them) wait for a
+    later run, so transactions committing out of id order are not skipped.
+    Vector sizes come from the first stored vector unless ``feature_dims``
+    sets them, and then stay fixed for the table.
+    """
+    spec = TABLES[table_name]
+    table = spec["table"]
+    columns = [table.c[name] for name in spec["columns"]]
+    directory = Path(root) / table_name
+    directory.mkdir(parents=True, exist_ok=True)
+    state = load_state(directory)
+    for name, dim in (feature_dims or {}).items():
+        if state["feature_dims"].get(name, dim) != dim:
+            raise ValueError(f"The lake already stores {name} with {state['feature_dims'][name]} values")
+    dims = {**state["feature_dims"], **(feature_dims or {})}
+    counts = {"rows": 0, "files": 0}
+
+    with engine.connect() as connection:
+        stop_id = _settled_id(connection, table, settle_seconds)
+        for name in spec["vectors"]:
+            if name not in dims:
+                dim = _first_dim(connection, table, name)
+                if dim is not None:
+                    dims[name] = dim
+
+    while True:
+        query = (
+            sa.select(*columns)
+            .where(table.c.id > state["last_id"])
+            .order_by(table.c.id)
+            .limit(batch_size)
+        )
+        if stop_id is not None:
+            query = query.where(table.c.id < stop_id)
+        with engine.connect() as connection:
+            rows = connection.execute(query).all()
+        if not rows:
+            break
+        unsized = [name for name in spec["vectors"] if name not in dims]
+        if unsized:
+            raise ValueError(f"No stored {', '.join(unsized)} to size the column; pass the dimension")
+
+        partitions: Dict[Tuple[str, str], List[Any]] = {}
+        for row in rows:
+            partitions.setdefault(_partition(row), []).append(row)
+        for (day, session), part_rows in partitions.items():
+            folder = directory / f"date={day}" / f"session={session}"
+            folder.mkdir(parents=True, exist_ok=True)
+            name = f"part-{part_rows[0].id:012d}.parquet"
+            temporary = folder / f".{name}.tmp"
+            pq.write_table(_arrow_table(part_rows, columns, spec, dims), temporary)
+            os.replace(temporary, folder / name)
+        counts["files"] += len(partitions)
+        counts["rows"] += len(rows)
+
+        state.update(last_id=rows[-1].id, rows=state["rows"] + len(rows), feature_dims=dims)
+        _save_state(directory, state)
+        logger.info(f"Lake export progress ({table_name}): {counts}")
+
+    counts["last_id"] = state["last_id"]
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--table", choices=sorted(TABLES), default="biomarker_records")
+    parser.add_argument("--root", help="lake directory (default: settings.DATA_LAKE_DIR)")
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--settle-seconds", type=float, default=60.0,
+                        help="leave rows this recent for the next run")
+    parser.add_argument("--feature-dim", action="append", default=[], metavar="COLUMN=SIZE",
+                        help="vector size when no vector is stored yet (repeatable)")
+    args = parser.parse_args()
+
+    from backend.core.config import settings
+    from backend.core.database import get_engine
+
+    feature_dims = {}
+    for item in args.feature_dim:
+        name, _, size = item.partition("=")
+        feature_dims[name] = int(size)
+
+    counts = export_increment(
+        get_engine(),
+        args.root or settings.DATA_LAKE_DIR,
+        args.table,
+        args.batch_size or settings.DATA_LAKE_BATCH_SIZE,
+        args.settle_seconds,
+        feature_dims
+    )
+    print(f"Exported {counts}")
+
+if __name__ == "__main__":
+    main()
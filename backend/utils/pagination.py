@@ -0,0 +1,69 @@
+# backend/utils/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+
+Cursor = Tuple[datetime, int]
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past the row (timestamp, id)"""
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Parse a cursor from ``encode_cursor``; ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """Validate a comma-separated ``fields=`` projection; all fields if empty"""
+    if not fields:
+        return list(allowed)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})"
+        )
+    return list(dict.fromkeys(requested))
+
+def keyset_page(
+    query: Select,
+    timestamp_column: Any,
+    id_column: Any,
+    after: Optional[Cursor],
+    limit: int,
+    descending: bool = False
+) -> Select:
+    """Order by (timestamp, id) and continue after the ``after`` row
+
+    Seeks through the (…, timestamp) index instead of skipping rows, so
+    every page costs the same. One extra row is fetched to tell whether a
+    next page exists; see ``split_page``.
+    """
+    key = tuple_(timestamp_column, id_column)
+    if after is not None:
+        bound = tuple_(*after)
+        query = query.where(key < bound if descending else key > bound)
+
+    if descending:
+        query = query.order_by(timestamp_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(timestamp_column, id_column)
+    return query.limit(limit + 1)
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[Sequence[Any], Optional[str]]:
+    """Drop the look-ahead row and return the cursor for the next page"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].timestamp, rows[-1].id)
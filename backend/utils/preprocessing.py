@@ -1,56 +1,191 @@
 # backend/utils/preprocessing.py
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import torch
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional, Callable, Sequence
 from sklearn.preprocessing import StandardScaler
 import cv2
 
+def _resize_normalize(
+    frame: np.ndarray,
+    target_size: Tuple[int, int],
+    out: np.ndarray,
+    channels_last: bool = False
+):
+    """Resize a uint8 frame and write it scaled to [0, 1] into ``out``
+    
+    ``out`` is (C, H, W), or (H, W, C) with ``channels_last``.
+    """
+    frame = cv2.resize(frame, target_size)
+    if frame.ndim == 2:
+        frame = frame[:, :, np.newaxis]
+    source = frame if channels_last else frame.transpose(2, 0, 1)
+    np.divide(source, np.float32(255.0), out=out)
+
+def _peak_normalize(audio: np.ndarray, out: np.ndarray):
+    """Scale float32 audio into ``out`` so its peak is 1; silence stays zero"""
+    peak = max(float(audio.max()), -float(audio.min())) if audio.size else 0.0
+    if peak > 0:
+        np.divide(audio, np.float32(peak), out=out)
+    elif out is not audio:
+        out[...] = audio
+
 class BiomarkerPreprocessor:
     """Biomarker Data Preprocessing"""
     
-    def __init__(self):
+    def __init__(self, num_workers: int = 4):
         self.face_scaler = StandardScaler()
         self.voice_scaler = StandardScaler()
+        self.num_workers = max(1, num_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.num_workers,
+                    thread_name_prefix="preprocess"
+                )
+            return self._executor
+    
+    def _map_items(self, fn: Callable[[int], None], count: int):
+        """Run ``fn(i)`` for every item, in contiguous chunks across the pool"""
+        workers = min(self.num_workers, count)
+        if workers <= 1:
+            for index in range(count):
+                fn(index)
+            return
+        
+        def run(start: int, stop: int):
+            for index in range(start, stop):
+                fn(index)
+        
+        bounds = np.linspace(0, count, workers + 1).astype(int)
+        futures = [
+            self._pool().submit(run, start, stop)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+    
+    def close(self):
+        """Stop the worker threads"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
     
     def preprocess_facial(
         self,
         frame: np.ndarray,
-        target_size: Tuple[int, int] = (224, 224)
+        target_size: Tuple[int, int] = (224, 224),
+        out: Optional[np.ndarray] = None
     ) -> torch.Tensor:
-        """Preprocess facial frame"""
-        # Resize
-        frame = cv2.resize(frame, target_size)
+        """Preprocess facial frame into a (1, C, H, W) float32 tensor
         
-        # Normalize
-        frame = frame / 255.0
+        Resizing stays in uint8; scaling to [0, 1] and the move to channels
+        first happen in one pass into ``out`` (a (C, H, W) float32 array,
+        allocated if omitted), with no float64 intermediate.
+        """
+        if out is None:
+            channels = 1 if frame.ndim == 2 else frame.shape[2]
+            out = np.empty((channels, target_size[1], target_size[0]), dtype=np.float32)
         
-        # Convert to tensor
-        tensor = torch.from_numpy(frame).float()
+        # Resize, then normalize straight into the channels-first output
+        _resize_normalize(frame, target_size, out)
         
-        # Add batch dimension
-        if len(tensor.shape) == 3:
-            tensor = tensor.unsqueeze(0)
+        # Convert to tensor with a batch dimension
+        return torch.from_numpy(out).unsqueeze(0)
+    
+    def preprocess_facial_batch(
+        self,
+        frames: Sequence[np.ndarray],
+        target_size: Tuple[int, int] = (224, 224),
+        channels_last: bool = False
+    ) -> torch.Tensor:
+        """Preprocess N uint8 frames into one (N, C, H, W) float32 tensor
         
-        # Move channels to correct dimension
-        tensor = tensor.permute(0, 3, 1, 2)
+        Frames may differ in size. They are resized across the worker
+        threads (cv2 releases the GIL) and written straight into one
+        preallocated batch. With ``channels_last`` the batch has the same
+        shape in that memory format, which also skips the transpose.
+        """
+        count = len(frames)
+        if not count:
+            raise ValueError("No frames to preprocess")
+        channels = 1 if frames[0].ndim == 2 else frames[0].shape[2]
+        width, height = target_size
         
-        return tensor
+        if channels_last:
+            storage = torch.empty((count, height, width, channels), dtype=torch.float32)
+            batch = storage.permute(0, 3, 1, 2)
+        else:
+            batch = storage = torch.empty((count, channels, height, width), dtype=torch.float32)
+        rows = storage.numpy()
+        
+        self._map_items(
+            lambda i: _resize_normalize(frames[i], target_size, rows[i], channels_last),
+            count
+        )
+        return batch
     
     def preprocess_vocal(
         self,
         audio: np.ndarray,
-        sample_rate: int = 16000
+        sample_rate: int = 16000,
+        out: Optional[np.ndarray] = None
     ) -> torch.Tensor:
-        """Preprocess vocal data"""
+        """Peak-normalize audio into a (1, 1, N) float32 tensor
+        
+        The peak is found without an ``abs`` copy and scaling is one pass
+        into ``out``, which may be ``audio`` itself when the caller no longer
+        needs the raw samples. Silent input stays zero.
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        if out is None:
+            out = np.empty_like(audio)
+        
         # Normalize audio
-        audio = audio / np.max(np.abs(audio))
+        _peak_normalize(audio, out)
         
         # Convert to tensor
-        tensor = torch.from_numpy(audio).float()
+        tensor = torch.from_numpy(out)
         
         # Add batch and channel dimensions
         if len(tensor.shape) == 1:
             tensor = tensor.unsqueeze(0).unsqueeze(0)
         
-        return tensor
\ No newline at end of file
+        return tensor
+    
+    def preprocess_vocal_batch(
+        self,
+        clips: Sequence[np.ndarray],
+        max_length: Optional[int] = None
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Peak-normalize N clips into a zero-padded (N, 1, T) batch and mask
+        
+        T is the longest clip, or ``max_length`` (longer clips are cut and
+        normalized over the kept samples). ``mask[i, t]`` is True where
+        sample t of clip i is real audio.
+        """
+        count = len(clips)
+        if not count:
+            raise ValueError("No clips to preprocess")
+        lengths = [len(clip) for clip in clips]
+        length = max_length or max(lengths)
+        lengths = [min(n, length) for n in lengths]
+        
+        batch = torch.empty((count, 1, length), dtype=torch.float32)
+        rows = batch.numpy()[:, 0]
+        
+        def fill(i: int):
+            clip = np.asarray(clips[i], dtype=np.float32)[:length]
+            _peak_normalize(clip, rows[i, :len(clip)])
+            rows[i, len(clip):] = 0.0
+        
+        self._map_items(fill, count)
+        mask = torch.arange(length).unsqueeze(0) < torch.tensor(lengths).unsqueeze(1)
+        return batch, mask
@@ -0,0 +1,187 @@
+# backend/utils/prosody.py
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+@dataclass
+class VoiceFeatureConfig:
+    """Framing and pitch search settings for voice feature extraction"""
+
+    frame_ms: float = 40.0
+    hop_ms: float = 10.0
+    f0_min: float = 75.0
+    f0_max: float = 500.0
+    # Normalized autocorrelation a frame needs to count as voiced
+    voicing_threshold: float = 0.45
+    # Frames quieter than this, relative to the loudest frame, are silence
+    silence_db: float = -35.0
+    # A syllable nucleus must stand this far above the surrounding dips
+    syllable_dip_db: float = 2.0
+    # Consecutive frames further apart than these ratios are not compared
+    # for jitter / shimmer (Praat's maximum period and amplitude factors)
+    max_period_factor: float = 1.3
+    max_amplitude_factor: float = 1.6
+    # Frames per FFT block, bounding the working memory of long clips
+    block_frames: int = 2048
+
+def frame_audio(audio: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """(frames, frame_length) strided view of ``audio``; no samples are copied"""
+    if len(audio) < frame_length:
+        audio = np.pad(audio, (0, frame_length - len(audio)))
+    return sliding_window_view(audio, frame_length)[::hop_length]
+
+def _pitch_track(frames: np.ndarray, sample_rate: int, config: VoiceFeatureConfig):
+    """Per-frame F0 (Hz) and normalized autocorrelation peak
+
+    Autocorrelation of Hann-windowed frames through one batched real FFT,
+    divided by the window's own autocorrelation (Boersma 1993). The pitch
+    lag is the shortest local maximum within 90% of the best one, which
+    avoids octave-down errors, refined by parabolic interpolation.
+    """
+    length = frames.shape[1]
+    window = np.hanning(length).astype(np.float32)
+    n_fft = 1 << (2 * length - 1).bit_length()
+    window_spectrum = np.fft.rfft(window, n_fft)
+    window_acf = np.fft.irfft(window_spectrum * np.conj(window_spectrum), n_fft)[:length]
+
+    min_lag = max(int(sample_rate / config.f0_max), 2)
+    max_lag = min(int(np.ceil(sample_rate / config.f0_min)), length - 2)
+    lags = np.arange(min_lag - 1, max_lag + 2)
+
+    f0 = np.zeros(len(frames), dtype=np.float64)
+    strength = np.zeros(len(frames), dtype=np.float64)
+    for start in range(0, len(frames), config.block_frames):
+        block = frames[start:start + config.block_frames]
+        windowed = (block - block.mean(axis=1, keepdims=True)) * window
+        spectrum = np.fft.rfft(windowed, n_fft, axis=1)
+        spectrum *= np.conj(spectrum)
+        acf = np.fft.irfft(spectrum, n_fft, axis=1)[:, :length]
+
+        energy = acf[:, :1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = (acf[:, lags] / energy) / (window_acf[lags] / window_acf[0])
+        r = np.nan_to_num(r)
+
+        inner = r[:, 1:-1]
+        peaks = (inner >= r[:, :-2]) & (inner >= r[:, 2:])
+        best = np.where(peaks, inner, -np.inf).max(axis=1, keepdims=True)
+        candidates = peaks & (inner >= 0.9 * best)
+        index = np.argmax(candidates, axis=1)
+        has_peak = candidates.any(axis=1)
+
+        rows = np.arange(len(block))
+        left, center, right = r[rows, index], r[rows, index + 1], r[rows, index + 2]
+        curvature = left - 2 * center + right
+        with np.errstate(invalid="ignore", divide="ignore"):
+            offset = np.where(curvature < 0, 0.5 * (left - right) / curvature, 0.0)
+        offset = np.clip(offset, -0.5, 0.5)
+        peak_lag = lags[index + 1] + offset
+        peak_value = np.minimum(center - 0.25 * (left - right) * offset, 0.9999)
+
+        f0[start:start + len(block)] = np.where(has_peak, sample_rate / peak_lag, 0.0)
+        strength[start:start + len(block)] = np.where(has_peak, peak_value, 0.0)
+    return f0, strength
+
+def _consecutive_pairs(voiced: np.ndarray, values: np.ndarray, max_factor: float) -> np.ndarray:
+    """Adjacent voiced frames whose values differ by at most ``max_factor``"""
+    pairs = voiced[1:] & voiced[:-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = values[1:] / values[:-1]
+    return pairs & (ratio <= max_factor) & (ratio >= 1 / max_factor)
+
+def _mean_relative_difference(values: np.ndarray, pairs: np.ndarray) -> Optional[float]:
+    if not pairs.any():
+        return None
+    differences = np.abs(np.diff(values))[pairs]
+    scale = np.concatenate([values[:-1][pairs], values[1:][pairs]]).mean()
+    return float(differences.mean() / scale) if scale > 0 else None
+
+def _count_syllables(energy_db: np.ndarray, voiced: np.ndarray, config: VoiceFeatureConfig) -> int:
+    """Voiced intensity peaks that rise ``syllable_dip_db`` above the dips around them"""
+    smoothed = np.convolve(energy_db, np.ones(5) / 5, mode="same")
+    inner = smoothed[1:-1]
+    is_peak = (inner > smoothed[:-2]) & (inner >= smoothed[2:]) & voiced[1:-1]
+    peaks = np.flatnonzero(is_peak) + 1
+    if len(peaks) == 0:
+        return 0
+    # The deepest point between neighbouring peaks must be a real dip
+    bounds = np.concatenate([[0], peaks, [len(smoothed) - 1]])
+    dips = np.minimum.reduceat(smoothed, bounds[:-1])[1:]
+    left_dip = np.concatenate([[smoothed[:peaks[0] + 1].min()], dips[:-1]])
+    right_dip = np.minimum.reduceat(smoothed, peaks)
+    prominence = smoothed[peaks] - np.maximum(left_dip, right_dip)
+    return int((prominence >= config.syllable_dip_db).sum())
+
+def extract_voice_features(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    config: Optional[VoiceFeatureConfig] = None
+) -> Dict[str, Dict[str, float]]:
+    """Prosody and voice quality measures of a mono clip
+
+    Returns ``{"prosody": {...}, "quality": {...}}`` with plain floats.
+    Jitter and shimmer are frame-level (consecutive voiced 10 ms frames,
+    not glottal cycles), so they read higher than cycle-based tools.
+    F0 statistics skip voiced frames 3/4 octave or more off the median.
+    Measures that need voiced speech are omitted when there is none.
+    """
+    config = config or VoiceFeatureConfig()
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+    frame_length = int(sample_rate * config.frame_ms / 1000)
+    hop_length = int(sample_rate * config.hop_ms / 1000)
+    frames = frame_audio(audio, frame_length, hop_length)
+    duration = len(audio) / sample_rate
+
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame_length)
+    energy_db = 20 * np.log10(np.maximum(rms, 1e-10))
+    loud = (energy_db > energy_db.max() + config.silence_db) & (rms > 1e-5)
+
+    f0, strength = _pitch_track(frames, sample_rate, config)
+    voiced = loud & (strength >= config.voicing_threshold) & (f0 > 0)
+    voiced_seconds = voiced.sum() * config.hop_ms / 1000
+
+    prosody = {
+        "energy_mean_db": float(energy_db[loud].mean()) if loud.any() else float(energy_db.mean()),
+        "energy_std_db": float(energy_db[loud].std()) if loud.any() else 0.0,
+        "voiced_fraction": float(voiced.mean()),
+        "pause_ratio": float(1.0 - loud.mean()),
+        "duration_seconds": float(duration)
+    }
+    quality: Dict[str, float] = {}
+
+    if voiced.any():
+        voiced_f0 = f0[voiced]
+        # Octave jumps off the speaker's median are tracking errors
+        in_octave = np.abs(np.log2(voiced_f0 / np.median(voiced_f0))) < 0.75
+        voiced_f0 = voiced_f0[in_octave]
+        semitones = 12 * np.log2(voiced_f0 / voiced_f0.min())
+        syllables = _count_syllables(energy_db, voiced, config)
+        prosody.update({
+            "f0_mean": float(voiced_f0.mean()),
+            "f0_std": float(voiced_f0.std()),
+            "f0_min": float(voiced_f0.min()),
+            "f0_max": float(voiced_f0.max()),
+            "f0_range_semitones": float(semitones.max()),
+            "speaking_rate": float(syllables / duration) if duration else 0.0,
+            "articulation_rate": float(syllables / voiced_seconds)
+        })
+
+        periods = np.where(voiced, 1.0 / np.maximum(f0, 1e-6), 0.0)
+        period_pairs = _consecutive_pairs(voiced, periods, config.max_period_factor)
+        amplitude_pairs = _consecutive_pairs(voiced, rms, config.max_amplitude_factor)
+        jitter = _mean_relative_difference(periods, period_pairs)
+        shimmer = _mean_relative_difference(rms, amplitude_pairs)
+        if jitter is not None:
+            quality["jitter_local"] = jitter
+        if shimmer is not None:
+            quality["shimmer_local"] = shimmer
+            ratios = rms[1:][amplitude_pairs] / rms[:-1][amplitude_pairs]
+            quality["shimmer_db"] = float(np.abs(20 * np.log10(np.maximum(ratios, 1e-10))).mean())
+
+        r = strength[voiced]
+        quality["hnr_db"] = float(np.mean(10 * np.log10(r / (1 - r))))
+
+    return {"prosody": prosody, "quality": quality}
@@ -0,0 +1,200 @@
+# backend/utils/rescore.py
+"""Rescore stored assessments after instrument cutpoints change
+
+Run from the repository root:
+
+    python -m backend.utils.rescore --check
+    python -m backend.utils.rescore --instrument PHQ-9 --batch-size 50000
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+
+from backend.utils.scoring import INSTRUMENTS, decode_responses, get_instrument, response_matrix
+
+logger = logging.getLogger(__name__)
+
+# Untyped columns: read raw driver values and decode JSON once per batch
+_assessments = sa.table(
+    "assessments",
+    sa.column("id"),
+    sa.column("assessment_type"),
+    sa.column("scores"),
+    sa.column("total_score"),
+    sa.column("severity_level")
+)
+
+# Severity (and risk) columns of the questionnaire-specific tables
+_DETAIL_TABLES = {
+    "PHQ-9": (sa.table(
+        "phq9_assessments",
+        sa.column("assessment_id"),
+        sa.column("depression_severity"),
+        sa.column("risk_level")
+    ), "depression_severity", "risk_level"),
+    "GAD-7": (sa.table(
+        "gad7_assessments",
+        sa.column("assessment_id"),
+        sa.column("anxiety_severity")
+    ), "anxiety_severity", None)
+}
+
+def _risk_label(table: sa.TableClause) -> str:
+    return f"{table.name}_risk"
+
+def _detail_label(table: sa.TableClause) -> str:
+    return f"{table.name}_id"
+
+def rescore_assessments(
+    engine: Engine,
+    instruments: Optional[Iterable[str]] = None,
+    batch_size: int = 50000,
+    repair: bool = True
+) -> Dict[str, int]:
+    """Recompute totals and severities in id order, one transaction per batch
+
+    Each batch is scored as one answer matrix per instrument; only rows
+    whose stored total, severity or (PHQ-9) risk level differ are updated,
+    along with the severity and risk columns of their PHQ-9/GAD-7 rows. With
+    ``repair=False`` differences are only counted. Rows whose stored
+    answers no longer validate are counted as ``invalid`` and left as is.
+    """
+    names = [get_instrument(name).name for name in (instruments or INSTRUMENTS)]
+    counts = {"rows_scanned": 0, "changed": 0, "invalid": 0}
+    last_id = None
+
+    # Detail tables with a risk column are joined so stored risk levels are compared too
+    source = _assessments
+    detail_columns = []
+    for name in names:
+        table, _, risk_column = _DETAIL_TABLES.get(name, (None, None, None))
+        if risk_column is not None:
+            source = source.outerjoin(table, table.c.assessment_id == _assessments.c.id)
+            detail_columns.extend([
+                table.c.assessment_id.label(_detail_label(table)),
+                table.c[risk_column].label(_risk_label(table))
+            ])
+
+    while True:
+        query = (
+            sa.select(_assessments, *detail_columns)
+            .select_from(source)
+            .where(_assessments.c.assessment_type.in_(names))
+            .order_by(_assessments.c.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            query = query.where(_assessments.c.id > last_id)
+
+        with engine.begin() as connection:
+            rows = connection.execute(query).all()
+            if not rows:
+                break
+
+            by_type: Dict[str, list] = {}
+            for row in rows:
+                by_type.setdefault(row.assessment_type, []).append(row)
+
+            for name, typed_rows in by_type.items():
+                instrument = get_instrument(name)
+                matrix, valid = response_matrix(
+                    decode_responses([row.scores for row in typed_rows]),
+                    instrument
+                )
+                scored = instrument.score_matrix(matrix)
+                stored_totals = np.array(
+                    [row.total_score if row.total_score is not None else np.nan for row in typed_rows],
+                    dtype=np.float64
+                )
+                stored_severity = np.array([row.severity_level for row in typed_rows], dtype=object)
+                stale = (stored_totals != scored["totals"]) | (stored_severity != scored["severity"])
+                table, _, risk_column = _DETAIL_TABLES.get(name, (None, None, None))
+                if risk_column is not None and scored["risk_level"] is not None:
+                    # Rows without a detail row have no stored risk to compare
+                    has_detail = np.array(
+                        [row._mapping[_detail_label(table)] is not None for row in typed_rows],
+                        dtype=bool
+                    )
+                    stored_risk = np.array(
+                        [row._mapping[_risk_label(table)] for row in typed_rows],
+                        dtype=object
+                    )
+                    stale |= has_detail & (stored_risk != scored["risk_level"])
+                changed = valid & stale
+                counts["invalid"] += int((~valid).sum())
+                counts["changed"] += int(changed.sum())
+                if not repair or not changed.any():
+                    continue
+
+                positions = np.flatnonzero(changed)
+                connection.execute(
+                    sa.update(_assessments)
+                    .where(_assessments.c.id == sa.bindparam("row_id"))
+                    .values(
+                        total_score=sa.bindparam("total"),
+                        severity_level=sa.bindparam("severity")
+                    ),
+                    [
+                        {
+                            "row_id": typed_rows[i].id,
+                            "total": float(scored["totals"][i]),
+                            "severity": scored["severity"][i]
+                        }
+                        for i in positions
+                    ]
+                )
+                if name in _DETAIL_TABLES:
+                    table, severity_column, risk_column = _DETAIL_TABLES[name]
+                    values = {severity_column: sa.bindparam("severity")}
+                    if risk_column is not None:
+                        values[risk_column] = sa.bindparam("risk")
+                    connection.execute(
+                        sa.update(table)
+                        .where(table.c.assessment_id == sa.bindparam("row_id"))
+                        .values(values),
+                        [
+                            {
+                                "row_id": typed_rows[i].id,
+                                "severity": scored["severity"][i],
+                                "risk": scored["risk_level"][i] if scored["risk_level"] is not None else None
+                            }
+                            for i in positions
+                        ]
+                    )
+
+        counts["rows_scanned"] += len(rows)
+        last_id = rows[-1].id
+        logger.info(f"Rescore progress: {counts}")
+
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instrument", action="append",
+                        help="instrument to rescore (repeatable); all registered by default")
+    parser.add_argument("--check", action="store_true",
+                        help="count differences without updating")
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    from backend.core.config import settings
+    from backend.core.database import get_engine
+    from backend.utils.scoring import load_instruments
+
+    if settings.ASSESSMENT_INSTRUMENTS_PATH:
+        load_instruments(settings.ASSESSMENT_INSTRUMENTS_PATH)
+
+    counts = rescore_assessments(get_engine(), args.instrument, args.batch_size, repair=not args.check)
+    print(json.dumps(counts, indent=2))
+    if args.check and counts["changed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
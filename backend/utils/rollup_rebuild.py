@@ -0,0 +1,43 @@
+# backend/utils/rollup_rebuild.py
+"""Check biomarker rollups against raw records and rebuild them on mismatch
+
+Run from the repository root:
+
+    python -m backend.utils.rollup_rebuild --check
+    python -m backend.utils.rollup_rebuild --session-id <id>
+"""
+
+import argparse
+import json
+import sys
+
+from backend.services.biomarker_rollups import check_rollups
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--session-id", help="limit to one session")
+    parser.add_argument("--check", action="store_true",
+                        help="report differences without rebuilding")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    from backend.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        report = check_rollups(
+            db,
+            session_id=args.session_id,
+            repair=not args.check,
+            batch_size=args.batch_size
+        )
+    finally:
+        db.close()
+
+    print(json.dumps(report, indent=2))
+    inconsistent = report["missing"] or report["extra"] or report["mismatched"]
+    if args.check and inconsistent:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# backend/utils/scoring.py
+
+import json
+from dataclasses import dataclass, field
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+Responses = Union[Dict[Any, Any], Sequence[Any]]
+
+class UnknownInstrumentError(KeyError):
+    """No instrument registered under the requested name"""
+
+@dataclass(frozen=True)
+class Instrument:
+    """Scoring definition of a questionnaire
+
+    ``cutpoints`` are the inclusive upper totals of every severity band but
+    the last, so ``labels`` has one more entry. Items are numbered from 1;
+    ``reverse_items`` are scored ``min_score + max_score - answer``. Any
+    answer above ``min_score`` on a ``risk_items`` item raises the risk
+    level, otherwise banded by ``risk_cutpoints``, to its highest label.
+    """
+
+    name: str
+    items: int
+    cutpoints: Tuple[float, ...]
+    labels: Tuple[str, ...]
+    min_score: int = 0
+    max_score: int = 3
+    reverse_items: Tuple[int, ...] = ()
+    risk_items: Tuple[int, ...] = ()
+    risk_cutpoints: Tuple[float, ...] = ()
+    risk_labels: Tuple[str, ...] = ()
+    _label_array: np.ndarray = field(init=False, repr=False, compare=False)
+    _risk_label_array: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if len(self.labels) != len(self.cutpoints) + 1:
+            raise ValueError(f"{self.name}: needs one more label than cutpoints")
+        if list(self.cutpoints) != sorted(set(self.cutpoints)):
+            raise ValueError(f"{self.name}: cutpoints must be strictly increasing")
+        if self.risk_labels and len(self.risk_labels) != len(self.risk_cutpoints) + 1:
+            raise ValueError(f"{self.name}: needs one more risk label than risk cutpoints")
+        if (self.risk_items or self.risk_cutpoints) and not self.risk_labels:
+            raise ValueError(f"{self.name}: risk items and cutpoints need risk labels")
+        for item in (*self.reverse_items, *self.risk_items):
+            if not 1 <= item <= self.items:
+                raise ValueError(f"{self.name}: item {item} out of range 1-{self.items}")
+        object.__setattr__(self, "_label_array", np.asarray(self.labels, dtype=object))
+        object.__setattr__(self, "_risk_label_array", np.asarray(self.risk_labels, dtype=object))
+
+    @classmethod
+    def from_dict(cls, definition: Dict[str, Any]) -> "Instrument":
+        """Build from a JSON definition with the field names as keys"""
+        return cls(**{
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in definition.items()
+        })
+
+    def validate(self, matrix: Any) -> np.ndarray:
+        """Answers as an (n, items) integer array; ValueError if out of range"""
+        matrix = np.asarray(matrix)
+        if matrix.ndim != 2 or matrix.shape[1] != self.items:
+            raise ValueError(f"{self.name}: expected (n, {self.items}) answers, got {matrix.shape}")
+        if matrix.size and not np.issubdtype(matrix.dtype, np.integer):
+            raise ValueError(f"{self.name}: answers must be integers")
+        if matrix.size and (matrix.min() < self.min_score or matrix.max() > self.max_score):
+            raise ValueError(f"{self.name}: answers must be from {self.min_score} to {self.max_score}")
+        return matrix.astype(np.int16, copy=False)
+
+    def item_scores(self, matrix: np.ndarray) -> np.ndarray:
+        """Answers with reverse-scored items flipped"""
+        if not self.reverse_items:
+            return matrix
+        reverse = np.zeros(self.items, dtype=bool)
+        reverse[np.asarray(self.reverse_items) - 1] = True
+        return np.where(reverse, self.min_score + self.max_score - matrix, matrix)
+
+    def severity(self, total: float) -> str:
+        """Severity label of one total"""
+        return self.labels[int(np.searchsorted(self.cutpoints, total, side="left"))]
+
+    def score_matrix(self, matrix: Any) -> Dict[str, Optional[np.ndarray]]:
+        """Score every row of an (n, items) answer matrix at once
+
+        Returns ``totals``, ``severity_index`` and ``severity`` (labels),
+        plus ``risk_flag`` and ``risk_level`` (None without risk labels).
+        """
+        scores = self.item_scores(self.validate(matrix))
+        totals = scores.sum(axis=1, dtype=np.int32)
+        severity_index = np.searchsorted(self.cutpoints, totals, side="left")
+        result = {
+            "totals": totals,
+            "severity_index": severity_index,
+            "severity": self._label_array[severity_index],
+            "risk_flag": None,
+            "risk_level": None
+        }
+        if self.risk_labels:
+            risk_index = np.searchsorted(self.risk_cutpoints, totals, side="left")
+            if self.risk_items:
+                flag = (scores[:, np.asarray(self.risk_items) - 1] > self.min_score).any(axis=1)
+                risk_index = np.where(flag, len(self.risk_labels) - 1, risk_index)
+                result["risk_flag"] = flag
+            result["risk_level"] = self._risk_label_array[risk_index]
+        return result
+
+    def score(self, responses: Responses) -> Dict[str, Any]:
+        """Score one submission given as a list or an item-number mapping"""
+        vector = response_vector(responses, self)
+        scored = self.score_matrix([vector])
+        return {
+            "items": vector,
+            "total": int(scored["totals"][0]),
+            "severity": scored["severity"][0],
+            "risk_flag": bool(scored["risk_flag"][0]) if scored["risk_flag"] is not None else False,
+            "risk_level": scored["risk_level"][0] if scored["risk_level"] is not None else None
+        }
+
+PHQ9 = Instrument(
+    name="PHQ-9",
+    items=9,
+    cutpoints=(4, 9, 14, 19),
+    labels=("Minimal", "Mild", "Moderate", "Moderately Severe", "Severe"),
+    risk_items=(9,),
+    risk_cutpoints=(9, 19),
+    risk_labels=("Low", "Moderate", "High")
+)
+
+GAD7 = Instrument(
+    name="GAD-7",
+    items=7,
+    cutpoints=(4, 9, 14),
+    labels=("Minimal", "Mild", "Moderate", "Severe")
+)
+
+INSTRUMENTS: Dict[str, Instrument] = {PHQ9.name: PHQ9, GAD7.name: GAD7}
+
+def register_instrument(instrument: Instrument):
+    """Add or replace an instrument, e.g. a CUSTOM or RDoC questionnaire"""
+    INSTRUMENTS[instrument.name] = instrument
+
+def get_instrument(name: str) -> Instrument:
+    try:
+        return INSTRUMENTS[name]
+    except KeyError:
+        raise UnknownInstrumentError(
+            f"No scoring instrument {name!r}, expected one of {sorted(INSTRUMENTS)}"
+        ) from None
+
+def load_instruments(path: str) -> List[Instrument]:
+    """Register the instruments defined in a JSON file (a list of objects)"""
+    instruments = [Instrument.from_dict(item) for item in json.loads(Path(path).read_text())]
+    for instrument in instruments:
+        register_instrument(instrument)
+    return instruments
+
+def response_vector(responses: Responses, instrument: Instrument) -> List[int]:
+    """Answers in item order from a list or a ``{"1": ..., "2": ...}`` mapping"""
+    items = instrument.items
+    if isinstance(responses, dict):
+        try:
+            ordered = sorted(responses.items(), key=lambda item: int(item[0]))
+        except (TypeError, ValueError):
+            raise ValueError("Response keys must be item numbers")
+        if [int(key) for key, _ in ordered] != list(range(1, items + 1)):
+            raise ValueError(f"Responses must cover items 1-{items}")
+        values = [value for _, value in ordered]
+    elif isinstance(responses, (list, tuple)):
+        values = list(responses)
+    else:
+        raise ValueError("Responses must be a list or an object")
+
+    if len(values) != items:
+        raise ValueError(f"Expected {items} responses, got {len(values)}")
+    if not all(
+        isinstance(value, int) and not isinstance(value, bool)
+        and instrument.min_score <= value <= instrument.max_score
+        for value in values
+    ):
+        raise ValueError(
+            f"Responses must be integers from {instrument.min_score} to {instrument.max_score}"
+        )
+    return values
+
+def decode_responses(values: List[Any]) -> List[Any]:
+    """Decode stored JSON responses, in one parse when all are text"""
+    if values and all(isinstance(value, str) for value in values):
+        return json.loads("[" + ",".join(values) + "]")
+    return [json.loads(value) if isinstance(value, (str, bytes)) else value for value in values]
+
+def response_matrix(
+    responses: Iterable[Responses],
+    instrument: Instrument
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack stored responses into an (n, items) matrix for ``score_matrix``
+
+    Returns the matrix and a mask of the rows that were valid; invalid rows
+    are left at ``min_score``. When every row is a mapping keyed ``"1"``..
+    ``"n"`` (how JSON stores them) the answers are gathered in one pass and
+    range-checked on the array; otherwise rows are validated one by one.
+    """
+    responses = list(responses)
+    count, items = len(responses), instrument.items
+    keys = [str(item) for item in range(1, items + 1)]
+    getter = itemgetter(*keys) if items > 1 else (lambda answers: (answers[keys[0]],))
+    try:
+        flat = np.fromiter(
+            chain.from_iterable(map(getter, responses)),
+            dtype=np.float64,
+            count=count * items
+        )
+    except (KeyError, TypeError, ValueError):
+        matrix = np.full((count, items), instrument.min_score, dtype=np.int16)
+        valid = np.ones(count, dtype=bool)
+        for row, answers in enumerate(responses):
+            try:
+                matrix[row] = response_vector(answers, instrument)
+            except ValueError:
+                valid[row] = False
+        return matrix, valid
+
+    matrix = flat.reshape(count, items)
+    valid = (
+        (matrix == np.floor(matrix))
+        & (matrix >= instrument.min_score)
+        & (matrix <= instrument.max_score)
+    ).all(axis=1)
+    matrix[~valid] = instrument.min_score
+    return matrix.astype(np.int16), valid
@@ -0,0 +1,161 @@
+# backend/utils/streaming.py
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Message tags for binary stream payloads
+FACIAL_FRAME = 0x01
+AUDIO_CHUNK = 0x02
+
+MAX_FRAME_PIXELS = 1920 * 1080
+MAX_WINDOW_SECONDS = 10.0
+MAX_FRAMES_PER_WINDOW = 64
+
+@dataclass
+class StreamConfig:
+    """Per-connection stream layout negotiated by the client"""
+
+    frame_width: int = 640
+    frame_height: int = 480
+    channels: int = 3
+    sample_rate: int = 16000
+    window_seconds: float = 2.0
+    max_frames_per_window: int = 16
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "StreamConfig":
+        """Build a config from a client ``config`` message, enforcing limits"""
+        defaults = cls()
+        config = cls(
+            frame_width=int(message.get("frame_width", defaults.frame_width)),
+            frame_height=int(message.get("frame_height", defaults.frame_height)),
+            channels=int(message.get("channels", defaults.channels)),
+            sample_rate=int(message.get("sample_rate", defaults.sample_rate)),
+            window_seconds=float(message.get("window_seconds", defaults.window_seconds)),
+            max_frames_per_window=int(
+                message.get("max_frames_per_window", defaults.max_frames_per_window)
+            )
+        )
+        if config.frame_width * config.frame_height > MAX_FRAME_PIXELS:
+            raise ValueError(f"Frame size exceeds {MAX_FRAME_PIXELS} pixels")
+        if config.channels not in (1, 3):
+            raise ValueError("channels must be 1 or 3")
+        if not 0 < config.window_seconds <= MAX_WINDOW_SECONDS:
+            raise ValueError(f"window_seconds must be in (0, {MAX_WINDOW_SECONDS}]")
+        if not 0 < config.max_frames_per_window <= MAX_FRAMES_PER_WINDOW:
+            raise ValueError(
+                f"max_frames_per_window must be in (0, {MAX_FRAMES_PER_WINDOW}]"
+            )
+        if not 8000 <= config.sample_rate <= 48000:
+            raise ValueError("sample_rate must be between 8000 and 48000")
+        return config
+
+    @property
+    def frame_shape(self) -> Tuple[int, int, int]:
+        return (self.frame_height, self.frame_width, self.channels)
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.frame_height * self.frame_width * self.channels
+
+    @property
+    def window_samples(self) -> int:
+        return int(self.sample_rate * self.window_seconds)
+
+@dataclass
+class StreamWindow:
+    """A completed window of frames and audio"""
+
+    index: int
+    frames: np.ndarray  # (N, H, W, C) uint8
+    audio: np.ndarray   # (window_samples,) float32
+
+class BiomarkerStreamBuffer:
+    """Fixed-memory accumulator that cuts a live stream into windows
+
+    Audio drives the window clock: a window closes every ``window_samples``
+    samples. Frames are kept in a preallocated array of
+    ``max_frames_per_window`` slots; when it fills, every other frame is
+    dropped and the sampling stride doubles, so the retained frames stay
+    evenly spread over the window without growing the buffer.
+    """
+
+    def __init__(self, config: StreamConfig):
+        self.config = config
+        self._frames = np.empty(
+            (config.max_frames_per_window,) + config.frame_shape,
+            dtype=np.uint8
+        )
+        self._audio = np.empty(config.window_samples, dtype=np.float32)
+        self._frame_count = 0
+        self._frames_seen = 0
+        self._frame_stride = 1
+        self._audio_fill = 0
+        self._window_index = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the preallocated buffers"""
+        return self._frames.nbytes + self._audio.nbytes
+
+    def add_frame(self, payload: bytes):
+        """Buffer a raw HxWxC uint8 frame"""
+        if len(payload) != self.config.frame_bytes:
+            raise ValueError(
+                f"Expected {self.config.frame_bytes} frame bytes, got {len(payload)}"
+            )
+
+        seen = self._frames_seen
+        self._frames_seen += 1
+        if seen % self._frame_stride:
+            return
+
+        if self._frame_count == len(self._frames):
+            # Keep every other frame and halve the sampling rate
+            kept = self._frames[0::2]
+            self._frame_count = len(kept)
+            self._frames[:self._frame_count] = kept
+            self._frame_stride *= 2
+            if seen % self._frame_stride:
+                return
+
+        self._frames[self._frame_count] = np.frombuffer(
+            payload, dtype=np.uint8
+        ).reshape(self.config.frame_shape)
+        self._frame_count += 1
+
+    def add_audio(self, payload: bytes) -> Iterator[StreamWindow]:
+        """Buffer float32 PCM samples, yielding each window they complete"""
+        if len(payload) % 4:
+            raise ValueError("Audio chunk length must be a multiple of 4 bytes")
+        samples = np.frombuffer(payload, dtype="<f4")
+
+        while len(samples):
+            take = min(len(samples), len(self._audio) - self._audio_fill)
+            self._audio[self._audio_fill:self._audio_fill + take] = samples[:take]
+            self._audio_fill += take
+            samples = samples[take:]
+
+            if self._audio_fill == len(self._audio):
+                yield self._cut()
+
+    def flush(self, min_fraction: float = 0.25) -> Optional[StreamWindow]:
+        """Emit the partial window at end of stream if it holds enough audio"""
+        if self._audio_fill < len(self._audio) * min_fraction:
+            return None
+        return self._cut()
+
+    def _cut(self) -> StreamWindow:
+        # Copies are handed off so the buffers can be refilled immediately
+        window = StreamWindow(
+            index=self._window_index,
+            frames=self._frames[:self._frame_count].copy(),
+            audio=self._audio[:self._audio_fill].copy()
+        )
+        self._window_index += 1
+        self._frame_count = 0
+        self._frames_seen = 0
+        self._frame_stride = 1
+        self._audio_fill = 0
+        return window
@@ -0,0 +1,193 @@
+# backend/utils/uploads.py
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# Room for part headers and boundaries on top of the part limits
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# First buffer of each part; it doubles as data arrives
+INITIAL_PART_BYTES = 256 * 1024
+
+class UploadTooLargeError(ValueError):
+    """An upload body or part exceeds its size limit"""
+
+class UploadBufferPool:
+    """Reusable uint8 upload buffers in power-of-two size classes
+
+    Released buffers are kept, up to ``max_idle_bytes`` in total, so steady
+    upload traffic reuses memory that is already mapped instead of
+    allocating and page-faulting fresh buffers for every request.
+    """
+
+    def __init__(self, max_idle_bytes: int, min_capacity: int = 64 * 1024):
+        self.max_idle_bytes = max_idle_bytes
+        self.min_capacity = min_capacity
+        self._idle: Dict[int, List[np.ndarray]] = {}
+        self._idle_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"acquired": 0, "reused": 0}
+
+    def _capacity(self, nbytes: int) -> int:
+        return max(self.min_capacity, 1 << max(nbytes - 1, 0).bit_length())
+
+    def acquire(self, nbytes: int) -> np.ndarray:
+        """A buffer of at least ``nbytes``; contents are undefined"""
+        capacity = self._capacity(nbytes)
+        with self._lock:
+            self.stats["acquired"] += 1
+            idle = self._idle.get(capacity)
+            if idle:
+                self.stats["reused"] += 1
+                self._idle_bytes -= capacity
+                return idle.pop()
+        return np.empty(capacity, dtype=np.uint8)
+
+    def release(self, buffer: np.ndarray):
+        """Return a buffer from ``acquire``; nothing may use it afterwards"""
+        with self._lock:
+            if self._idle_bytes + buffer.nbytes <= self.max_idle_bytes:
+                self._idle.setdefault(buffer.nbytes, []).append(buffer)
+                self._idle_bytes += buffer.nbytes
+
+    @property
+    def idle_bytes(self) -> int:
+        return self._idle_bytes
+
+class UploadPart:
+    """One multipart file part, received into a pooled buffer
+
+    The buffer starts at ``initial_bytes`` and grows geometrically up to
+    ``limit``, so a small part never holds more than about twice its size.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        pool: UploadBufferPool,
+        limit: int,
+        initial_bytes: int = INITIAL_PART_BYTES
+    ):
+        self.name = name
+        self.limit = limit
+        self.size = 0
+        self._pool = pool
+        self._buffer: Optional[np.ndarray] = pool.acquire(min(initial_bytes, limit))
+
+    def write(self, data: bytes, start: int, end: int):
+        count = end - start
+        if self.size + count > self.limit:
+            raise UploadTooLargeError(f"{self.name} exceeds {self.limit} bytes")
+
+        if self.size + count > len(self._buffer):
+            # Double, so each byte is copied a constant number of times
+            grown = self._pool.acquire(
+                min(max(2 * len(self._buffer), self.size + count), self.limit)
+            )
+            grown[:self.size] = self._buffer[:self.size]
+            self._pool.release(self._buffer)
+            self._buffer = grown
+
+        self._buffer[self.size:self.size + count] = np.frombuffer(
+            data,
+            dtype=np.uint8,
+            count=count,
+            offset=start
+        )
+        self.size += count
+
+    def array(self, dtype: np.dtype = np.uint8) -> np.ndarray:
+        """Zero-copy view of the received bytes as ``dtype``"""
+        itemsize = np.dtype(dtype).itemsize
+        if self.size % itemsize:
+            raise ValueError(
+                f"{self.name} is {self.size} bytes, not a multiple of {itemsize}"
+            )
+        return self._buffer[:self.size].view(dtype)
+
+    def release(self):
+        """Hand the buffer back to the pool; views from ``array`` become invalid"""
+        if self._buffer is not None:
+            self._pool.release(self._buffer)
+            self._buffer = None
+
+def release_parts(parts: Iterable[UploadPart]):
+    for part in parts:
+        part.release()
+
+async def read_multipart_parts(
+    request,
+    limits: Dict[str, int],
+    pool: UploadBufferPool
+) -> Dict[str, UploadPart]:
+    """Stream a multipart request body into pooled buffers, one per field
+
+    Nothing is spooled to a temporary file or joined into ``bytes``: each
+    received chunk is copied into its part's buffer, which grows as the part
+    arrives. ``limits`` names the accepted fields and their
+    maximum sizes; they are enforced before and while the body arrives
+    (``UploadTooLargeError``). Malformed bodies raise ``ValueError``. On any
+    error the buffers already acquired go back to the pool.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise ValueError("Expected a multipart/form-data body")
+
+    max_body = sum(limits.values()) + MULTIPART_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length is not None and int(content_length) > max_body:
+        raise UploadTooLargeError(f"Request body exceeds {max_body} bytes")
+
+    parts: Dict[str, UploadPart] = {}
+    current: Dict[str, object] = {"part": None, "field": b"", "value": b"", "headers": {}}
+
+    def on_part_begin():
+        current["headers"] = {}
+
+    def on_header_field(data: bytes, start: int, end: int):
+        current["field"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        current["value"] += data[start:end]
+
+    def on_header_end():
+        current["headers"][current["field"].lower()] = current["value"]
+        current["field"], current["value"] = b"", b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(current["headers"].get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        if name not in limits:
+            raise ValueError(f"Unexpected form field: {name or '<unnamed>'}")
+        if name in parts:
+            raise ValueError(f"Duplicate form field: {name}")
+        current["part"] = parts[name] = UploadPart(name, pool, limits[name])
+
+    def on_part_data(data: bytes, start: int, end: int):
+        current["part"].write(data, start, end)
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data
+    })
+
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_body:
+                raise UploadTooLargeError(f"Request body exceeds {max_body} bytes")
+            parser.write(chunk)
+        parser.finalize()
+    except Exception:
+        release_parts(parts.values())
+        raise
+
+    return parts
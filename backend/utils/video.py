@@ -0,0 +1,164 @@
+# backend/utils/video.py
+
+import os
+import queue
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+import cv2
+import numpy as np
+
+# Skipped-frame gaps up to this many frames are grabbed (decoded without
+# color conversion); longer gaps seek, which jumps to the nearest keyframe
+SEEK_MIN_GAP = 12
+
+_CONTAINER_SIGNATURES = (
+    (4, b"ftyp", ".mp4"),            # MP4 / MOV / 3GP
+    (0, b"\x1a\x45\xdf\xa3", ".mkv"),  # Matroska / WebM
+    (8, b"AVI ", ".avi")
+)
+
+def container_suffix(data: np.ndarray) -> Optional[str]:
+    """File suffix for a recognised video container, else None"""
+    head = data[:16].tobytes()
+    for offset, signature, suffix in _CONTAINER_SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return suffix
+    return None
+
+@dataclass
+class FrameSampling:
+    """Which frames of a video to decode"""
+
+    target_fps: Optional[float] = 5.0
+    stride: int = 1
+    max_frames: int = 64
+    batch_size: int = 16
+
+    def step(self, fps: float) -> int:
+        """Frames between samples: ``stride``, or coarser to match ``target_fps``"""
+        step = max(self.stride, 1)
+        if self.target_fps and fps > 0:
+            step = max(step, int(round(fps / self.target_fps)))
+        return step
+
+    def indices(self, frame_count: int, fps: float) -> np.ndarray:
+        """Frame indices to keep, in order
+
+        Every ``step`` frames, spread evenly over the video instead when
+        that would exceed ``max_frames``.
+        """
+        indices = np.arange(0, frame_count, self.step(fps))
+        if len(indices) > self.max_frames:
+            indices = np.linspace(0, frame_count - 1, self.max_frames).round().astype(int)
+        return indices
+
+def write_video_file(data: np.ndarray, suffix: str) -> str:
+    """Write uploaded video bytes to a temporary file for the decoder
+
+    The caller removes the file when done.
+    """
+    handle, path = tempfile.mkstemp(suffix=suffix, prefix="upload-")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(memoryview(data))
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+def iter_sampled_frames(path: str, sampling: FrameSampling) -> Iterator[np.ndarray]:
+    """Decode only the sampled frames of a video as RGB uint8 arrays
+
+    Short gaps between sampled frames are grabbed without conversion,
+    long ones seek. Containers that do not report a frame count are read
+    sequentially with the same stride.
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError("Unreadable video")
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        if frame_count > 0:
+            indices = iter(sampling.indices(frame_count, fps))
+        else:
+            step = sampling.step(fps)
+            indices = (i * step for i in range(sampling.max_frames))
+
+        position = 0
+        for index in indices:
+            gap = int(index) - position
+            if gap > SEEK_MIN_GAP:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+            else:
+                for _ in range(gap):
+                    if not capture.grab():
+                        return
+            ok, frame = capture.read()
+            if not ok:
+                return
+            position = int(index) + 1
+            yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+    finally:
+        capture.release()
+
+class _DecodeFailed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+_DONE = object()
+
+def iter_frame_batches(
+    path: str,
+    sampling: FrameSampling,
+    max_pending: int = 2
+) -> Iterator[np.ndarray]:
+    """Yield (N, H, W, C) batches of sampled frames, decoded on a worker thread
+
+    Decoding overlaps with whatever the consumer does between batches; at
+    most ``max_pending`` decoded batches wait in memory. Closing the
+    generator early stops the decoder.
+    """
+    batches: "queue.Queue" = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def decode():
+        try:
+            pending: List[np.ndarray] = []
+            for frame in iter_sampled_frames(path, sampling):
+                pending.append(frame)
+                if len(pending) == sampling.batch_size:
+                    if not put(np.stack(pending)):
+                        return
+                    pending = []
+            if pending:
+                put(np.stack(pending))
+            put(_DONE)
+        except Exception as e:
+            put(_DecodeFailed(e))
+
+    worker = threading.Thread(target=decode, name="video-decode", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = batches.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _DecodeFailed):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        worker.join()
@@ -0,0 +1,39 @@
+-- infrastructure/database/migrations/versions/006_biomarker_feature_blobs.sql
+
+SET search_path TO layla_app, public;
+
+-- Feature vectors move from JSON to compact little-endian blobs
+-- (backend/models/types.py). Existing JSON values are kept as UTF-8 text in
+-- the BYTEA column, which the application still decodes; rewrite them with:
+--     python -m backend.utils.feature_backfill
+DO $$
+DECLARE
+    feature_column TEXT;
+BEGIN
+    FOREACH feature_column IN ARRAY ARRAY['facial_features', 'vocal_features']
+    LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = 'layla_app'
+              AND table_name = 'biomarker_records'
+              AND column_name = feature_column
+        ) THEN
+            EXECUTE format(
+                'ALTER TABLE biomarker_records ADD COLUMN %I BYTEA',
+                feature_column
+            );
+        ELSIF (
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = 'layla_app'
+              AND table_name = 'biomarker_records'
+              AND column_name = feature_column
+        ) <> 'bytea' THEN
+            EXECUTE format(
+                'ALTER TABLE biomarker_records ALTER COLUMN %I TYPE BYTEA '
+                'USING convert_to(%I::text, ''UTF8'')',
+                feature_column,
+                feature_column
+            );
+        END IF;
+    END LOOP;
+END $$;
@@ -0,0 +1,54 @@
+-- infrastructure/database/migrations/versions/007_biomarker_rollups.sql
+
+SET search_path TO layla_app, public;
+
+-- Per-session aggregates maintained on insert (backend/services/biomarker_rollups.py).
+-- The unique constraint doubles as the (session_id, bucket_start) lookup index.
+-- Populate from existing records with:
+--     python -m backend.utils.rollup_rebuild
+
+-- Hourly biomarker rollups
+CREATE TABLE IF NOT EXISTS biomarker_rollups_hourly (
+    id SERIAL PRIMARY KEY,
+    session_id VARCHAR NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    record_count INTEGER NOT NULL DEFAULT 0,
+    arousal_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    arousal_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    arousal_min DOUBLE PRECISION,
+    arousal_max DOUBLE PRECISION,
+    valence_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    valence_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    valence_min DOUBLE PRECISION,
+    valence_max DOUBLE PRECISION,
+    stress_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    stress_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    stress_min DOUBLE PRECISION,
+    stress_max DOUBLE PRECISION,
+    mapping_stats JSONB,
+    updated_at TIMESTAMP,
+    CONSTRAINT uq_biomarker_rollups_hourly UNIQUE (session_id, bucket_start)
+);
+
+-- Daily biomarker rollups
+CREATE TABLE IF NOT EXISTS biomarker_rollups_daily (
+    id SERIAL PRIMARY KEY,
+    session_id VARCHAR NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    record_count INTEGER NOT NULL DEFAULT 0,
+    arousal_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    arousal_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    arousal_min DOUBLE PRECISION,
+    arousal_max DOUBLE PRECISION,
+    valence_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    valence_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    valence_min DOUBLE PRECISION,
+    valence_max DOUBLE PRECISION,
+    stress_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    stress_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+    stress_min DOUBLE PRECISION,
+    stress_max DOUBLE PRECISION,
+    mapping_stats JSONB,
+    updated_at TIMESTAMP,
+    CONSTRAINT uq_biomarker_rollups_daily UNIQUE (session_id, bucket_start)
+);
@@ -0,0 +1,12 @@
+-- infrastructure/database/migrations/versions/008_session_timestamp_indexes.sql
+
+SET search_path TO layla_app, public;
+
+-- History and metric reads filter by session and page by (timestamp, id);
+-- a composite index serves both the filter and the order without a sort.
+-- CONCURRENTLY keeps writes flowing, so run this file outside a transaction.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_assessments_session_timestamp
+    ON assessments (session_id, timestamp);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_biomarker_records_session_timestamp
+    ON biomarker_records (session_id, timestamp);
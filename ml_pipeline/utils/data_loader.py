@@ -0,0 +1,123 @@
+# ml_pipeline/utils/data_loader.py
+"""Shuffled training batches from the Parquet data lake
+
+``backend.utils.lake_export`` writes each table as
+``<root>/<table>/date=YYYY-MM-DD/session=<id>/part-*.parquet``. Files are
+opened memory-mapped and read one row group at a time into a shuffle
+buffer of at most ``buffer_rows`` rows, so memory stays bounded however
+large the lake grows.
+"""
+
+from pathlib import Path
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+RowGroup = Tuple[Path, int]
+
+def lake_files(
+    root: str,
+    table: str = "biomarker_records",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> List[Path]:
+    """Part files of ``table``, optionally within [start_date, end_date]
+
+    Dates are ISO strings and are matched against the ``date=``
+    partition, so files outside the range are never opened.
+    """
+    files = []
+    for day in sorted((Path(root) / table).glob("date=*")):
+        value = day.name.partition("=")[2]
+        if (start_date or end_date) and not value[:1].isdigit():
+            continue
+        if start_date and value < start_date:
+            continue
+        if end_date and value > end_date:
+            continue
+        files.extend(sorted(day.glob("session=*/*.parquet")))
+    return files
+
+def row_groups(files: Iterable[Path]) -> List[RowGroup]:
+    """(file, row group) units to read; only the footers are loaded"""
+    units = []
+    for path in files:
+        metadata = pq.read_metadata(path, memory_map=True)
+        units.extend((path, index) for index in range(metadata.num_row_groups))
+    return units
+
+def to_numpy(table: pa.Table) -> Dict[str, np.ndarray]:
+    """Column arrays of ``table``
+
+    Fixed-size list (feature vector) columns become ``(rows, dim)`` float32
+    matrices with NaN rows where the vector is missing.
+    """
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        array = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+        if pa.types.is_fixed_size_list(array.type):
+            dim = array.type.list_size
+            values = array.values.slice(array.offset * dim, len(array) * dim)
+            # Zero-copy unless the vectors hold nulls
+            matrix = values.to_numpy(zero_copy_only=False).astype(np.float32, copy=False)
+            matrix = matrix.reshape(len(array), dim)
+            if array.null_count:
+                if not matrix.flags.writeable:
+                    matrix = matrix.copy()
+                matrix[~array.is_valid().to_numpy(zero_copy_only=False)] = np.nan
+            columns[name] = matrix
+        else:
+            columns[name] = array.to_numpy(zero_copy_only=False)
+    return columns
+
+def iter_batches(
+    root: str,
+    table: str = "biomarker_records",
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = 256,
+    shuffle: bool = True,
+    buffer_rows: int = 65536,
+    seed: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    drop_last: bool = False
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield dicts of column arrays, ``batch_size`` rows each
+
+    With ``shuffle`` the row groups are visited in random order and rows
+    are permuted within a buffer of ``buffer_rows``; pass a different
+    ``seed`` per epoch for a new order. Rows left over after a buffer is
+    cut into batches carry into the next one, so only the final batch can
+    be short (dropped with ``drop_last``).
+    """
+    rng = np.random.default_rng(seed)
+    units = row_groups(lake_files(root, table, start_date, end_date))
+    if shuffle:
+        units = [units[i] for i in rng.permutation(len(units))]
+
+    def drain(buffer: pa.Table, final: bool) -> Generator[Dict[str, np.ndarray], None, pa.Table]:
+        # Batches from a full buffer; returns the rows that did not fill one
+        if shuffle:
+            buffer = buffer.take(pa.array(rng.permutation(buffer.num_rows)))
+        usable = buffer.num_rows
+        if not final or drop_last:
+            usable -= usable % batch_size
+        for start in range(0, usable, batch_size):
+            yield to_numpy(buffer.slice(start, batch_size))
+        return buffer.slice(usable)
+
+    pending: List[pa.Table] = []
+    pending_rows = 0
+    for path, index in units:
+        # Memory-mapped: pages are read from the file as row groups decode
+        group = pq.ParquetFile(path, memory_map=True).read_row_group(index, columns=columns)
+        pending.append(group)
+        pending_rows += group.num_rows
+        if pending_rows >= buffer_rows:
+            leftover = yield from drain(pa.concat_tables(pending), final=False)
+            pending, pending_rows = [leftover], leftover.num_rows
+
+    if pending_rows:
+        yield from drain(pa.concat_tables(pending), final=True)